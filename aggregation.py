@@ -0,0 +1,220 @@
+import math
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+
+# Сколько значений копится перед сложением в точную сумму
+SUM_BUFFER_VALUES = 32
+
+
+def exact_partials(values: Sequence[float]) -> List[float]:
+    """
+    Точная сумма значений в виде частей без потери точности.
+
+    Сумма частей (как вещественных чисел) в точности равна сумме values,
+    а math.fsum(parts) - ее правильно округленное значение, поэтому
+    результат не зависит от порядка сложения и от того, как данные были
+    разбиты на части. Части находятся несколькими проходами math.fsum
+    (на C): каждый проход - округленный остаток суммы за вычетом уже
+    найденных частей, обычно хватает двух-трех проходов.
+    """
+    partials: List[float] = []
+    try:
+        remainder = math.fsum(values)
+    except (OverflowError, ValueError):
+        # Переполнение или inf - inf: результат как при обычном сложении
+        return [sum(values)]
+    while remainder:
+        partials.append(remainder)
+        if not math.isfinite(remainder):
+            break
+        remainder = math.fsum(chain(values, (-part for part in partials)))
+    return partials
+
+
+class RunningStats:
+    """
+    Накопитель статистик по потоку значений.
+
+    Хранит количество, точную сумму (см. exact_partials), минимум,
+    максимум, а также среднее и сумму квадратов отклонений (алгоритм
+    Уэлфорда) для расчета дисперсии. Сумма и среднее не зависят от
+    порядка значений и от разбиения на части, поэтому объединенные
+    частичные результаты (по файлам, фрагментам, из кэша) совпадают
+    с последовательным проходом. Значения копятся в буфере не длиннее
+    SUM_BUFFER_VALUES и складываются в точную сумму пачкой, поэтому
+    память не зависит от количества значений.
+    """
+
+    __slots__ = ('count', 'partials', 'pending', 'minimum', 'maximum', 'mean', 'm2')
+
+    METRICS = ('count', 'sum', 'min', 'max', 'avg', 'variance', 'stddev')
+
+    def __init__(self):
+        self.count = 0
+        self.partials: List[float] = []
+        self.pending: List[float] = []
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _fold(self) -> None:
+        """Складывает буфер значений в точную сумму."""
+        self.pending.extend(self.partials)
+        self.partials = exact_partials(self.pending)
+        self.pending = []
+
+    def add(self, value: float) -> None:
+        """Добавляет одно значение."""
+        self.count += 1
+        pending = self.pending
+        pending.append(value)
+        if len(pending) >= SUM_BUFFER_VALUES:
+            self._fold()
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: 'RunningStats') -> 'RunningStats':
+        """
+        Объединяет статистики другого накопителя с текущими.
+
+        Сумма объединяется точно, среднее и сумма квадратов отклонений
+        для расчета дисперсии - по параллельной формуле Чана, поэтому
+        результат совпадает с последовательным добавлением всех значений.
+        """
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count = other.count
+            self.partials = list(other.partials)
+            self.pending = list(other.pending)
+            self.minimum = other.minimum
+            self.maximum = other.maximum
+            self.mean = other.mean
+            self.m2 = other.m2
+            return self
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.pending.extend(other.partials)
+        self.pending.extend(other.pending)
+        self._fold()
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    @property
+    def total(self) -> float:
+        """Сумма значений (правильно округленная точная сумма)."""
+        return math.fsum(chain(self.partials, self.pending))
+
+    @property
+    def avg(self) -> float:
+        """Среднее значение (сумма / количество)."""
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Дисперсия генеральной совокупности."""
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def stddev(self) -> float:
+        """Стандартное отклонение."""
+        return math.sqrt(self.variance)
+
+    def value(self, metric: str) -> float:
+        """
+        Возвращает значение метрики по имени.
+
+        Args:
+            metric: Одна из RunningStats.METRICS
+
+        Returns:
+            float: Значение метрики
+        """
+        if metric == 'count':
+            return self.count
+        if metric == 'sum':
+            return self.total
+        if metric == 'min':
+            return self.minimum
+        if metric == 'max':
+            return self.maximum
+        if metric in ('avg', 'variance', 'stddev'):
+            return getattr(self, metric)
+        raise ValueError(f"Неизвестная метрика '{metric}'. Доступные: {', '.join(self.METRICS)}")
+
+
+GroupKey = Union[str, Tuple[str, ...]]
+
+
+class GroupedAggregator:
+    """
+    Однопроходная группировка строк с накоплением статистик по ключу.
+
+    Для каждой группы хранится один RunningStats, поэтому память
+    пропорциональна числу групп, а не числу строк. Экземпляры можно
+    объединять через merge (например, частичные результаты по файлам).
+    """
+
+    def __init__(self, group_by: GroupKey, value: str):
+        """
+        Args:
+            group_by: Поле (или кортеж полей) для группировки
+            value: Числовое поле, по которому считаются статистики
+        """
+        self.group_by = group_by
+        self.value = value
+        self.groups: Dict[Any, RunningStats] = {}
+
+    def key(self, row: Dict) -> Any:
+        """Возвращает ключ группы для строки."""
+        if isinstance(self.group_by, tuple):
+            return tuple(row[field] for field in self.group_by)
+        return row[self.group_by]
+
+    def add(self, row: Dict) -> None:
+        """Добавляет одну строку."""
+        key = self.key(row)
+        stats = self.groups.get(key)
+        if stats is None:
+            stats = self.groups[key] = RunningStats()
+        stats.add(row[self.value])
+
+    def update(self, rows: Iterable[Dict]) -> 'GroupedAggregator':
+        """Добавляет все строки из итерируемого объекта."""
+        for row in rows:
+            self.add(row)
+        return self
+
+    def merge(self, other: 'GroupedAggregator') -> 'GroupedAggregator':
+        """
+        Объединяет группы другого агрегатора с текущими.
+
+        Новые группы добавляются в порядке их появления в other, поэтому
+        слияние частичных результатов по порядку файлов дает тот же порядок
+        групп, что и последовательный проход.
+        """
+        for key, other_stats in other.groups.items():
+            stats = self.groups.get(key)
+            if stats is None:
+                stats = self.groups[key] = RunningStats()
+            stats.merge(other_stats)
+        return self
+
+    def items(self) -> Iterator[Tuple[Any, RunningStats]]:
+        """Возвращает пары (ключ группы, статистики)."""
+        return iter(self.groups.items())
+
+    def __len__(self) -> int:
+        return len(self.groups)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+import argparse
+import csv
+import os
+import random
+from typing import List
+
+
+HEADER = ['name', 'position', 'completed_tasks', 'performance', 'skills', 'team', 'experience_years']
+
+FIRST_NAMES = [
+    'Alex', 'Maria', 'John', 'Anna', 'David', 'Elena', 'Chris', 'Olga', 'Ivan', 'Kate',
+    'Michael', 'Sofia', 'Dmitry', 'Laura', 'Peter', 'Natalia', 'Sergey', 'Emma', 'Tom', 'Irina',
+]
+
+LAST_NAMES = [
+    'Ivanov', 'Petrova', 'Smith', 'Lee', 'Chen', 'Popova', 'Wilson', 'Kuznetsova', 'Brown', 'Sokolova',
+    'Johnson', 'Volkova', 'Garcia', 'Morozova', 'Miller', 'Novikova', 'Davis', 'Fedorova', 'Clark', 'Orlova',
+]
+
+POSITIONS = [
+    'Backend Developer', 'Frontend Developer', 'Data Scientist', 'DevOps Engineer', 'QA Engineer',
+    'Mobile Developer', 'Fullstack Developer', 'Data Engineer', 'Team Lead', 'Security Engineer',
+]
+
+TEAMS = [
+    'API Team', 'Web Team', 'AI Team', 'Infrastructure Team', 'Testing Team',
+    'Mobile Team', 'Data Team', 'Platform Team', 'Security Team', 'Core Team',
+]
+
+SKILLS = [
+    'Python', 'Django', 'PostgreSQL', 'Docker', 'React', 'TypeScript', 'Redux', 'CSS', 'ML', 'SQL',
+    'Pandas', 'AWS', 'Kubernetes', 'Terraform', 'Ansible', 'Selenium', 'Jira', 'Pytest', 'Swift',
+    'Kotlin', 'Java', 'Spring Boot', 'MySQL', 'Redis', 'Go', 'Kafka', 'Spark', 'Vue.js', 'Webpack', 'Sass',
+]
+
+
+def _vocabulary(base: List[str], size: int, prefix: str) -> List[str]:
+    """Возвращает словарь нужного размера, дополняя базовый список."""
+    return (base + [f'{prefix} {i}' for i in range(len(base), size)])[:size]
+
+
+def generate_employees(path: str, rows: int, positions: int = 10, teams: int = 10,
+                       skills_per_row: int = 4, seed: int = 0) -> str:
+    """
+    Генерирует CSV-файл с синтетическими данными сотрудников.
+
+    Args:
+        path: Путь к выходному файлу
+        rows: Количество строк
+        positions: Количество различных должностей
+        teams: Количество различных команд
+        skills_per_row: Количество навыков в колонке skills
+        seed: Начальное значение генератора случайных чисел
+
+    Returns:
+        str: Путь к созданному файлу
+    """
+    rng = random.Random(seed)
+    position_names = _vocabulary(POSITIONS, positions, 'Position')
+    team_names = _vocabulary(TEAMS, teams, 'Team')
+    skill_names = _vocabulary(SKILLS, max(len(SKILLS), skills_per_row), 'Skill')
+
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADER)
+        for _ in range(rows):
+            experience = rng.randint(0, 15)
+            writer.writerow([
+                f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+                rng.choice(position_names),
+                rng.randint(5, 60),
+                round(rng.uniform(3.0, 5.0), 1),
+                ', '.join(rng.sample(skill_names, skills_per_row)),
+                rng.choice(team_names),
+                experience,
+            ])
+
+    return path
+
+
+def generate_dataset(directory: str, rows: int, files: int = 1, positions: int = 10, teams: int = 10,
+                     skills_per_row: int = 4, seed: int = 0) -> List[str]:
+    """
+    Генерирует набор CSV-файлов, строки распределяются между файлами поровну.
+
+    Args:
+        directory: Каталог для файлов
+        rows: Общее количество строк
+        files: Количество файлов
+
+    Returns:
+        List[str]: Пути к созданным файлам
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(files):
+        file_rows = rows // files + (1 if i < rows % files else 0)
+        path = os.path.join(directory, f'employees{i + 1}.csv')
+        paths.append(generate_employees(path, file_rows, positions, teams, skills_per_row, seed + i))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Генератор синтетических данных сотрудников')
+    parser.add_argument('--output-dir', required=True, help='Каталог для CSV-файлов')
+    parser.add_argument('--rows', type=int, default=100000, help='Общее количество строк')
+    parser.add_argument('--files', type=int, default=1, help='Количество файлов')
+    parser.add_argument('--positions', type=int, default=10, help='Количество различных должностей')
+    parser.add_argument('--teams', type=int, default=10, help='Количество различных команд')
+    parser.add_argument('--skills', type=int, default=4, help='Количество навыков у сотрудника')
+    parser.add_argument('--seed', type=int, default=0, help='Начальное значение генератора')
+
+    args = parser.parse_args()
+
+    for path in generate_dataset(args.output_dir, args.rows, args.files, args.positions,
+                                 args.teams, args.skills, args.seed):
+        print(path)
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, List
+from unittest.mock import patch
+
+from benchmarks.datagen import generate_dataset
+from file_reader import iter_csv_files, read_csv_files
+from reports import ReportGenerator
+import main as cli
+
+
+def measure(func: Callable[[], Any], repeat: int = 3, rows: int = 0) -> Dict[str, Any]:
+    """
+    Измеряет время и пиковую память вызова функции.
+
+    Время берется как лучшее из repeat запусков без трассировки памяти,
+    пиковая память измеряется отдельным запуском под tracemalloc, чтобы
+    накладные расходы трассировки не искажали время.
+
+    Args:
+        func: Измеряемая функция без аргументов
+        repeat: Количество запусков для замера времени
+        rows: Количество обрабатываемых строк (для расчета строк в секунду)
+
+    Returns:
+        Dict: wall_s, cpu_s, rows_per_s и peak_memory_bytes
+    """
+    wall_times, cpu_times = [], []
+    for _ in range(repeat):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        func()
+        wall_times.append(time.perf_counter() - wall_start)
+        cpu_times.append(time.process_time() - cpu_start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    wall = min(wall_times)
+    return {
+        'wall_s': round(wall, 6),
+        'cpu_s': round(min(cpu_times), 6),
+        'rows_per_s': round(rows / wall) if rows and wall else None,
+        'peak_memory_bytes': peak,
+    }
+
+
+def _run_main(argv: List[str]) -> None:
+    with patch('sys.argv', ['main.py', *argv]), redirect_stdout(io.StringIO()):
+        if cli.main() != 0:
+            raise RuntimeError(f"main.py завершился с ошибкой: {' '.join(argv)}")
+
+
+def measure_startup(repeat: int = 3) -> Dict[str, Any]:
+    """
+    Измеряет время запуска CLI в отдельном интерпретаторе.
+
+    Returns:
+        Dict: import_s - время импорта main по данным -X importtime,
+        help_s - лучшее время выполнения main.py --help
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    import_times, help_times = [], []
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import main'],
+                                   cwd=root, capture_output=True, text=True, check=True)
+        # Последняя строка - сам модуль main, вторая колонка - суммарное время в мкс
+        import_times.append(int(completed.stderr.strip().splitlines()[-1].split('|')[1]) / 1e6)
+
+        wall_start = time.perf_counter()
+        subprocess.run([sys.executable, 'main.py', '--help'], cwd=root, capture_output=True, check=True)
+        help_times.append(time.perf_counter() - wall_start)
+
+    return {'import_s': round(min(import_times), 6), 'help_s': round(min(help_times), 6)}
+
+
+def run_benchmarks(file_paths: List[str], rows: int, repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    """
+    Запускает набор бенчмарков горячего пути.
+
+    Args:
+        file_paths: Пути к CSV-файлам с данными
+        rows: Общее количество строк в файлах
+        repeat: Количество запусков каждого бенчмарка
+
+    Returns:
+        Dict: Результаты по имени бенчмарка
+    """
+    data = read_csv_files(file_paths)
+
+    benchmarks = {
+        'read_csv_files': lambda: read_csv_files(file_paths),
+        'iter_csv_files': lambda: sum(1 for _ in iter_csv_files(file_paths)),
+        'performance_report': lambda: ReportGenerator.performance_report(data),
+        'main_performance': lambda: _run_main(['--files', *file_paths, '--report', 'performance']),
+        'main_performance_columnar': lambda: _run_main(
+            ['--files', *file_paths, '--report', 'performance', '--columnar']
+        ),
+    }
+
+    results = {name: measure(func, repeat, rows) for name, func in benchmarks.items()}
+    results['startup'] = measure_startup(repeat)
+    return results
+
+
+def find_regressions(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+                     tolerance: float = 0.2) -> List[str]:
+    """
+    Сравнивает результаты с базовыми и возвращает список регрессий.
+
+    Args:
+        results: Текущие результаты (раздел benchmarks)
+        baseline: Базовые результаты (раздел benchmarks)
+        tolerance: Допустимое относительное ухудшение (0.2 = 20%)
+
+    Returns:
+        List[str]: Описания метрик, ухудшившихся больше допустимого
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ('wall_s', 'peak_memory_bytes', 'import_s', 'help_s'):
+            if previous.get(metric) and current.get(metric, 0) > previous[metric] * (1 + tolerance):
+                regressions.append(f'{name}.{metric}: {previous[metric]} -> {current[metric]}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Бенчмарки чтения CSV и генерации отчетов')
+    parser.add_argument('--rows', type=int, default=100000, help='Общее количество строк')
+    parser.add_argument('--files', type=int, default=1, help='Количество файлов')
+    parser.add_argument('--positions', type=int, default=10, help='Количество различных должностей')
+    parser.add_argument('--teams', type=int, default=10, help='Количество различных команд')
+    parser.add_argument('--skills', type=int, default=4, help='Количество навыков у сотрудника')
+    parser.add_argument('--repeat', type=int, default=3, help='Количество запусков каждого бенчмарка')
+    parser.add_argument('--output', help='Файл для результатов в JSON (по умолчанию stdout)')
+    parser.add_argument('--baseline', help='JSON с базовыми результатами для поиска регрессий')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Допустимое относительное ухудшение')
+
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        file_paths = generate_dataset(data_dir, args.rows, args.files, args.positions, args.teams, args.skills)
+        results = {
+            'params': {
+                'rows': args.rows,
+                'files': args.files,
+                'positions': args.positions,
+                'teams': args.teams,
+                'skills': args.skills,
+                'repeat': args.repeat,
+                'bytes': sum(os.path.getsize(path) for path in file_paths),
+            },
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+            },
+            'benchmarks': run_benchmarks(file_paths, args.rows, args.repeat),
+        }
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(output + '\n')
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = find_regressions(results['benchmarks'], baseline['benchmarks'], args.tolerance)
+        for regression in regressions:
+            print(f"Регрессия: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
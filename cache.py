@@ -0,0 +1,180 @@
+import hashlib
+import os
+import tempfile
+from typing import Any, List, Optional, Tuple
+
+from columnar import COLUMNAR_SUFFIX, ColumnarTable, open_table, read_columnar, read_metadata, write_table
+from validation import Quarantine, QuarantineRecord, describe_error
+
+
+# Максимальный размер кэша по умолчанию
+DEFAULT_CACHE_BYTES = 1024 * 1024 * 1024
+
+# Расширение файлов кэша (бинарный колоночный формат)
+CACHE_SUFFIX = COLUMNAR_SUFFIX
+
+# Версия содержимого записей; входит в ключ, поэтому записи другой
+# версии не читаются и со временем вытесняются
+CACHE_FORMAT_VERSION = 2
+
+
+class ParsedCache:
+    """
+    Дисковый кэш разобранных и типизированных данных CSV-файлов.
+
+    Для каждого входного файла хранится колоночная таблица в бинарном
+    формате. Ключ записи строится из абсолютного пути, размера и времени
+    изменения файла (и, по желанию, хэша содержимого), поэтому измененный
+    файл автоматически разбирается заново. Общий размер кэша ограничен,
+    при превышении удаляются давно не использованные записи (LRU).
+    
+    Таблица хранится без некорректных строк, а сами они сохраняются
+    в заголовке записи и воспроизводятся при каждом чтении: в карантин
+    или как ошибка чтения, поэтому результат не зависит от того, взят
+    ли файл из кэша.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_BYTES, hash_content: bool = False):
+        """
+        Args:
+            directory: Каталог для файлов кэша
+            max_bytes: Максимальный суммарный размер кэша в байтах
+            hash_content: Учитывать в ключе хэш содержимого файла
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hash_content = hash_content
+
+    def key(self, file_path: str) -> str:
+        """Возвращает ключ записи кэша для файла."""
+        stat = os.stat(file_path)
+        digest = hashlib.sha1(f'{CACHE_FORMAT_VERSION}\0'.encode('ascii'))
+        digest.update(os.path.abspath(file_path).encode('utf-8'))
+        digest.update(f'\0{stat.st_size}\0{stat.st_mtime_ns}'.encode('ascii'))
+
+        if self.hash_content:
+            with open(file_path, 'rb') as file:
+                for block in iter(lambda: file.read(1024 * 1024), b''):
+                    digest.update(block)
+
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def load(self, file_path: str) -> Optional[ColumnarTable]:
+        """
+        Загружает таблицу файла из кэша.
+
+        Запись открывается через mmap, колонки не копируются в память.
+
+        Returns:
+            ColumnarTable или None, если актуальной записи нет
+        """
+        entry = self._load(self.key(file_path))
+        return entry[0] if entry is not None else None
+
+    def _load(self, key: str, timings: Optional[Any] = None) -> Optional[Tuple[ColumnarTable, List[QuarantineRecord]]]:
+        """Таблица и некорректные строки записи или None."""
+        entry_path = self._entry_path(key)
+        try:
+            metadata = read_metadata(entry_path)
+            table = open_table(entry_path, timings)
+        except (FileNotFoundError, ValueError):
+            return None
+        rejected = metadata['rejected']
+
+        # Обновляем время доступа записи для LRU-вытеснения
+        os.utime(entry_path)
+        return table, rejected
+
+    def store(self, file_path: str, table: ColumnarTable, rejected: Optional[List[QuarantineRecord]] = None) -> None:
+        """
+        Сохраняет таблицу файла в кэш и вытесняет старые записи.
+
+        Args:
+            file_path: Путь к CSV-файлу
+            table: Таблица файла без некорректных строк
+            rejected: Некорректные строки файла (записи карантина)
+        """
+        self._store(self.key(file_path), table, rejected)
+
+    def _store(self, key: str, table: ColumnarTable, rejected: Optional[List[QuarantineRecord]]) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        entry_path = self._entry_path(key)
+
+        # Запись через временный файл, чтобы параллельные процессы
+        # никогда не прочитали недописанную запись
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            write_table(table, temp_path, metadata={'rejected': list(rejected or [])})
+            os.replace(temp_path, entry_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        self.evict()
+
+    def get_table(self, file_path: str, quarantine: Optional[Any] = None, timings: Optional[Any] = None) -> ColumnarTable:
+        """
+        Возвращает таблицу файла: из кэша, либо разбирает CSV и кэширует.
+
+        Некорректные строки файла (и из кэша, и при разборе) передаются
+        в quarantine, а без него первая из них прерывает чтение, как
+        при чтении файла без кэша.
+
+        Args:
+            file_path: Путь к CSV-файлу
+            quarantine: Накопитель некорректных строк (см. iter_csv_files)
+            timings: Накопитель замеров: открытие записи - этап load,
+                разбор при промахе - parse и convert (см. profiling.ReadTimings)
+
+        Returns:
+            ColumnarTable: Колоночная таблица файла
+        """
+        try:
+            key = self.key(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Файл не найден: {file_path}")
+
+        entry = self._load(key, timings)
+        if entry is None:
+            # Файл разбирается с карантином всегда, чтобы в кэше были все
+            # некорректные строки, а не только первая
+            collected = Quarantine()
+            table = read_columnar([file_path], collected, timings)
+            self._store(key, table, collected.records)
+            entry = table, collected.records
+
+        table, rejected = entry
+        # Путь в записях - тот, под которым файл указан в текущем запуске
+        rejected = [(file_path, *record[1:]) for record in rejected]
+        if rejected and quarantine is None:
+            _, line, column, error, _ = rejected[0]
+            raise Exception(f"Ошибка при чтении файла {file_path}: {describe_error(line, column or None, error)}")
+        if quarantine is not None:
+            quarantine.extend(rejected)
+        return table
+
+    def evict(self) -> None:
+        """Удаляет давно не использованные записи, пока кэш больше max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,572 @@
+import json
+import math
+import mmap
+import struct
+import sys
+import time
+from array import array
+from typing import Any, BinaryIO, Collection, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from aggregation import GroupedAggregator, RunningStats, exact_partials
+from file_reader import iter_csv_files
+
+# numpy - необязательная зависимость, импортируется при первой групповой
+# редукции, чтобы не замедлять запуск (см. _load_numpy)
+_numpy = None
+
+
+# Числовые колонки и typecode массива для каждой из них
+NUMERIC_COLUMNS = {
+    'completed_tasks': 'q',
+    'performance': 'd',
+    'experience_years': 'q',
+}
+
+# Строковые колонки; в бинарном формате все они хранятся в словарном
+# кодировании, а при чтении для отчетов - только те, по которым отчеты
+# группируют (см. Report.dictionary_columns)
+CATEGORICAL_COLUMNS = ('name', 'position', 'skills', 'team')
+
+# Порядок колонок в исходных CSV-файлах
+COLUMN_ORDER = ('name', 'position', 'completed_tasks', 'performance', 'skills', 'team', 'experience_years')
+
+# Typecode массива кодов словарных колонок
+CODE_TYPECODE = 'i'
+
+# Сигнатура и версия бинарного колоночного формата
+FORMAT_MAGIC = b'EMPCOL01'
+
+# Расширение файлов бинарного колоночного формата
+COLUMNAR_SUFFIX = '.ecol'
+
+# Выравнивание буферов колонок в файле
+FORMAT_ALIGNMENT = 8
+
+# Строк в одной пачке при групповой редукции (но не меньше числа групп):
+# временные массивы (разложение значений для точной суммы, отклонения
+# от среднего) не зависят от размера таблицы
+EXACT_SUM_ROWS = 1 << 16
+
+# Значения, модуль которых вне этого диапазона, суммируются по группам
+# через exact_partials: для них разложение на мантиссы не точно
+EXACT_SUM_RANGE = (2.0 ** -900, 2.0 ** 900)
+
+
+def _load_numpy() -> Optional[Any]:
+    """Импортирует numpy при первом обращении, None - если он не установлен."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - numpy является необязательной зависимостью
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+class DictionaryColumn:
+    """
+    Строковая колонка в словарном кодировании.
+
+    Каждое уникальное значение хранится один раз в values, а для строк
+    хранится только целочисленный код в массиве codes. Коды выдаются
+    в порядке первого появления значения.
+    """
+
+    __slots__ = ('codes', 'values', '_index')
+
+    def __init__(self, codes: Optional[Any] = None, values: Optional[List[str]] = None):
+        self.codes = codes if codes is not None else array(CODE_TYPECODE)
+        self.values = values if values is not None else []
+        self._index = None
+
+    def append(self, value: str) -> None:
+        """Добавляет значение в конец колонки."""
+        if self._index is None:
+            self._index = {v: code for code, v in enumerate(self.values)}
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, i: int) -> str:
+        return self.values[self.codes[i]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+class ColumnarTable:
+    """
+    Колоночное представление данных сотрудников.
+
+    Числовые колонки хранятся в типизированных массивах, строковые - в
+    словарном кодировании (categorical) или списками (strings), если
+    группировать по ним не нужно. Таблица может содержать только часть
+    колонок. Отчеты могут выполняться как групповые редукции по колонкам
+    (векторизованно при наличии numpy) либо по строкам через iter_rows.
+    """
+
+    def __init__(self, numeric: Dict[str, Any], categorical: Dict[str, DictionaryColumn], row_count: int,
+                 strings: Optional[Dict[str, List[str]]] = None):
+        """
+        Args:
+            numeric: Числовые колонки (array, numpy-массив или memoryview)
+            categorical: Строковые колонки в словарном кодировании
+            row_count: Количество строк
+            strings: Строковые колонки без словарного кодирования
+        """
+        self.numeric = numeric
+        self.categorical = categorical
+        self.strings = strings if strings is not None else {}
+        self.row_count = row_count
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict], columns: Optional[Collection[str]] = None,
+                  dictionary_columns: Optional[Collection[str]] = None) -> 'ColumnarTable':
+        """
+        Строит таблицу из потока строк с уже конвертированными полями.
+
+        Args:
+            rows: Итератор словарей (например, из iter_csv_files)
+            columns: Колонки таблицы (None - все колонки COLUMN_ORDER)
+            dictionary_columns: Строковые колонки в словарном кодировании
+                (None - все); словарь уникальных значений имени или
+                навыков почти не меньше самой колонки и только замедляет
+                чтение, если по колонке не группируют
+
+        Returns:
+            ColumnarTable: Колоночная таблица
+        """
+        names = [name for name in COLUMN_ORDER if columns is None or name in columns]
+        numeric = {name: array(NUMERIC_COLUMNS[name]) for name in names if name in NUMERIC_COLUMNS}
+        categorical = {name: DictionaryColumn() for name in names
+                       if name not in NUMERIC_COLUMNS and (dictionary_columns is None or name in dictionary_columns)}
+        strings = {name: [] for name in names if name not in numeric and name not in categorical}
+        appends = [(name, column.append) for columns_of_kind in (numeric, categorical, strings)
+                   for name, column in columns_of_kind.items()]
+        row_count = 0
+
+        for row in rows:
+            for name, append in appends:
+                append(row[name])
+            row_count += 1
+
+        return cls(numeric, categorical, row_count, strings)
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def column_values(self, name: str) -> Iterable[Any]:
+        """Значения колонки в порядке строк."""
+        if name in self.numeric:
+            return self.numeric[name]
+        if name in self.categorical:
+            column = self.categorical[name]
+            return map(column.values.__getitem__, column.codes)
+        return self.strings[name]
+
+    def iter_rows(self) -> Iterator[Dict]:
+        """Отдает строки таблицы в виде словарей в исходном порядке колонок."""
+        names = [name for name in COLUMN_ORDER
+                 if name in self.numeric or name in self.categorical or name in self.strings]
+        for values in zip(*(self.column_values(name) for name in names)):
+            yield dict(zip(names, values))
+
+    def supports_grouping(self, group_by: Any, value: str) -> bool:
+        """Проверяет, можно ли выполнить группировку по колонкам напрямую."""
+        return isinstance(group_by, str) and group_by in self.categorical and value in self.numeric
+
+    def group_stats(self, group_by: str, value: str) -> GroupedAggregator:
+        """
+        Выполняет групповую редукцию числовой колонки по словарной колонке.
+
+        При наличии numpy используется векторизованный расчет через bincount,
+        иначе - один проход по массивам кодов и значений.
+
+        Args:
+            group_by: Имя строковой колонки для группировки
+            value: Имя числовой колонки
+
+        Returns:
+            GroupedAggregator: Статистики по группам в порядке первого появления
+        """
+        keys = self.categorical[group_by]
+        values = self.numeric[value]
+        aggregator = GroupedAggregator(group_by, value)
+
+        np = _load_numpy() if self.row_count else None
+        if np is not None:
+            self._group_stats_numpy(np, aggregator, keys, values)
+        else:
+            stats_by_code = {}
+            for code, item in zip(keys.codes, values):
+                stats = stats_by_code.get(code)
+                if stats is None:
+                    stats = stats_by_code[code] = RunningStats()
+                stats.add(item)
+            for code in sorted(stats_by_code):
+                aggregator.groups[keys.values[code]] = stats_by_code[code]
+
+        return aggregator
+
+    @staticmethod
+    def _group_stats_numpy(np: Any, aggregator: GroupedAggregator, keys: DictionaryColumn, values: Any) -> None:
+        """Векторизованная групповая редукция (требует numpy)."""
+        codes = np.asarray(keys.codes)
+        data = np.asarray(values, dtype=np.float64)
+        group_count = len(keys.values)
+
+        step = max(EXACT_SUM_ROWS, group_count)
+        chunks = [slice(start, start + step) for start in range(0, len(data), step)]
+
+        counts = np.zeros(group_count, dtype=np.int64)
+        sums = np.zeros(group_count)
+        minimums = np.full(group_count, np.inf)
+        maximums = np.full(group_count, -np.inf)
+        for part in chunks:
+            counts += np.bincount(codes[part], minlength=group_count)
+            sums += np.bincount(codes[part], weights=data[part], minlength=group_count)
+            np.minimum.at(minimums, codes[part], data[part])
+            np.maximum.at(maximums, codes[part], data[part])
+        means = np.divide(sums, counts, out=np.zeros(group_count), where=counts > 0)
+        m2 = np.zeros(group_count)
+        # Для inf и очень больших значений отклонения - inf или nan, как и при построчном расчете
+        with np.errstate(invalid='ignore', over='ignore'):
+            for part in chunks:
+                m2 += np.bincount(codes[part], weights=(data[part] - means[codes[part]]) ** 2,
+                                  minlength=group_count)
+        partials = _exact_group_partials(np, codes, data, group_count, chunks)
+        if partials is None:
+            order = np.argsort(codes, kind='stable')
+            segments = np.split(data[order], np.cumsum(counts)[:-1])
+            partials = [exact_partials(segment.tolist()) for segment in segments]
+
+        for code in np.flatnonzero(counts):
+            stats = RunningStats()
+            stats.count = int(counts[code])
+            stats.partials = partials[code]
+            stats.minimum = float(minimums[code])
+            stats.maximum = float(maximums[code])
+            stats.mean = float(means[code])
+            stats.m2 = float(m2[code])
+            aggregator.groups[keys.values[code]] = stats
+
+
+def _exact_group_partials(np: Any, codes: Any, data: Any, group_count: int,
+                          chunks: List[slice]) -> Optional[List[List[float]]]:
+    """
+    Точные суммы значений по группам (см. aggregation.exact_partials).
+
+    Каждое значение раскладывается на целую мантиссу и порядок
+    (value = mantissa * 2 ** (exponent - 53)), мантисса - на две половины
+    меньше 2 ** 27. Суммы половин по парам «группа, порядок» считаются
+    через bincount и остаются точными, затем для каждой группы они
+    собираются в целое число Python и раскладываются на части float.
+    Так значения группы не переводятся в списки Python.
+
+    Args:
+        np: Модуль numpy
+        codes: Коды групп строк
+        data: Значения строк (float64)
+        group_count: Количество групп
+        chunks: Пачки строк (см. EXACT_SUM_ROWS)
+
+    Returns:
+        Части точной суммы для каждого кода группы или None, если есть
+        значения вне EXACT_SUM_RANGE (в том числе inf и nan)
+    """
+    smallest, largest = math.inf, 0.0
+    for part in chunks:
+        magnitudes = np.abs(data[part])
+        if not np.isfinite(magnitudes).all():
+            return None
+        largest = max(largest, float(magnitudes.max()))
+        smallest = min(smallest, float(np.min(magnitudes, where=magnitudes > 0, initial=np.inf)))
+    if largest == 0:
+        return [[] for _ in range(group_count)]
+    if smallest < EXACT_SUM_RANGE[0] or largest >= EXACT_SUM_RANGE[1]:
+        return None
+
+    lowest, highest = math.frexp(smallest)[1], math.frexp(largest)[1]
+    span = highest - lowest + 1
+    size = group_count * span
+    high_sums = np.zeros(size, dtype=np.int64)
+    low_sums = np.zeros(size, dtype=np.int64)
+    for part in chunks:
+        mantissas, exponents = np.frexp(data[part])
+        integers = (mantissas * 2.0 ** 53).astype(np.int64)
+        high = integers >> 26
+        low = integers - (high << 26)
+        # Мантисса нулей - 0, их порядок лишь приводится к диапазону ключей
+        keys = codes[part].astype(np.int64) * span + (np.clip(exponents, lowest, highest) - lowest)
+        # Суммы пачки меньше 2 ** 53, поэтому bincount в float64 считает их точно
+        high_sums += np.bincount(keys, weights=high, minlength=size).astype(np.int64)
+        low_sums += np.bincount(keys, weights=low, minlength=size).astype(np.int64)
+
+    partials = []
+    for high_row, low_row in zip(high_sums.reshape(group_count, span).tolist(),
+                                 low_sums.reshape(group_count, span).tolist()):
+        total = 0
+        for shift, (high_sum, low_sum) in enumerate(zip(high_row, low_row)):
+            total += ((high_sum << 26) + low_sum) << shift
+        # Каждая часть - округленный остаток целой суммы, она представима точно
+        parts = []
+        while total:
+            part = float(total)
+            parts.append(math.ldexp(part, lowest - 53))
+            total -= int(part)
+        partials.append(exact_partials(parts))
+    return partials
+
+
+def read_columnar(file_paths: Iterable[str], quarantine: Optional[Any] = None,
+                  timings: Optional[Any] = None, columns: Optional[Collection[str]] = None,
+                  where: Optional[Sequence[Any]] = None,
+                  dictionary_columns: Optional[Collection[str]] = None) -> ColumnarTable:
+    """
+    Читает CSV-файлы сразу в колоночное представление.
+
+    Строки читаются потоково, поэтому список словарей не создается.
+
+    Args:
+        file_paths: Пути к CSV-файлам
+        quarantine: Накопитель некорректных строк (см. iter_csv_files)
+        timings: Накопитель замеров разбора (см. iter_csv_files)
+        columns: Нужные колонки (None - все, см. ColumnarTable.from_rows)
+        where: Условия фильтрации строк (см. iter_csv_files)
+        dictionary_columns: Строковые колонки в словарном кодировании
+            (см. ColumnarTable.from_rows)
+
+    Returns:
+        ColumnarTable: Колоночная таблица со всеми строками
+    """
+    rows = iter_csv_files(file_paths, columns=columns, where=where, quarantine=quarantine, timings=timings)
+    return ColumnarTable.from_rows(rows, columns, dictionary_columns)
+
+
+def _write_buffer(file: BinaryIO, data: bytes) -> Dict[str, int]:
+    """Записывает выровненный буфер и возвращает его положение в файле."""
+    padding = -file.tell() % FORMAT_ALIGNMENT
+    file.write(b'\0' * padding)
+    offset = file.tell()
+    file.write(data)
+    return {'offset': offset, 'length': len(data)}
+
+
+def write_table(table: ColumnarTable, path: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Сохраняет таблицу в компактный бинарный колоночный формат.
+
+    Формат: сигнатура, длина и JSON-заголовок (количество строк, схема,
+    положение буферов), затем выровненные буферы колонок. Числовые
+    колонки записываются массивами фиксированной ширины, строковые -
+    массивом кодов и словарем (смещения + строки в UTF-8).
+
+    Args:
+        table: Колоночная таблица
+        path: Путь к выходному файлу
+        metadata: Дополнительные данные для заголовка (должны сериализоваться
+            в JSON), читаются через read_metadata
+    """
+    columns = []
+    with open(path, 'wb') as file:
+        # Место под заголовок резервируется после записи данных
+        file.write(FORMAT_MAGIC + struct.pack('<Q', 0))
+
+        for name in COLUMN_ORDER:
+            if name in table.numeric:
+                values = array(NUMERIC_COLUMNS[name], table.numeric[name])
+                columns.append({
+                    'name': name,
+                    'kind': 'numeric',
+                    'typecode': values.typecode,
+                    'data': _write_buffer(file, values.tobytes()),
+                })
+            elif name in table.categorical or name in table.strings:
+                column = table.categorical.get(name)
+                if column is None:
+                    column = DictionaryColumn()
+                    for value in table.strings[name]:
+                        column.append(value)
+                encoded = [value.encode('utf-8') for value in column.values]
+                offsets = array('q', [0])
+                for item in encoded:
+                    offsets.append(offsets[-1] + len(item))
+                columns.append({
+                    'name': name,
+                    'kind': 'dictionary',
+                    'typecode': CODE_TYPECODE,
+                    'codes': _write_buffer(file, array(CODE_TYPECODE, column.codes).tobytes()),
+                    'offsets': _write_buffer(file, offsets.tobytes()),
+                    'values': _write_buffer(file, b''.join(encoded)),
+                })
+
+        header = {
+            'rows': table.row_count,
+            'byteorder': sys.byteorder,
+            'columns': columns,
+        }
+        if metadata is not None:
+            header['metadata'] = metadata
+        header = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        header_offset = file.tell()
+        file.write(header)
+        file.seek(len(FORMAT_MAGIC))
+        file.write(struct.pack('<Q', header_offset))
+
+
+def _read_header(data: Any) -> Dict:
+    """Проверяет сигнатуру и читает JSON-заголовок бинарного файла."""
+    if bytes(data[:len(FORMAT_MAGIC)]) != FORMAT_MAGIC:
+        raise ValueError("Неверный формат колоночного файла")
+    header_offset, = struct.unpack_from('<Q', data, len(FORMAT_MAGIC))
+    header = json.loads(bytes(data[header_offset:]).decode('utf-8'))
+    if header['byteorder'] != sys.byteorder:
+        raise ValueError("Колоночный файл записан с другим порядком байт")
+    return header
+
+
+def read_metadata(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Читает дополнительные данные из заголовка бинарного колоночного файла.
+
+    Args:
+        path: Путь к файлу, записанному write_table
+
+    Returns:
+        Dict или None, если файл записан без них
+    """
+    with open(path, 'rb') as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return _read_header(mapped).get('metadata')
+
+
+def _read_array(data: Any, typecode: str, location: Dict[str, int]) -> array:
+    """Копирует буфер колонки в типизированный массив."""
+    values = array(typecode)
+    values.frombytes(data[location['offset']:location['offset'] + location['length']])
+    return values
+
+
+def _decode_values(data: Any, column: Dict) -> List[str]:
+    """Декодирует словарь строковой колонки."""
+    offsets = _read_array(data, 'q', column['offsets'])
+    blob = bytes(data[column['values']['offset']:column['values']['offset'] + column['values']['length']])
+    return [blob[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+
+def load_table(path: str) -> ColumnarTable:
+    """
+    Загружает таблицу из бинарного колоночного формата.
+
+    Args:
+        path: Путь к файлу, записанному write_table
+
+    Returns:
+        ColumnarTable: Колоночная таблица
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    header = _read_header(data)
+    numeric, categorical = {}, {}
+    for column in header['columns']:
+        if column['kind'] == 'numeric':
+            numeric[column['name']] = _read_array(data, column['typecode'], column['data'])
+        else:
+            categorical[column['name']] = DictionaryColumn(
+                _read_array(data, column['typecode'], column['codes']),
+                _decode_values(data, column),
+            )
+
+    return ColumnarTable(numeric, categorical, header['rows'])
+
+
+def open_table(path: str, timings: Optional[Any] = None) -> ColumnarTable:
+    """
+    Открывает бинарный колоночный файл через mmap без копирования колонок.
+
+    Числовые колонки и коды строковых колонок - это memoryview поверх
+    отображенного в память файла: данные подгружаются операционной
+    системой по мере обращения, поэтому открытие не зависит от размера
+    файла. Декодируются только словари строковых колонок.
+
+    Args:
+        path: Путь к файлу, записанному write_table
+        timings: Накопитель замеров (см. profiling.ReadTimings): время
+            открытия и число строк добавляются к этапу load
+
+    Returns:
+        ColumnarTable: Колоночная таблица с представлениями колонок
+    """
+    if timings is not None:
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+    with open(path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # memoryview держит ссылку на mmap, отображение живет, пока живут колонки
+    data = memoryview(mapped)
+    header = _read_header(data)
+
+    def view(typecode: str, location: Dict[str, int]) -> memoryview:
+        return data[location['offset']:location['offset'] + location['length']].cast(typecode)
+
+    numeric, categorical = {}, {}
+    for column in header['columns']:
+        if column['kind'] == 'numeric':
+            numeric[column['name']] = view(column['typecode'], column['data'])
+        else:
+            categorical[column['name']] = DictionaryColumn(
+                view(column['typecode'], column['codes']),
+                _decode_values(data, column),
+            )
+
+    if timings is not None:
+        timings.add('load', time.perf_counter() - wall_start, time.process_time() - cpu_start, header['rows'])
+    return ColumnarTable(numeric, categorical, header['rows'])
+
+
+def is_columnar_file(path: str) -> bool:
+    """Проверяет по сигнатуре, записан ли файл в бинарном колоночном формате."""
+    try:
+        with open(path, 'rb') as file:
+            return file.read(len(FORMAT_MAGIC)) == FORMAT_MAGIC
+    except OSError:
+        return False
+
+
+def read_table(path: str, quarantine: Optional[Any] = None, timings: Optional[Any] = None) -> ColumnarTable:
+    """
+    Возвращает колоночную таблицу файла любого поддерживаемого формата.
+
+    Бинарные колоночные файлы открываются через mmap, CSV разбираются.
+
+    Args:
+        path: Путь к CSV или бинарному колоночному файлу
+        quarantine: Накопитель некорректных строк CSV (см. iter_csv_files)
+        timings: Накопитель замеров (см. open_table и iter_csv_files)
+
+    Returns:
+        ColumnarTable: Колоночная таблица
+    """
+    if is_columnar_file(path):
+        return open_table(path, timings)
+    return read_columnar([path], quarantine, timings)
+
+
+def convert_files(file_paths: Iterable[str], output_path: str) -> int:
+    """
+    Конвертирует CSV-файлы в один бинарный колоночный файл.
+
+    Args:
+        file_paths: Пути к CSV-файлам
+        output_path: Путь к выходному файлу
+
+    Returns:
+        int: Количество записанных строк
+    """
+    table = read_columnar(file_paths)
+    write_table(table, output_path)
+    return len(table)
@@ -0,0 +1,210 @@
+import io
+import os
+import queue
+import threading
+from typing import Any, BinaryIO, Optional, TextIO
+
+
+# Размер буфера чтения входных файлов
+READ_BUFFER_BYTES = 1024 * 1024
+
+# Размер блока распакованных данных, передаваемого потоком распаковки
+DECOMPRESS_BLOCK_BYTES = 1024 * 1024
+
+# Сколько распакованных блоков может ждать разбора
+PREFETCH_BLOCKS = 4
+
+# Сигнатуры (первые байты) сжатых форматов
+COMPRESSION_MAGIC = {
+    'gzip': b'\x1f\x8b',
+    'bz2': b'BZh',
+    'zstd': b'\x28\xb5\x2f\xfd',
+}
+
+# Расширения сжатых файлов
+COMPRESSION_SUFFIXES = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.zst': 'zstd',
+}
+
+
+def detect_compression(file_path: str) -> Optional[str]:
+    """
+    Определяет формат сжатия файла.
+
+    Формат определяется по первым байтам файла, а если они не совпадают
+    ни с одной сигнатурой - по расширению (тогда ошибку поврежденного
+    файла сообщит распаковщик).
+
+    Args:
+        file_path: Путь к файлу
+
+    Returns:
+        str: 'gzip', 'bz2', 'zstd' или None для несжатого файла
+    """
+    with open(file_path, 'rb') as file:
+        head = file.read(4)
+    for compression, magic in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return COMPRESSION_SUFFIXES.get(os.path.splitext(file_path)[1].lower())
+
+
+def _open_decompressor(file_path: str, compression: str) -> BinaryIO:
+    """Открывает распаковывающий поток; модули сжатия импортируются только при необходимости."""
+    if compression == 'gzip':
+        import gzip
+        return gzip.open(file_path, 'rb')
+    if compression == 'bz2':
+        import bz2
+        return bz2.open(file_path, 'rb')
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Для чтения файлов .zst нужен пакет zstandard (pip install zstandard)")
+    # Файл может состоять из нескольких кадров (pzstd, склеенные архивы)
+    return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True, read_across_frames=True)
+
+
+class BlockReader(io.RawIOBase):
+    """
+    Поток байт поверх последовательности блоков.
+
+    Подклассы реализуют next_block: он возвращает очередной блок, пустой
+    блок в конце данных или выбрасывает ошибку чтения.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._pending = memoryview(b'')
+        self._done = False
+
+    def next_block(self) -> bytes:
+        raise NotImplementedError
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            if self._done:
+                return 0
+            try:
+                block = self.next_block()
+            except BaseException:
+                self._done = True
+                raise
+            if not block:
+                self._done = True
+                return 0
+            self._pending = memoryview(block)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class PrefetchReader(BlockReader):
+    """
+    Поток байт, заранее читаемый из другого потока в фоновом потоке.
+
+    Распаковка (gzip, bz2 и zstd освобождают GIL) выполняется в фоновом
+    потоке блоками по DECOMPRESS_BLOCK_BYTES и перекрывается с разбором
+    CSV в основном потоке. Очередь ограничена PREFETCH_BLOCKS блоками,
+    поэтому распаковка не уходит вперед разбора больше чем на несколько
+    мегабайт. Ошибка чтения передается через очередь и выбрасывается
+    в основном потоке.
+    """
+
+    def __init__(self, source: BinaryIO, block_bytes: int = DECOMPRESS_BLOCK_BYTES,
+                 prefetch_blocks: int = PREFETCH_BLOCKS):
+        """
+        Args:
+            source: Исходный поток (например, распаковывающий)
+            block_bytes: Размер читаемого блока
+            prefetch_blocks: Максимальное количество прочитанных заранее блоков
+        """
+        super().__init__()
+        self._source = source
+        self._block_bytes = block_bytes
+        self._blocks: queue.Queue = queue.Queue(maxsize=prefetch_blocks)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        # Ожидание с таймаутом, чтобы заметить закрытие читателя
+        while not self._stopped.is_set():
+            try:
+                self._blocks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self) -> None:
+        try:
+            while True:
+                block = self._source.read(self._block_bytes)
+                if not self._put(block) or not block:
+                    return
+        except BaseException as e:
+            self._put(e)
+
+    def next_block(self) -> bytes:
+        item = self._blocks.get()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stopped.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+
+def open_binary(file_path: str) -> BinaryIO:
+    """
+    Открывает файл на чтение как поток байт, распаковывая его при необходимости.
+
+    Args:
+        file_path: Путь к файлу
+
+    Returns:
+        BinaryIO: Поток распакованных байт
+    """
+    compression = detect_compression(file_path)
+    if compression is None:
+        return open(file_path, 'rb', buffering=READ_BUFFER_BYTES)
+    return _open_decompressor(file_path, compression)
+
+
+def open_csv(file_path: str, encoding: str = 'utf-8', prefetch: bool = True) -> TextIO:
+    """
+    Открывает CSV-файл на чтение как текст, распаковывая его при необходимости.
+
+    Несжатый файл открывается с увеличенным буфером чтения. Сжатый
+    (gzip, bz2, zstd - см. detect_compression) распаковывается потоково,
+    без временных файлов на диске; при prefetch распаковка идет
+    в фоновом потоке (см. PrefetchReader).
+
+    Args:
+        file_path: Путь к файлу
+        encoding: Кодировка текста
+        prefetch: Распаковывать в фоновом потоке
+
+    Returns:
+        TextIO: Текстовый поток
+    """
+    compression = detect_compression(file_path)
+    if compression is None:
+        return open(file_path, 'r', encoding=encoding, buffering=READ_BUFFER_BYTES)
+
+    source = _open_decompressor(file_path, compression)
+    if prefetch:
+        source = PrefetchReader(source)
+    return io.TextIOWrapper(io.BufferedReader(source, READ_BUFFER_BYTES), encoding=encoding)
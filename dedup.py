@@ -0,0 +1,171 @@
+import os
+import sys
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from file_reader import iter_csv_files
+from filters import Predicate, filter_rows
+
+
+# Политики объединения снимков: last - побеждает файл, указанный позже,
+# latest - побеждает файл с более поздним временем изменения
+DEDUP_POLICIES = ('last', 'latest')
+
+# Поля, по которым сотрудник считается одним и тем же
+DEFAULT_DEDUP_KEY = ('name',)
+
+
+def order_snapshots(file_paths: Iterable[str], policy: str = 'last') -> List[str]:
+    """
+    Упорядочивает файлы так, чтобы последний имел приоритет.
+
+    Args:
+        file_paths: Пути к файлам
+        policy: Политика объединения (см. DEDUP_POLICIES)
+
+    Returns:
+        List[str]: Файлы в порядке применения
+    """
+    if policy == 'last':
+        return list(file_paths)
+    if policy == 'latest':
+        # Сортировка устойчива: при равном времени сохраняется порядок аргументов
+        return sorted(file_paths, key=lambda file_path: os.stat(file_path).st_mtime_ns)
+    raise ValueError(f"Неизвестная политика объединения '{policy}'. Доступные: {', '.join(DEDUP_POLICIES)}")
+
+
+class EmployeeIndex:
+    """
+    Последняя версия строки каждого сотрудника.
+
+    Строки хранятся в хэш-таблице «ключ -> кортеж значений» (имена полей
+    хранятся один раз, строковые значения интернируются, поэтому
+    повторяющиеся должности и команды из разных снимков не дублируются
+    в памяти). Повторная строка с тем же ключом заменяет прежнюю, не
+    меняя порядок сотрудников, поэтому память пропорциональна числу
+    различных сотрудников, а не числу прочитанных строк.
+    """
+
+    def __init__(self, key: Sequence[str] = DEFAULT_DEDUP_KEY):
+        """
+        Args:
+            key: Поля ключа сотрудника
+        """
+        if not key:
+            raise ValueError("Не указаны поля ключа сотрудника")
+        self.key = tuple(key)
+        self.fields: Optional[Tuple[str, ...]] = None
+        self.rows: Dict[Any, Tuple] = {}
+        # Количество замененных (повторных) строк
+        self.duplicates = 0
+
+    def _row_key(self, row: Dict) -> Any:
+        try:
+            if len(self.key) == 1:
+                return row[self.key[0]]
+            return tuple(row[field] for field in self.key)
+        except KeyError as e:
+            raise ValueError(f"Колонка '{e.args[0]}' отсутствует в файле")
+
+    def add(self, row: Dict) -> None:
+        """Добавляет строку, заменяя прежнюю строку того же сотрудника."""
+        if self.fields is None:
+            self.fields = tuple(row)
+        values = tuple(
+            sys.intern(value) if isinstance(value, str) else value
+            for value in map(row.__getitem__, self.fields)
+        )
+        key = self._row_key(row)
+        if key in self.rows:
+            self.duplicates += 1
+        self.rows[key] = values
+
+    def update(self, rows: Iterable[Dict]) -> 'EmployeeIndex':
+        """Добавляет все строки из итерируемого объекта."""
+        for row in rows:
+            self.add(row)
+        return self
+
+    def merge(self, other: 'EmployeeIndex') -> 'EmployeeIndex':
+        """Применяет строки другого индекса поверх текущих (other - более поздний снимок)."""
+        for row in other.iter_rows():
+            self.add(row)
+        self.duplicates += other.duplicates
+        return self
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def iter_rows(self) -> Iterator[Dict]:
+        """Строки сотрудников в порядке первого появления."""
+        fields = self.fields
+        for values in self.rows.values():
+            yield dict(zip(fields, values))
+
+
+def _iter_snapshot(file_path: str, columns: Optional[Collection[str]], quarantine: Optional[Any],
+                   timings: Optional[Any] = None) -> Iterator[Dict]:
+    from columnar import is_columnar_file, read_table
+
+    if is_columnar_file(file_path):
+        rows = read_table(file_path, timings=timings).iter_rows()
+        if columns is None:
+            return rows
+        return ({name: row[name] for name in columns} for row in rows)
+    return iter_csv_files([file_path], columns=columns, quarantine=quarantine, timings=timings)
+
+
+def read_deduplicated(file_paths: Iterable[str], key: Sequence[str] = DEFAULT_DEDUP_KEY, policy: str = 'last',
+                      columns: Optional[Collection[str]] = None, quarantine: Optional[Any] = None,
+                      timings: Optional[Any] = None) -> EmployeeIndex:
+    """
+    Объединяет снимки данных, оставляя одну строку на сотрудника.
+
+    Файлы читаются потоково по одному, в индексе остается последняя
+    версия строки каждого сотрудника согласно политике.
+
+    Args:
+        file_paths: Пути к CSV-файлам (или бинарным колоночным)
+        key: Поля ключа сотрудника
+        policy: Политика объединения (см. DEDUP_POLICIES)
+        columns: Нужные колонки (None - все); поля ключа читаются всегда
+        quarantine: Накопитель некорректных строк (см. iter_csv_files)
+        timings: Накопитель замеров чтения (см. iter_csv_files)
+
+    Returns:
+        EmployeeIndex: Индекс сотрудников (передается в отчет как данные)
+    """
+    if columns is not None:
+        columns = frozenset(columns) | set(key)
+    index = EmployeeIndex(key)
+    for file_path in order_snapshots(file_paths, policy):
+        index.update(_iter_snapshot(file_path, columns, quarantine, timings))
+    return index
+
+
+def iter_deduplicated(file_paths: Iterable[str], key: Sequence[str] = DEFAULT_DEDUP_KEY, policy: str = 'last',
+                      columns: Optional[Collection[str]] = None, where: Optional[Sequence[Predicate]] = None,
+                      quarantine: Optional[Any] = None, timings: Optional[Any] = None) -> Iterator[Dict]:
+    """
+    Строки сотрудников без повторов с фильтрацией.
+
+    Условия проверяются после объединения: сотрудник, последняя версия
+    которого не удовлетворяет условиям, не попадает в результат, даже если
+    удовлетворяла одна из прежних версий.
+
+    Args:
+        file_paths: Пути к файлам
+        key: Поля ключа сотрудника
+        policy: Политика объединения (см. DEDUP_POLICIES)
+        columns: Нужные колонки (None - все)
+        where: Условия фильтрации
+        quarantine: Накопитель некорректных строк
+        timings: Накопитель замеров чтения (см. iter_csv_files)
+
+    Yields:
+        Dict: Последняя версия строки каждого сотрудника
+    """
+    where = list(where or [])
+    if columns is not None:
+        columns = frozenset(columns) | {predicate.column for predicate in where}
+    index = read_deduplicated(file_paths, key, policy, columns, quarantine, timings)
+    yield from filter_rows(index.iter_rows(), where)
@@ -0,0 +1,292 @@
+import heapq
+import os
+import pickle
+import weakref
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from aggregation import GroupKey, GroupedAggregator, RunningStats
+
+
+# Бюджет памяти агрегации по умолчанию
+DEFAULT_MEMORY_BYTES = 1024 * 1024 * 1024
+
+# Оценка памяти на одну группу в словаре (ключ, запись словаря, RunningStats
+# с частями точной суммы и буфером значений)
+GROUP_BYTES = 500
+
+# Оценка памяти на одну строку отчета при сортировке
+ROW_BYTES = 400
+
+# Количество файлов-разделов, на которые хэшируются сброшенные группы
+SPILL_PARTITIONS = 64
+
+# Количество записей в одном блоке pickle во временных файлах
+SPILL_BLOCK_ROWS = 4096
+
+
+# Передавать ли временные файлы сброшенных групп при сериализации, а не
+# сами группы (включается в рабочих процессах, см. share_spill_files)
+_SHARE_SPILL_FILES = False
+
+
+def _remove_with(owner: Any, directory: str) -> weakref.finalize:
+    """Удаляет каталог вместе с владельцем; возвращает финализатор."""
+    import shutil
+
+    return weakref.finalize(owner, shutil.rmtree, directory, True)
+
+
+def _make_temp_dir(owner: Any) -> str:
+    """Создает временный каталог, который удаляется вместе с владельцем."""
+    import tempfile
+
+    directory = tempfile.mkdtemp(prefix='report-spill-')
+    _remove_with(owner, directory)
+    return directory
+
+
+def share_spill_files() -> None:
+    """
+    Включает передачу сброшенных групп через временные файлы.
+
+    Вызывается в рабочем процессе (инициализатор пула): агрегатор,
+    выгружавший группы на диск, сериализуется как путь к своему каталогу
+    разделов, а каталог переходит во владение процесса, который
+    восстановит агрегатор. Процессы одной машины видят общий
+    временный каталог, поэтому группы не собираются в памяти ни в
+    рабочем процессе, ни в родительском.
+    """
+    global _SHARE_SPILL_FILES
+    _SHARE_SPILL_FILES = True
+
+
+def _write_blocks(file: Any, records: Iterable[Any]) -> int:
+    """Записывает записи в файл блоками pickle и возвращает их количество."""
+    records = iter(records)
+    count = 0
+    while True:
+        block = list(islice(records, SPILL_BLOCK_ROWS))
+        if not block:
+            return count
+        pickle.dump(block, file, pickle.HIGHEST_PROTOCOL)
+        count += len(block)
+
+
+def _read_blocks(path: str) -> Iterator[Any]:
+    """Читает записи, записанные через _write_blocks."""
+    with open(path, 'rb') as file:
+        while True:
+            try:
+                block = pickle.load(file)
+            except EOFError:
+                return
+            yield from block
+
+
+class SpillingAggregator(GroupedAggregator):
+    """
+    Группировка с выгрузкой групп на диск при превышении бюджета памяти.
+
+    Пока число групп укладывается в бюджет, работает как
+    GroupedAggregator. Когда групп становится больше, все группы из памяти
+    раскладываются по SPILL_PARTITIONS временным файлам по хэшу ключа,
+    и словарь очищается. Одна и та же группа может попасть в несколько
+    сбросов, но всегда в один и тот же раздел, поэтому при чтении
+    результата разделы объединяются по одному и в памяти находятся
+    группы только одного раздела.
+
+    При сериализации (результат рабочего процесса, файл состояния)
+    группы передаются потоком, по одному разделу, и при восстановлении
+    снова выгружаются на диск по бюджету памяти. В рабочих процессах
+    (см. share_spill_files) вместо групп передается каталог разделов.
+    """
+
+    def __init__(self, group_by: GroupKey, value: str, memory_bytes: int = DEFAULT_MEMORY_BYTES,
+                 partitions: int = SPILL_PARTITIONS):
+        """
+        Args:
+            group_by: Поле (или кортеж полей) для группировки
+            value: Числовое поле, по которому считаются статистики
+            memory_bytes: Бюджет памяти на группы в байтах
+            partitions: Количество разделов на диске
+        """
+        super().__init__(group_by, value)
+        self.memory_bytes = memory_bytes
+        self.max_groups = max(1, memory_bytes // GROUP_BYTES)
+        self.partitions = partitions
+        # Количество сбросов на диск
+        self.spills = 0
+        self._directory: Optional[str] = None
+        self._cleanup: Optional[weakref.finalize] = None
+
+    def __reduce__(self) -> Tuple:
+        arguments = (self.group_by, self.value, self.memory_bytes, self.partitions)
+        if self._directory is not None and _SHARE_SPILL_FILES:
+            # Каталог разделов передается получателю и больше не удаляется здесь
+            self.spill()
+            self._cleanup.detach()
+            return _adopt_spilled, arguments + (self._directory, self.spills)
+        # Пары (ключ, статистики) pickle записывает и читает порциями,
+        # при восстановлении они добавляются через __setitem__
+        return type(self), arguments, None, None, self.items()
+
+    def __setitem__(self, key: Any, stats: RunningStats) -> None:
+        """Добавляет статистики группы (используется при восстановлении из pickle)."""
+        if key not in self.groups and len(self.groups) < self.max_groups:
+            self.groups[key] = stats
+        else:
+            self._merge_stats(key, stats)
+
+    @property
+    def spilled(self) -> bool:
+        """Были ли группы выгружены на диск."""
+        return self._directory is not None
+
+    def add(self, row: Dict) -> None:
+        """Добавляет одну строку."""
+        key = self.key(row)
+        stats = self.groups.get(key)
+        if stats is None:
+            if len(self.groups) >= self.max_groups:
+                self.spill()
+            stats = self.groups[key] = RunningStats()
+        stats.add(row[self.value])
+
+    def _merge_stats(self, key: Any, other_stats: RunningStats) -> None:
+        stats = self.groups.get(key)
+        if stats is None:
+            if len(self.groups) >= self.max_groups:
+                self.spill()
+            stats = self.groups[key] = RunningStats()
+        stats.merge(other_stats)
+
+    def merge(self, other: GroupedAggregator) -> 'SpillingAggregator':
+        """Объединяет группы другого агрегатора (в том числе выгруженные на диск) с текущими."""
+        for key, other_stats in other.items():
+            self._merge_stats(key, other_stats)
+        return self
+
+    def _partition_path(self, partition: int) -> str:
+        return os.path.join(self._directory, f'{partition}.spill')
+
+    def spill(self) -> None:
+        """Выгружает группы из памяти в разделы на диске."""
+        if not self.groups:
+            return
+        if self._directory is None:
+            import tempfile
+
+            self._directory = tempfile.mkdtemp(prefix='report-spill-')
+            self._cleanup = _remove_with(self, self._directory)
+
+        partitions: List[List[Tuple[Any, RunningStats]]] = [[] for _ in range(self.partitions)]
+        for key, stats in self.groups.items():
+            partitions[hash(key) % self.partitions].append((key, stats))
+        for partition, records in enumerate(partitions):
+            if records:
+                with open(self._partition_path(partition), 'ab') as file:
+                    _write_blocks(file, records)
+
+        self.groups = {}
+        self.spills += 1
+
+    def items(self) -> Iterator[Tuple[Any, RunningStats]]:
+        """
+        Возвращает пары (ключ группы, статистики).
+
+        Если группы выгружались на диск, оставшиеся в памяти группы тоже
+        выгружаются, и разделы объединяются по одному. Порядок групп
+        в этом случае определяется разделами, а не порядком появления.
+        """
+        if self._directory is None:
+            return super().items()
+        self.spill()
+        return self._iter_partitions()
+
+    def _iter_partitions(self) -> Iterator[Tuple[Any, RunningStats]]:
+        for partition in range(self.partitions):
+            path = self._partition_path(partition)
+            if not os.path.exists(path):
+                continue
+            groups: Dict[Any, RunningStats] = {}
+            for key, stats in _read_blocks(path):
+                merged = groups.get(key)
+                if merged is None:
+                    groups[key] = stats
+                else:
+                    merged.merge(stats)
+            yield from groups.items()
+
+    def __len__(self) -> int:
+        if self._directory is None:
+            return len(self.groups)
+        return sum(1 for _ in self.items())
+
+
+def _adopt_spilled(group_by: GroupKey, value: str, memory_bytes: int, partitions: int,
+                   directory: str, spills: int) -> SpillingAggregator:
+    """Восстанавливает агрегатор по каталогу разделов, переданному другим процессом."""
+    aggregator = SpillingAggregator(group_by, value, memory_bytes, partitions)
+    aggregator._directory = directory
+    aggregator._cleanup = _remove_with(aggregator, directory)
+    aggregator.spills = spills
+    return aggregator
+
+
+class SortedRuns:
+    """
+    Результат внешней сортировки.
+
+    Строки хранятся во временных файлах - отсортированных сериях, - и
+    при каждой итерации сливаются через heapq.merge, поэтому в памяти
+    находится по одному блоку каждой серии. Слияние устойчиво, как и
+    list.sort: при равных ключах строки идут в исходном порядке.
+    """
+
+    def __init__(self, run_paths: List[str], length: int, key: Callable[[Any], Any], reverse: bool):
+        self.run_paths = run_paths
+        self.length = length
+        self.key = key
+        self.reverse = reverse
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        runs = [_read_blocks(path) for path in self.run_paths]
+        return heapq.merge(*runs, key=self.key, reverse=self.reverse)
+
+    def __len__(self) -> int:
+        return self.length
+
+
+def external_sort(rows: Iterable[Dict[str, Any]], key: Callable[[Any], Any], reverse: bool = False,
+                  memory_bytes: int = DEFAULT_MEMORY_BYTES) -> SortedRuns:
+    """
+    Сортирует строки, не держа их все в памяти.
+
+    Строки делятся на серии, которые помещаются в бюджет памяти; каждая
+    серия сортируется и записывается во временный файл.
+
+    Args:
+        rows: Строки для сортировки
+        key: Функция ключа сортировки
+        reverse: Сортировать по убыванию
+        memory_bytes: Бюджет памяти на одну серию в байтах
+
+    Returns:
+        SortedRuns: Итерируемый результат (временные файлы удаляются
+        вместе с ним)
+    """
+    run_rows = max(1, memory_bytes // ROW_BYTES)
+    result = SortedRuns([], 0, key, reverse)
+    directory = _make_temp_dir(result)
+
+    rows = iter(rows)
+    while True:
+        run = list(islice(rows, run_rows))
+        if not run:
+            return result
+        run.sort(key=key, reverse=reverse)
+        path = os.path.join(directory, f'{len(result.run_paths)}.run')
+        with open(path, 'wb') as file:
+            result.length += _write_blocks(file, run)
+        result.run_paths.append(path)
@@ -1,32 +1,507 @@
 import csv
-from typing import List, Dict
+import glob
+import io
+import os
+import sys
+import time
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Collection, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+from compressed import open_csv
+from records import CATEGORICAL_FIELDS, record_type
+from validation import describe_error
 
-def read_csv_files(file_paths: List[str]) -> List[Dict]:
+
+# Размер блока при поиске границ записей
+SCAN_BLOCK_BYTES = 1024 * 1024
+
+# Размер фрагмента файла по умолчанию при разбиении на части
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Количество записей, конвертируемых за один раз
+CONVERT_BATCH_ROWS = 4096
+
+# Окончания имен файлов данных, которые берутся из каталогов в --files
+DATA_FILE_SUFFIXES = ('.csv', '.csv.gz', '.csv.bz2', '.csv.zst', '.ecol')
+
+# Числовые колонки и функции их конвертации
+NUMERIC_FIELDS = {
+    'completed_tasks': int,
+    'performance': float,
+    'experience_years': int,
+}
+
+
+Projection = Sequence[Tuple[str, int, Optional[Callable]]]
+
+
+def _convert_batch(batch: List[List[str]], projection: Projection, validated: Projection = (),
+                   compact: bool = False) -> List[Dict]:
     """
-    Читает данные из нескольких CSV-файлов и возвращает объединенный список словарей.
+    Конвертирует пачку записей CSV по колонкам.
+    
+    Значения каждой числовой колонки конвертируются одним вызовом map
+    по всей пачке, строки собираются из готовых колонок. Колонки из
+    validated только проверяются и в строки не попадают. При ошибке
+    конвертации выбрасывается ValueError, некорректные записи ищет
+    _convert_checked. При compact строки - компактные записи
+    (см. records.Record), значения категориальных колонок интернируются,
+    а одинаковые числа пачки конвертируются один раз и хранятся одним
+    объектом.
+    """
+    for _, i, convert in validated:
+        list(map(convert, [raw[i] for raw in batch]))
+    names = [name for name, _, _ in projection]
+    columns = []
+    for name, i, convert in projection:
+        values = [raw[i] for raw in batch]
+        if convert is not None and compact:
+            distinct = dict.fromkeys(values)
+            converted = dict(zip(distinct, map(convert, distinct)))
+            values = list(map(converted.__getitem__, values))
+        elif convert is not None:
+            values = list(map(convert, values))
+        elif compact and name in CATEGORICAL_FIELDS:
+            values = list(map(sys.intern, values))
+        columns.append(values)
+    if compact:
+        return list(map(record_type(names), *columns))
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def _convert_checked(batch: List[List[str]], lines: List[int], projection: Projection, validated: Projection,
+                     reject: Callable[[int, Optional[str], str, List[str]], None],
+                     compact: bool = False) -> List[Dict]:
+    """Построчно конвертирует пачку, передавая некорректные записи в reject."""
+    rows = []
+    for raw, line in zip(batch, lines):
+        row = {}
+        for name, i, convert in list(validated) + list(projection):
+            try:
+                value = raw[i] if convert is None else convert(raw[i])
+            except ValueError as e:
+                reject(line, name, str(e), raw)
+                break
+            row[name] = value
+        else:
+            for name, _, _ in validated:
+                del row[name]
+            rows.append(row)
+    if compact:
+        # Пачка с ошибками - редкий случай, компактные записи строятся из готовых строк
+        return _convert_batch([list(row.values()) for row in rows],
+                              [(name, i, None) for i, (name, _, _) in enumerate(projection)], compact=True)
+    return rows
+
+
+def _matches(raw: List[str], checks: Sequence[Tuple[int, Any]], line: int,
+             reject: Callable[[int, Optional[str], str, List[str]], None]) -> bool:
+    """Проверяет условия по сырым значениям; запись с некорректным значением передается в reject."""
+    for i, predicate in checks:
+        try:
+            if not predicate.matches(raw[i]):
+                return False
+        except ValueError as e:
+            reject(line, predicate.column, str(e), raw)
+            return False
+    return True
+
+
+def _iter_records(reader: Iterator[List[str]], fieldnames: Sequence[str],
+                  columns: Optional[Collection[str]], where: Sequence[Any],
+                  source: str = '', line_base: Callable[[], int] = lambda: 0,
+                  quarantine: Optional[Any] = None, compact: bool = False,
+                  timings: Optional[Any] = None) -> Iterator[Dict]:
+    """
+    Строит строки из записей CSV с конвертацией числовых полей пачками.
+    
+    Остаются только нужные колонки, условия проверяются по сырым
+    значениям до конвертации. Запись с неверным количеством полей или
+    некорректным значением вызывает ошибку с номером строки, а если
+    передан quarantine (см. validation.Quarantine), откладывается в него,
+    и чтение продолжается.
     
     Args:
-        file_paths: Список путей к CSV-файлам
+        reader: csv.reader по записям
+        fieldnames: Колонки из заголовка
+        columns: Нужные колонки (None - все)
+        where: Условия фильтрации
+        source: Путь к файлу (для карантина)
+        line_base: Возвращает номер строки файла перед первой записью
+            reader; вызывается только при ошибке
+        quarantine: Накопитель некорректных записей
+        compact: Отдавать компактные записи вместо словарей
+        timings: Накопитель замеров (см. profiling.ReadTimings): время
+            чтения записей добавляется к этапу parse, конвертации - к convert
+    """
+    index = {name: i for i, name in enumerate(fieldnames)}
+    wanted = fieldnames if columns is None else [name for name in fieldnames if name in columns]
+    # Без проекции обязательны все числовые колонки схемы
+    required = list(NUMERIC_FIELDS if columns is None else columns) + [p.column for p in where]
+    missing = [name for name in required if name not in index]
+    if missing:
+        raise ValueError(f"Колонка '{missing[0]}' отсутствует в файле")
+    
+    projection = [(name, index[name], NUMERIC_FIELDS.get(name)) for name in wanted]
+    # С карантином проверяются все числовые колонки схемы, а не только
+    # нужные отчету: иначе состав отброшенных строк зависел бы от отчета
+    validated = []
+    if quarantine is not None:
+        validated = [(name, index[name], convert) for name, convert in NUMERIC_FIELDS.items()
+                     if name in index and name not in wanted]
+    checks = [(index[predicate.column], predicate) for predicate in where]
+    width = len(fieldnames)
+    base = []
+    
+    def reject(line: int, column: Optional[str], error: str, raw: List[str]) -> None:
+        if not base:
+            base.append(line_base())
+        line += base[0]
+        if quarantine is None:
+            raise ValueError(describe_error(line, column, error))
+        quarantine.add(source, line, column, error, raw)
+    
+    # Ошибки пачки собираются и обрабатываются в порядке строк файла
+    errors = []
+    
+    def defer(*error) -> None:
+        errors.append(error)
+    
+    while True:
+        if timings is not None:
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+        batch, lines = [], []
+        errors.clear()
+        read = 0
+        for raw in islice(reader, CONVERT_BATCH_ROWS):
+            read += 1
+            if not raw:
+                continue
+            if len(raw) != width:
+                defer(reader.line_num, None, f"ожидалось полей: {width}, получено: {len(raw)}", raw)
+                continue
+            if checks and not _matches(raw, checks, reader.line_num, defer):
+                continue
+            batch.append(raw)
+            lines.append(reader.line_num)
         
-    Returns:
-        List[Dict]: Объединенные данные из всех файлов
+        if timings is not None:
+            wall_parsed, cpu_parsed = time.perf_counter(), time.process_time()
+            timings.add('parse', wall_parsed - wall_start, cpu_parsed - cpu_start, read)
+        if not read:
+            return
+        try:
+            rows = _convert_batch(batch, projection, validated, compact)
+        except ValueError:
+            rows = _convert_checked(batch, lines, projection, validated, defer, compact)
+        if timings is not None:
+            timings.add('convert', time.perf_counter() - wall_parsed, time.process_time() - cpu_parsed, len(rows))
+        for error in sorted(errors, key=lambda error: error[0]):
+            reject(*error)
+        yield from rows
+
+
+def iter_csv_stream(file: Any, columns: Optional[Collection[str]] = None,
+                    where: Optional[Sequence[Any]] = None, source: str = '',
+                    quarantine: Optional[Any] = None, compact: bool = False,
+                    timings: Optional[Any] = None) -> Iterator[Dict]:
+    """
+    Построчно читает данные из открытого текстового потока CSV.
+    
+    Args:
+        file: Текстовый поток, начиная с заголовка
+        columns: Нужные колонки (см. iter_csv_files)
+        where: Условия фильтрации (см. iter_csv_files)
+        source: Путь к файлу (для карантина)
+        quarantine: Накопитель некорректных строк (см. iter_csv_files)
+        compact: Отдавать компактные записи (см. iter_csv_files)
+        timings: Накопитель замеров (см. iter_csv_files)
+        
+    Yields:
+        Dict: Строка данных с конвертированными числовыми полями
     """
-    all_data = []
+    reader = csv.reader(file)
+    fieldnames = next(reader, [])
+    yield from _iter_records(reader, fieldnames, columns, where or [], source=source, quarantine=quarantine,
+                             compact=compact, timings=timings)
+
+
+def iter_csv_files(file_paths: Iterable[str], columns: Optional[Collection[str]] = None,
+                   where: Optional[Sequence[Any]] = None, quarantine: Optional[Any] = None,
+                   compact: bool = False, timings: Optional[Any] = None) -> Iterator[Dict]:
+    """
+    Построчно читает данные из нескольких CSV-файлов.
+    
+    В отличие от read_csv_files, строки не накапливаются в памяти: каждая
+    строка отдается потребителю сразу после конвертации числовых полей,
+    поэтому потребление памяти не зависит от размера входных данных.
+    Сжатые файлы (.csv.gz, .csv.bz2, .csv.zst) распаковываются потоково
+    (см. compressed.open_csv).
     
+    Args:
+        file_paths: Пути к CSV-файлам
+        columns: Колонки, которые нужны потребителю (None - все);
+            остальные не конвертируются и не сохраняются в строке
+        where: Условия фильтрации (см. filters.Predicate), строки,
+            не удовлетворяющие им, отбрасываются до построения словаря
+        quarantine: Накопитель некорректных строк (см. validation.Quarantine);
+            без него первая некорректная строка прерывает чтение
+        compact: Отдавать компактные записи (records.Employee и другие
+            подклассы records.Record) вместо словарей: значения хранятся
+            в слотах, категориальные строки интернируются, поэтому строка
+            занимает в несколько раз меньше памяти; для накопления всех
+            строк в памяти
+        timings: Накопитель замеров времени разбора и конвертации
+            (см. profiling.ReadTimings), None - без замеров
+        
+    Yields:
+        Dict: Строка данных с конвертированными числовыми полями
+    """
     for file_path in file_paths:
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    # Конвертируем числовые поля
-                    row['completed_tasks'] = int(row['completed_tasks'])
-                    row['performance'] = float(row['performance'])
-                    row['experience_years'] = int(row['experience_years'])
-                    all_data.append(row)
+            with open_csv(file_path) as file:
+                yield from iter_csv_stream(file, columns, where, source=file_path, quarantine=quarantine,
+                                           compact=compact, timings=timings)
         except FileNotFoundError:
             raise FileNotFoundError(f"Файл не найден: {file_path}")
         except Exception as e:
             raise Exception(f"Ошибка при чтении файла {file_path}: {str(e)}")
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[str]:
+    """
+    Раскрывает шаблоны и каталоги во входных путях.
+    
+    Шаблон (например, exports/**/*.csv) заменяется совпавшими файлами
+    по алфавиту, каталог - файлами данных в нем (см. DATA_FILE_SUFFIXES),
+    остальные пути остаются как есть. Повторы убираются с сохранением
+    порядка.
     
-    return all_data
+    Args:
+        patterns: Пути, шаблоны и каталоги
+        
+    Returns:
+        List[str]: Пути к файлам
+    """
+    file_paths = []
+    for pattern in patterns:
+        if any(char in pattern for char in '*?['):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"Файлы не найдены: {pattern}")
+            file_paths.extend(path for path in matches if os.path.isfile(path))
+        elif os.path.isdir(pattern):
+            file_paths.extend(
+                os.path.join(pattern, name) for name in sorted(os.listdir(pattern))
+                if name.endswith(DATA_FILE_SUFFIXES) and os.path.isfile(os.path.join(pattern, name))
+            )
+        else:
+            file_paths.append(pattern)
+    return list(dict.fromkeys(file_paths))
+
+
+def read_csv_files(file_paths: List[str], quarantine: Optional[Any] = None, compact: bool = False) -> List[Dict]:
+    """
+    Читает данные из нескольких CSV-файлов и возвращает объединенный список словарей.
+    
+    Args:
+        file_paths: Список путей к CSV-файлам
+        quarantine: Накопитель некорректных строк (см. iter_csv_files)
+        compact: Хранить строки компактными записями (см. iter_csv_files)
+        
+    Returns:
+        List[Dict]: Объединенные данные из всех файлов
+    """
+    return list(iter_csv_files(file_paths, quarantine=quarantine, compact=compact))
+
+
+def _iter_record_ends(file: BinaryIO, step: int) -> Iterator[int]:
+    """
+    Находит безопасные границы записей CSV в бинарном файле.
+    
+    Граница - позиция сразу после перевода строки, который не находится
+    внутри поля в кавычках (например, в колонке skills). Чтобы это
+    определить, от текущей позиции файла (она должна быть границей
+    записи) отслеживается четность числа кавычек; это побайтовый
+    подсчет, он намного дешевле разбора CSV. Первая граница - конец
+    первой записи (для начала файла - заголовка), каждая следующая
+    находится не ближе чем через step байт от предыдущей.
+    """
+    in_quotes = False
+    position = file.tell()
+    target = position
+    
+    while True:
+        block = file.read(SCAN_BLOCK_BYTES)
+        if not block:
+            return
+        
+        checked = 0
+        parity = in_quotes
+        index = block.find(b'\n', max(target - position, 0))
+        while index >= 0:
+            parity ^= block.count(b'"', checked, index) % 2 == 1
+            checked = index
+            if parity:
+                # Перевод строки внутри поля в кавычках
+                index = block.find(b'\n', index + 1)
+                continue
+            
+            boundary = position + index + 1
+            yield boundary
+            target = boundary + step
+            index = block.find(b'\n', max(target - position, index + 1))
+        
+        in_quotes ^= block.count(b'"') % 2 == 1
+        position += len(block)
+
+
+def read_csv_header(file_path: str) -> Tuple[List[str], int]:
+    """
+    Читает заголовок CSV-файла.
+    
+    Args:
+        file_path: Путь к CSV-файлу
+        
+    Returns:
+        Tuple: Список колонок и позиция начала данных в байтах
+    """
+    try:
+        with open(file_path, 'rb') as file:
+            header_end = next(_iter_record_ends(file, 0), None)
+            if header_end is None:
+                header_end = file.tell()
+            file.seek(0)
+            header_line = file.read(header_end).decode('utf-8')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Файл не найден: {file_path}")
+    
+    return next(csv.reader([header_line]), []), header_end
+
+
+def find_record_end(file_path: str, start: int, field_count: Optional[int] = None) -> int:
+    """
+    Находит конец последней полной записи, начиная с позиции start.
+    
+    Используется для дописываемых файлов: незавершенная последняя
+    запись (без перевода строки) не считается прочитанной. Если передан
+    field_count, последняя запись без перевода строки в конце файла
+    считается полной, когда она не обрывается внутри кавычек и содержит
+    ровно field_count полей (так заканчиваются файлы многих выгрузок).
+    
+    Args:
+        file_path: Путь к CSV-файлу
+        start: Позиция начала записи в байтах
+        field_count: Количество полей полной записи (None - запись без
+            перевода строки всегда считается незавершенной)
+        
+    Returns:
+        int: Позиция сразу после последней полной записи (start, если записей нет)
+    """
+    end = start
+    with open(file_path, 'rb') as file:
+        file.seek(start)
+        for end in _iter_record_ends(file, 0):
+            pass
+        if field_count is None:
+            return end
+        file.seek(end)
+        tail = file.read()
+    
+    if not tail or tail.count(b'"') % 2 == 1:
+        return end
+    try:
+        fields = next(csv.reader(io.StringIO(tail.decode('utf-8'), newline='')), [])
+    except (UnicodeDecodeError, csv.Error):
+        # Запись оборвана посреди символа или поля
+        return end
+    return end + len(tail) if len(fields) == field_count else end
+
+
+def split_csv_file(file_path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """
+    Разбивает CSV-файл на фрагменты по границам записей.
+    
+    Args:
+        file_path: Путь к CSV-файлу
+        chunk_bytes: Примерный размер одного фрагмента в байтах
+        
+    Returns:
+        Tuple: Заголовок (список колонок) и список диапазонов (start, end) в байтах
+    """
+    try:
+        size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as file:
+            starts = list(_iter_record_ends(file, chunk_bytes))
+            header_end = starts[0] if starts else size
+            file.seek(0)
+            header_line = file.read(header_end).decode('utf-8')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Файл не найден: {file_path}")
+    
+    fieldnames = next(csv.reader([header_line]), [])
+    ranges = [(start, end) for start, end in zip(starts, starts[1:] + [size]) if end > start]
+    return fieldnames, ranges
+
+
+def _iter_lines(file: BinaryIO, length: int) -> Iterator[str]:
+    """Отдает декодированные строки из следующих length байт файла."""
+    remaining = length
+    while remaining > 0:
+        line = file.readline(remaining)
+        if not line:
+            return
+        remaining -= len(line)
+        yield line.decode('utf-8')
+
+
+def count_lines(file_path: str, end: int) -> int:
+    """Количество переводов строки в первых end байтах файла."""
+    lines = 0
+    with open(file_path, 'rb') as file:
+        remaining = end
+        while remaining > 0:
+            block = file.read(min(SCAN_BLOCK_BYTES, remaining))
+            if not block:
+                break
+            lines += block.count(b'\n')
+            remaining -= len(block)
+    return lines
+
+
+def iter_csv_range(file_path: str, start: int, end: int, fieldnames: List[str],
+                   columns: Optional[Collection[str]] = None,
+                   where: Optional[Sequence[Any]] = None, quarantine: Optional[Any] = None,
+                   timings: Optional[Any] = None) -> Iterator[Dict]:
+    """
+    Построчно читает записи из диапазона байт CSV-файла.
+    
+    Диапазон должен начинаться и заканчиваться на границе записи
+    (см. split_csv_file), заголовок передается отдельно.
+    
+    Args:
+        file_path: Путь к CSV-файлу
+        start: Начало диапазона в байтах
+        end: Конец диапазона в байтах
+        fieldnames: Колонки из заголовка файла
+        columns: Нужные колонки (см. iter_csv_files)
+        where: Условия фильтрации (см. iter_csv_files)
+        quarantine: Накопитель некорректных строк (см. iter_csv_files)
+        timings: Накопитель замеров (см. iter_csv_files)
+        
+    Yields:
+        Dict: Строка данных с конвертированными числовыми полями
+    """
+    try:
+        with open(file_path, 'rb') as file:
+            file.seek(start)
+            reader = csv.reader(_iter_lines(file, end - start))
+            # Номер строки нужен только для сообщения об ошибке, поэтому
+            # переводы строки до начала диапазона считаются лишь при ошибке
+            yield from _iter_records(reader, fieldnames, columns, where or [], source=file_path,
+                                     line_base=lambda: count_lines(file_path, start), quarantine=quarantine,
+                                     timings=timings)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Файл не найден: {file_path}")
+    except Exception as e:
+        raise Exception(f"Ошибка при чтении файла {file_path}: {str(e)}")
@@ -0,0 +1,112 @@
+import operator
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from file_reader import NUMERIC_FIELDS
+
+
+OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+}
+
+_EXPRESSION = re.compile(r'^\s*(\w+)\s*(==|!=|>=|<=|>|<)\s*(.*?)\s*$')
+
+
+class Predicate:
+    """
+    Условие фильтрации вида «колонка оператор значение».
+
+    Значение для сравнения заранее приводится к типу колонки (см.
+    NUMERIC_FIELDS), а при проверке сырой строки CSV конвертируется
+    только эта колонка.
+    """
+
+    __slots__ = ('column', 'op', 'value', 'convert', '_compare')
+
+    def __init__(self, column: str, op: str, value: Any):
+        """
+        Args:
+            column: Название колонки
+            op: Оператор сравнения (==, !=, >=, <=, >, <)
+            value: Значение для сравнения
+        """
+        if op not in OPERATORS:
+            raise ValueError(f"Неизвестный оператор '{op}'. Доступные: {', '.join(OPERATORS)}")
+        self.column = column
+        self.op = op
+        self.convert: Callable[[str], Any] = NUMERIC_FIELDS.get(column, str)
+        self.value = self.convert(value)
+        self._compare = OPERATORS[op]
+
+    def matches(self, raw_value: str) -> bool:
+        """Проверяет сырое (строковое) значение колонки из CSV."""
+        return self._compare(self.convert(raw_value), self.value)
+
+    def __call__(self, row: Dict) -> bool:
+        """Проверяет строку с уже конвертированными полями."""
+        return self._compare(row[self.column], self.value)
+
+    def __repr__(self) -> str:
+        return f'{self.column} {self.op} {self.value!r}'
+
+
+def parse_predicate(expression: str) -> Predicate:
+    """
+    Разбирает условие фильтрации из строки.
+
+    Примеры: "team == 'API Team'", "experience_years >= 3".
+
+    Args:
+        expression: Текст условия
+
+    Returns:
+        Predicate: Условие фильтрации
+    """
+    match = _EXPRESSION.match(expression)
+    if match is None:
+        raise ValueError(f"Некорректное условие фильтрации: {expression}")
+
+    column, op, value = match.groups()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '\'"':
+        value = value[1:-1]
+
+    try:
+        return Predicate(column, op, value)
+    except ValueError as e:
+        raise ValueError(f"Некорректное условие фильтрации: {expression} ({e})")
+
+
+def parse_predicates(expressions: Optional[Iterable[str]]) -> List[Predicate]:
+    """Разбирает список условий фильтрации (объединяются по И)."""
+    return [parse_predicate(expression) for expression in expressions or []]
+
+
+def filter_rows(data: Any, where: Optional[List[Predicate]]) -> Any:
+    """
+    Отбрасывает строки, не удовлетворяющие условиям.
+
+    Используется там, где условия нельзя применить при чтении CSV
+    (колоночные таблицы, кэш). Без условий данные возвращаются как есть.
+
+    Args:
+        data: Итератор строк или колоночная таблица
+        where: Условия фильтрации
+
+    Returns:
+        Исходные данные или итератор отфильтрованных строк
+    """
+    if not where:
+        return data
+    rows = data.iter_rows() if hasattr(data, 'iter_rows') else data
+    return _filtered(rows, where)
+
+
+def _filtered(rows: Iterable[Dict], where: List[Predicate]) -> Iterator[Dict]:
+    for row in rows:
+        if all(predicate(row) for predicate in where):
+            yield row
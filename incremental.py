@@ -0,0 +1,201 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from columnar import is_columnar_file
+from compressed import detect_compression
+from file_reader import find_record_end, iter_csv_range, read_csv_header
+from filters import Predicate
+from reports import MultiReport, Report, get_report
+from validation import Quarantine
+
+
+# Версия формата файла состояния
+STATE_VERSION = 3
+
+# Сколько первых байт файла используется как отпечаток для поиска перезаписи
+FINGERPRINT_BYTES = 4096
+
+
+def _fingerprint(file_path: str, length: int) -> str:
+    """Хэш первых length байт файла."""
+    with open(file_path, 'rb') as file:
+        return hashlib.sha1(file.read(length)).hexdigest()
+
+
+def _ends_with_newline(file_path: str, end: int) -> bool:
+    """Проверяет, что байт перед позицией end - перевод строки."""
+    with open(file_path, 'rb') as file:
+        file.seek(end - 1)
+        return file.read(1) == b'\n'
+
+
+class IncrementalReport:
+    """
+    Инкрементальная материализация отчета по дописываемым CSV-файлам.
+
+    Между запусками в файле состояния сохраняются накопленное состояние
+    отчета и позиция (в байтах), до которой прочитан каждый файл.
+    Повторный запуск разбирает только дописанные в конец байты, поэтому
+    время обновления пропорционально приросту данных. Если файл был
+    перезаписан, укорочен или исключен из списка, отчет пересчитывается
+    заново, так как вычесть старые строки из агрегатов нельзя. Последняя
+    запись без перевода строки учитывается, если она полная (см.
+    file_reader.find_record_end); если затем дописанные байты продолжают
+    ее, отчет тоже пересчитывается.
+    """
+
+    def __init__(self, state_path: str, report_name: Union[str, List[str]],
+                 where: Optional[Sequence[Predicate]] = None, quarantine: Optional[Quarantine] = None,
+                 report: Optional[Report] = None, timings: Optional[Any] = None):
+        """
+        Args:
+            state_path: Путь к файлу состояния
+            report_name: Название отчета из REPORT_REGISTRY или список
+                названий (тогда результат - словарь отчетов, см. MultiReport)
+            where: Условия фильтрации строк; сохраненное состояние
+                используется только с теми же условиями
+            quarantine: Карантин некорректных строк; без него некорректная
+                строка прерывает обновление, а с ним пропускается, и позиция
+                чтения сдвигается за нее
+            report: Описание отчета вместо взятого из реестра по названию
+                (например, с параметрами командной строки); для нескольких
+                отчетов - MultiReport с теми же названиями
+            timings: Накопитель замеров разбора (см. profiling.ReadTimings)
+        """
+        self.state_path = state_path
+        self.where = list(where or [])
+        self.quarantine = quarantine
+        self.timings = timings
+        if isinstance(report_name, str):
+            self.report_name = report_name
+            self.report = report if report is not None else get_report(report_name)
+        else:
+            self.report_name = tuple(report_name)
+            self.report = report if report is not None else MultiReport(report_name)
+        # Количество строк, разобранных при последнем обновлении
+        self.rows_read = 0
+
+    def _top(self) -> List[Optional[int]]:
+        # Рейтинг, накопленный для меньшего --top, нельзя дополнить
+        # без повторного чтения, поэтому размер рейтингов входит в состояние
+        reports = self.report.reports if isinstance(self.report, MultiReport) else [self.report]
+        return [getattr(report, 'top', None) for report in reports]
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.state_path, 'rb') as file:
+                saved = pickle.load(file)
+        except FileNotFoundError:
+            return None
+
+        if (saved.get('version') != STATE_VERSION or saved.get('report') != self.report_name
+                or saved.get('where') != [repr(predicate) for predicate in self.where]
+                or saved.get('top') != self._top()):
+            return None
+        return saved
+
+    def _save(self, saved: Dict[str, Any]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump(saved, file)
+            os.replace(temp_path, self.state_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _is_appended(self, file_path: str, info: Dict[str, Any]) -> bool:
+        """Проверяет, что файл только дописывался с прошлого запуска."""
+        size = os.path.getsize(file_path)
+        if size < info['offset']:
+            return False
+        if info['unterminated'] and size > info['offset']:
+            # Последняя запись была учтена без перевода строки: если
+            # дописанные байты продолжают ее, учтенная запись изменилась
+            with open(file_path, 'rb') as file:
+                file.seek(info['offset'])
+                if file.read(1) not in (b'\n', b'\r'):
+                    return False
+        return _fingerprint(file_path, info['fingerprint_length']) == info['fingerprint']
+
+    def _read_delta(self, state: Any, file_path: str, info: Dict[str, Any]) -> None:
+        """Добавляет в состояние записи файла после сохраненной позиции."""
+        end = find_record_end(file_path, info['offset'], field_count=len(info['fieldnames']))
+        rows_read = 0
+
+        def counted(rows):
+            nonlocal rows_read
+            for row in rows:
+                rows_read += 1
+                yield row
+
+        rows = iter_csv_range(file_path, info['offset'], end, info['fieldnames'],
+                              columns=self.report.columns, where=self.where, quarantine=self.quarantine,
+                              timings=self.timings)
+        self.report.feed(state, counted(rows))
+        self.rows_read += rows_read
+        if end > info['offset']:
+            info['unterminated'] = not _ends_with_newline(file_path, end)
+        info['offset'] = end
+
+    def refresh(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Обновляет отчет по новым данным и сохраняет состояние.
+
+        Args:
+            file_paths: Пути к CSV-файлам
+
+        Returns:
+            Результаты отчета по всем данным
+        """
+        paths = [os.path.abspath(file_path) for file_path in file_paths]
+        saved = self._load()
+
+        for file_path in paths:
+            if not os.path.isfile(file_path):
+                raise FileNotFoundError(f"Файл не найден: {file_path}")
+            # Позиция чтения хранится в байтах исходного файла, а дописанные
+            # байты сжатого файла нельзя разобрать без распаковки с начала
+            if detect_compression(file_path) is not None:
+                raise ValueError(f"Инкрементальное чтение сжатых файлов не поддерживается: {file_path}")
+            # Бинарный колоночный файл не дописывается, а создается заново
+            if is_columnar_file(file_path):
+                raise ValueError(f"Инкрементальное чтение бинарных колоночных файлов не поддерживается: {file_path}")
+
+        if saved is not None:
+            tracked = saved['files']
+            if not set(tracked) <= set(paths) or any(
+                path in tracked and not self._is_appended(path, tracked[path]) for path in paths
+            ):
+                saved = None
+
+        if saved is None:
+            saved = {
+                'version': STATE_VERSION,
+                'report': self.report_name,
+                'where': [repr(predicate) for predicate in self.where],
+                'top': self._top(),
+                'state': self.report.create(),
+                'files': {},
+            }
+
+        self.rows_read = 0
+        for file_path in paths:
+            info = saved['files'].get(file_path)
+            if info is None:
+                fieldnames, header_end = read_csv_header(file_path)
+                info = {'offset': header_end, 'fieldnames': fieldnames,
+                        'unterminated': header_end > 0 and not _ends_with_newline(file_path, header_end)}
+            self._read_delta(saved['state'], file_path, info)
+
+            # Отпечаток начала файла позволяет заметить его перезапись
+            info['fingerprint_length'] = min(info['offset'], FINGERPRINT_BYTES)
+            info['fingerprint'] = _fingerprint(file_path, info['fingerprint_length'])
+            saved['files'][file_path] = info
+
+        self._save(saved)
+        return self.report.finalize(saved['state'])
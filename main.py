@@ -1,12 +1,349 @@
 #!/usr/bin/env python3
 import argparse
-from tabulate import tabulate
+import sys
+from itertools import chain
 
-from file_reader import read_csv_files
-from reports import generate_report, get_available_reports
+# Модули режимов (кэш, колоночный формат, пул процессов, инкрементальные
+# отчеты) и tabulate импортируются внутри веток, которые их используют:
+# обычный запуск по одному CSV не платит за их загрузку
+from dedup import DEDUP_POLICIES, DEFAULT_DEDUP_KEY, iter_deduplicated
+from file_reader import DEFAULT_CHUNK_BYTES, expand_inputs, iter_csv_files
+from filters import parse_predicates
+from profiling import PipelineProfiler
+from reports import (
+    ALL_REPORTS, MultiReport, configure_reports, expand_report_names, generate_report, generate_reports,
+    get_available_reports, get_report, required_columns,
+)
+from writers import BinaryStreamWriter, write_csv, write_jsonl, write_tsv
+
+
+# Форматы вывода отчета: table - таблица для чтения человеком, остальные
+# записываются построчно, без построения всей таблицы в памяти
+OUTPUT_FORMATS = ('table', 'tsv', 'csv', 'jsonl', 'binary')
+
+
+def tabulate(*args, **kwargs):
+    """Обертка над tabulate.tabulate с импортом при первом вызове."""
+    from tabulate import tabulate as _tabulate
+    return _tabulate(*args, **kwargs)
+
+
+def write_report(report_results, output_format, stream):
+    """Потоково записывает результаты отчета в машиночитаемом формате."""
+    if output_format == 'binary':
+        writer = BinaryStreamWriter(stream)
+        if isinstance(report_results, dict):
+            for name, results in report_results.items():
+                writer.write_table(results, name)
+        else:
+            writer.write_table(report_results)
+        writer.close()
+    elif output_format == 'jsonl':
+        if isinstance(report_results, dict):
+            # Строки нескольких отчетов помечаются полем report
+            for name, results in report_results.items():
+                write_jsonl(results, stream, name)
+        else:
+            write_jsonl(report_results, stream)
+    else:
+        write_rows = write_csv if output_format == 'csv' else write_tsv
+        if isinstance(report_results, dict):
+            for i, (name, results) in enumerate(report_results.items()):
+                if i:
+                    stream.write('\n')
+                stream.write(f"Отчет: {name}\n")
+                write_rows(results, stream)
+        else:
+            write_rows(report_results, stream)
+
+
+def print_report(report_name, report_results, output_format='table', stream=None):
+    """Форматирует и выводит результаты отчета."""
+    if output_format != 'table':
+        if stream is None:
+            stream = sys.stdout.buffer if output_format == 'binary' else sys.stdout
+        write_report(report_results, output_format, stream)
+        return
+    
+    if isinstance(report_results, dict):
+        # Несколько отчетов: выводим каждый со своим заголовком
+        for i, (name, results) in enumerate(report_results.items()):
+            if i:
+                print(file=stream)
+            print(f"Отчет: {name}", file=stream)
+            print_report(name, results, output_format, stream)
+        return
+    
+    if report_name == 'performance':
+        headers = ['№', 'position', 'performance']
+        table_data = []
+        for i, row in enumerate(report_results, 1):
+            table_data.append([i, row['position'], row['performance']])
+        
+        print(tabulate(table_data, headers=headers), file=stream)
+    else:
+        # Универсальный вывод для будущих отчетов
+        print(tabulate(report_results, headers='keys'), file=stream)
+
+
+def open_output(path, output_format):
+    """Открывает файл для вывода отчета в нужном режиме (текстовом или двоичном)."""
+    if output_format == 'binary':
+        return open(path, 'wb')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+def print_stats(stats):
+    """Выводит статистику этапов конвейера в stderr."""
+    print(tabulate(stats, headers='keys'), file=sys.stderr)
+
+
+def build_report(args, profiler, quarantine=None):
+    """
+    Читает данные и строит отчет способом, выбранным в аргументах.
+    
+    Args:
+        args: Разобранные аргументы командной строки
+        profiler: Профилировщик этапов конвейера
+        quarantine: Карантин некорректных строк (None - останавливаться на первой)
+        
+    Returns:
+        Результаты отчета (для нескольких отчетов - словарь по названиям)
+        или None, если данных нет
+    """
+    report_names = expand_report_names(args.report)
+    args.files = expand_inputs(args.files)
+    # Один отчет запускается по имени, несколько - за общий проход по данным
+    report_name = report_names[0] if len(report_names) == 1 else report_names
+    where = parse_predicates(args.where)
+    memory_bytes = args.memory_mb * 1024 * 1024 if args.memory_mb is not None else None
+    reports = configure_reports(report_names, top=args.top, memory_bytes=memory_bytes, skill=args.skill)
+    # Функции чтения замеряют разбор и конвертацию (None - профилирование выключено)
+    timings = profiler.timings
+    
+    def get_run_report():
+        if isinstance(report_name, str):
+            return reports.get(report_name) or get_report(report_name)
+        return MultiReport(report_name, reports)
+    
+    from columnar import is_columnar_file
+    
+    if args.state:
+        from incremental import IncrementalReport
+        
+        # Разбираются только байты, дописанные с прошлого запуска
+        report_results = IncrementalReport(args.state, report_name, where=where, quarantine=quarantine,
+                                           report=get_run_report(), timings=timings).refresh(args.files)
+        return report_results if _has_results(report_results) else None
+    
+    if not args.dedup and (args.jobs > 1 or args.cache_dir or any(is_columnar_file(path) for path in args.files)):
+        from cache import DEFAULT_CACHE_BYTES, ParsedCache
+        from parallel import aggregate_files
+        
+        # Файлы (и фрагменты больших файлов) разбираются в пуле процессов,
+        # берутся из кэша или открываются через mmap, объединяются частичные агрегаты
+        cache = None
+        if args.cache_dir:
+            max_bytes = DEFAULT_CACHE_BYTES
+            if args.cache_size_mb is not None:
+                max_bytes = args.cache_size_mb * 1024 * 1024
+            cache = ParsedCache(args.cache_dir, max_bytes=max_bytes)
+        report = get_run_report()
+        state = aggregate_files(report, args.files, jobs=args.jobs, columnar=args.columnar,
+                                chunk_bytes=args.chunk_mb * 1024 * 1024, cache=cache, where=where,
+                                quarantine=quarantine, timings=timings)
+        report_results = report.finalize(state)
+        return report_results if _has_results(report_results) else None
+    
+    def read_rows(columns=None):
+        if args.dedup:
+            # Одна (последняя) строка на сотрудника из всех снимков
+            return iter_deduplicated(args.files, key=args.dedup_key, policy=args.dedup, columns=columns,
+                                     where=where, quarantine=quarantine, timings=timings)
+        if args.concurrency > 1:
+            from ingest import iter_csv_concurrent
+            
+            # Несколько файлов читаются одновременно, разбор идет по порядку
+            return iter_csv_concurrent(args.files, columns=columns, where=where, quarantine=quarantine,
+                                       concurrency=args.concurrency, timings=timings)
+        return iter_csv_files(args.files, columns=columns, where=where, quarantine=quarantine, timings=timings)
+    
+    if args.columnar:
+        from columnar import ColumnarTable
+        
+        # Колоночная таблица из нужных отчетам колонок: типизированные массивы,
+        # в словарном кодировании - только колонки, по которым группируют
+        report = get_run_report()
+        data = ColumnarTable.from_rows(read_rows(report.columns), report.columns, report.dictionary_columns)
+        if len(data) == 0:
+            return None
+    else:
+        # Потоковое чтение данных: строки не накапливаются в памяти, читаются
+        # только нужные отчетам колонки, условия проверяются до построения строк
+        rows = iter(read_rows(required_columns(report_names)))
+        first_row = next(rows, None)
+        if first_row is None:
+            return None
+        data = chain([first_row], rows)
+    
+    # Генерация отчета
+    if isinstance(report_name, str):
+        return generate_report(report_name, data, reports)
+    return generate_reports(report_name, data, reports)
+
+
+def _has_results(report_results):
+    """Проверяет, что хотя бы один отчет содержит строки."""
+    if isinstance(report_results, dict):
+        return any(report_results.values())
+    return bool(report_results)
+
+
+def convert_main(argv):
+    """Подкоманда convert: конвертация CSV в бинарный колоночный формат."""
+    parser = argparse.ArgumentParser(
+        prog='main.py convert',
+        description='Конвертация CSV-файлов в бинарный колоночный формат для быстрого чтения через mmap'
+    )
+    parser.add_argument(
+        '--files',
+        nargs='+',
+        required=True,
+        help='Пути к CSV-файлам с данными'
+    )
+    parser.add_argument(
+        '--output',
+        required=True,
+        help='Путь к выходному файлу (например, snapshot.ecol)'
+    )
+    
+    args = parser.parse_args(argv)
+    
+    from columnar import convert_files
+    
+    try:
+        row_count = convert_files(args.files, args.output)
+    except Exception as e:
+        print(f"Ошибка: {e}")
+        return 1
+    
+    print(f"Записано строк: {row_count} -> {args.output}")
+    return 0
+
+
+def serve_main(argv):
+    """Подкоманда serve: сервер отчетов с данными в памяти."""
+    import asyncio
+    from server import DEFAULT_CACHE_ENTRIES, DEFAULT_POLL_INTERVAL, ReportServer
+    
+    parser = argparse.ArgumentParser(
+        prog='main.py serve',
+        description='HTTP-сервер отчетов: данные читаются один раз, результаты кэшируются'
+    )
+    parser.add_argument(
+        '--files',
+        nargs='+',
+        required=True,
+        help='Пути к CSV-файлам с данными, шаблоны или каталоги'
+    )
+    parser.add_argument('--host', default='127.0.0.1', help='Адрес сервера')
+    parser.add_argument('--port', type=int, default=8080, help='Порт сервера')
+    parser.add_argument('--socket', help='Путь к Unix-сокету (вместо --host/--port)')
+    parser.add_argument(
+        '--cache-entries',
+        type=int,
+        default=DEFAULT_CACHE_ENTRIES,
+        help='Количество результатов отчетов в кэше'
+    )
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help='Период проверки файлов на изменения (секунды)'
+    )
+    
+    args = parser.parse_args(argv)
+    try:
+        file_paths = expand_inputs(args.files)
+    except FileNotFoundError as e:
+        print(f"Ошибка: {e}")
+        return 1
+    server = ReportServer(file_paths, cache_entries=args.cache_entries, poll_interval=args.poll_interval)
+    
+    async def run():
+        await server.start(args.host, args.port, socket_path=args.socket)
+        print(f"Сервер отчетов запущен: {', '.join(map(str, server.addresses))}", file=sys.stderr)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        return 0
+    except Exception as e:
+        print(f"Ошибка: {e}")
+        return 1
+    return 0
+
+
+def trend_main(argv):
+    """Подкоманда trend: динамика показателей по датированным снимкам."""
+    parser = argparse.ArgumentParser(
+        prog='main.py trend',
+        description='Динамика средних показателей по группам между датированными снимками данных'
+    )
+    parser.add_argument(
+        '--dir',
+        required=True,
+        help='Каталог со снимками: подкаталоги или CSV-файлы с датой в имени (2026-10-18 или 20261018)'
+    )
+    parser.add_argument('--by', default='position', help='Поле для группировки (например, position или team)')
+    parser.add_argument('--value', default='performance', help='Числовое поле')
+    parser.add_argument(
+        '--where',
+        action='append',
+        metavar='CONDITION',
+        help='Условие фильтрации строк (см. main.py --help)'
+    )
+    parser.add_argument(
+        '--cache',
+        metavar='FILE',
+        help='Файл кэша агрегатов снимков (по умолчанию .trend_cache.pkl в каталоге снимков)'
+    )
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='table', help='Формат вывода')
+    parser.add_argument('--output', metavar='FILE', help='Записать отчет в файл вместо стандартного вывода')
+    
+    args = parser.parse_args(argv)
+    
+    from trends import trend_report
+    
+    try:
+        report_results = trend_report(args.dir, group_by=args.by, value=args.value,
+                                      where=parse_predicates(args.where), cache_path=args.cache)
+        if not report_results:
+            print("Нет данных для анализа")
+            return 0
+        if args.output:
+            with open_output(args.output, args.format) as stream:
+                print_report('trend', report_results, args.format, stream)
+        else:
+            print_report('trend', report_results, args.format)
+    except Exception as e:
+        print(f"Ошибка: {e}")
+        return 1
+    return 0
 
 
 def main():
+    if sys.argv[1:2] == ['convert']:
+        return convert_main(sys.argv[2:])
+    if sys.argv[1:2] == ['serve']:
+        return serve_main(sys.argv[2:])
+    if sys.argv[1:2] == ['trend']:
+        return trend_main(sys.argv[2:])
+    
     parser = argparse.ArgumentParser(
         description='Генератор отчетов по эффективности разработчиков'
     )
@@ -14,43 +351,170 @@ def main():
         '--files',
         nargs='+',
         required=True,
-        help='Пути к CSV-файлам с данными'
+        help='Пути к CSV-файлам с данными (или бинарным колоночным файлам, см. main.py convert), '
+             'шаблоны (exports/**/*.csv) или каталоги'
     )
     parser.add_argument(
         '--report',
+        nargs='+',
         required=True,
-        help=f'Тип отчета. Доступные: {", ".join(get_available_reports())}'
+        help=f'Тип отчета (можно несколько или {ALL_REPORTS}). Доступные: {", ".join(get_available_reports())}'
+    )
+    parser.add_argument(
+        '--columnar',
+        action='store_true',
+        help='Загрузить данные в колоночное представление (быстрее на больших объемах)'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Количество процессов для параллельного разбора файлов'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Сколько файлов читать одновременно (asyncio); ускоряет чтение многих файлов '
+             'с медленных сетевых дисков, порядок строк не меняется'
+    )
+    parser.add_argument(
+        '--chunk-mb',
+        type=int,
+        default=DEFAULT_CHUNK_BYTES // (1024 * 1024),
+        help='Размер фрагмента (МБ), на которые делятся большие файлы в режиме --jobs'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='Каталог дискового кэша разобранных файлов (повторный запуск не разбирает CSV)'
+    )
+    parser.add_argument(
+        '--cache-size-mb',
+        type=int,
+        help='Максимальный размер дискового кэша (МБ), по умолчанию 1024'
+    )
+    parser.add_argument(
+        '--state',
+        help='Файл состояния для инкрементального обновления отчета по дописываемым файлам'
+    )
+    
+    parser.add_argument(
+        '--where',
+        action='append',
+        metavar='CONDITION',
+        help="Условие фильтрации строк, например \"team == 'API Team'\" или \"experience_years >= 3\" "
+             "(можно указать несколько, объединяются по И)"
+    )
+    parser.add_argument(
+        '--dedup',
+        choices=DEDUP_POLICIES,
+        help='Считать каждого сотрудника один раз: last - побеждает строка из файла, указанного позже, '
+             'latest - из файла с более поздним временем изменения'
+    )
+    parser.add_argument(
+        '--dedup-key',
+        nargs='+',
+        default=list(DEFAULT_DEDUP_KEY),
+        metavar='FIELD',
+        help='Поля, по которым сотрудник считается одним и тем же (по умолчанию name)'
+    )
+    parser.add_argument(
+        '--top',
+        type=int,
+        metavar='N',
+        help='Количество сотрудников в рейтинговых отчетах (top_performers и др.) и в skill_leaders'
+    )
+    parser.add_argument(
+        '--skill',
+        help='Навык для отчета skill_leaders (по умолчанию выводятся все навыки)'
+    )
+    parser.add_argument(
+        '--memory-mb',
+        type=int,
+        help='Бюджет памяти (МБ) на группы отчета: при превышении группы выгружаются на диск '
+             'и сортируются внешней сортировкой, по умолчанию 1024'
+    )
+    parser.add_argument(
+        '--format',
+        choices=OUTPUT_FORMATS,
+        default='table',
+        help='Формат вывода: table - выровненная таблица, tsv/csv/jsonl - построчный текстовый вывод, '
+             'binary - потоковый бинарный колоночный формат (см. writers.py)'
+    )
+    parser.add_argument(
+        '--output',
+        metavar='FILE',
+        help='Записать отчет в файл вместо стандартного вывода'
+    )
+    parser.add_argument(
+        '--quarantine',
+        metavar='FILE',
+        help='Не останавливаться на некорректных строках, а записывать их в CSV-файл '
+             '(файл, номер строки, колонка, ошибка, запись)'
+    )
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Вывести в stderr время, CPU (вместе с рабочими процессами --jobs), строки/сек по этапам '
+             'и пиковую память процесса с начала работы к концу этапа (cumulative peak RSS)'
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='FILE',
+        help='Сохранить профиль cProfile в файл (включает --stats)'
     )
     
     args = parser.parse_args()
+    if args.top is not None and args.top < 1:
+        parser.error("--top должен быть положительным числом")
+    if args.concurrency < 1:
+        parser.error("--concurrency должен быть положительным числом")
+    if args.memory_mb is not None and args.memory_mb < 1:
+        parser.error("--memory-mb должен быть положительным числом")
+    if args.dedup and (args.state or args.jobs > 1 or args.cache_dir):
+        parser.error("--dedup нельзя использовать вместе с --state, --jobs и --cache-dir")
+    profiler = PipelineProfiler(enabled=args.stats or bool(args.profile))
+    cprofile = None
+    if args.profile:
+        import cProfile
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+    
+    quarantine = None
+    if args.quarantine:
+        from validation import Quarantine
+        quarantine = Quarantine(args.quarantine)
     
     try:
-        # Чтение данных
-        data = read_csv_files(args.files)
+        with profiler.stage('report'):
+            report_results = build_report(args, profiler, quarantine)
         
-        if not data:
+        if report_results is None:
             print("Нет данных для анализа")
             return 0
         
-        # Генерация отчета
-        report_results = generate_report(args.report, data)
-        
-        # Форматирование вывода
-        if args.report == 'performance':
-            headers = ['№', 'position', 'performance']
-            table_data = []
-            for i, row in enumerate(report_results, 1):
-                table_data.append([i, row['position'], row['performance']])
-            
-            print(tabulate(table_data, headers=headers))
-        else:
-            # Универсальный вывод для будущих отчетов
-            print(tabulate(report_results, headers='keys'))
+        with profiler.stage('format'):
+            if args.output:
+                with open_output(args.output, args.format) as stream:
+                    print_report(args.report[0], report_results, args.format, stream)
+            else:
+                print_report(args.report[0], report_results, args.format)
             
     except Exception as e:
         print(f"Ошибка: {e}")
         return 1
     
+    finally:
+        if quarantine is not None:
+            quarantine.close()
+            if quarantine.count:
+                print(f"{quarantine.summary()}, записаны в {args.quarantine}", file=sys.stderr)
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(args.profile)
+        if profiler.enabled:
+            print_stats(profiler.publish())
+    
     return 0
 
 
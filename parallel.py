@@ -0,0 +1,146 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, List, Optional, Sequence, Tuple
+
+from cache import ParsedCache
+from columnar import ColumnarTable, is_columnar_file, open_table, read_columnar
+from compressed import detect_compression
+from external import share_spill_files
+from file_reader import DEFAULT_CHUNK_BYTES, iter_csv_files, iter_csv_range, split_csv_file
+from filters import Predicate, filter_rows
+from profiling import ReadTimings
+from reports import Report
+from validation import Quarantine
+
+
+# Задача рабочего процесса: путь к файлу и, для больших файлов,
+# диапазон байт (start, end) вместе с колонками заголовка
+Task = Tuple[str, Optional[Tuple[int, int, List[str]]]]
+
+
+def _aggregate_task(report: Report, task: Task, columnar: bool = False,
+                    cache: Optional[ParsedCache] = None, where: Optional[Sequence[Predicate]] = None,
+                    quarantine: bool = False,
+                    timed: bool = False) -> Tuple[Any, Optional[Quarantine], Optional[ReadTimings]]:
+    """
+    Строит частичное состояние отчета по файлу или его фрагменту.
+
+    Выполняется в рабочем процессе: в родительский процесс возвращается
+    только накопленное состояние, а не строки файла, и (если включен
+    карантин) некорректные строки задачи, а также (если включены
+    замеры) время разбора, конвертации и загрузки таблиц.
+    """
+    file_path, chunk = task
+    rejected = Quarantine() if quarantine else None
+    timings = ReadTimings() if timed else None
+    if chunk is None and is_columnar_file(file_path):
+        # Бинарный колоночный файл уже разобран: он открывается через mmap
+        # и не кэшируется (кэш разбирает входной файл как CSV)
+        data = filter_rows(open_table(file_path, timings), where)
+    elif cache is not None:
+        data = filter_rows(cache.get_table(file_path, rejected, timings), where)
+    elif chunk is None:
+        if columnar:
+            data = read_columnar([file_path], rejected, timings, columns=report.columns, where=where,
+                                 dictionary_columns=report.dictionary_columns)
+        else:
+            data = iter_csv_files([file_path], columns=report.columns, where=where, quarantine=rejected,
+                                  timings=timings)
+    else:
+        start, end, fieldnames = chunk
+        if columnar:
+            data = ColumnarTable.from_rows(
+                iter_csv_range(file_path, start, end, fieldnames, columns=report.columns, where=where,
+                               quarantine=rejected, timings=timings),
+                report.columns, report.dictionary_columns,
+            )
+        else:
+            data = iter_csv_range(file_path, start, end, fieldnames, columns=report.columns,
+                                  where=where, quarantine=rejected, timings=timings)
+    return report.feed(report.create(), data), rejected, timings
+
+
+def plan_tasks(file_paths: List[str], chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> List[Task]:
+    """
+    Разбивает входные файлы на задачи для рабочих процессов.
+
+    CSV-файлы больше chunk_bytes делятся на фрагменты по безопасным
+    границам записей, остальные (в том числе бинарные колоночные
+    и сжатые, в которых нельзя перейти к произвольной позиции)
+    обрабатываются целиком.
+
+    Args:
+        file_paths: Пути к CSV-файлам
+        chunk_bytes: Примерный размер фрагмента в байтах
+
+    Returns:
+        List[Task]: Задачи в порядке следования данных
+    """
+    tasks = []
+    for file_path in file_paths:
+        if (os.path.isfile(file_path) and os.path.getsize(file_path) > chunk_bytes
+                and not is_columnar_file(file_path) and detect_compression(file_path) is None):
+            fieldnames, ranges = split_csv_file(file_path, chunk_bytes)
+            tasks.extend((file_path, (start, end, fieldnames)) for start, end in ranges)
+        else:
+            tasks.append((file_path, None))
+    return tasks
+
+
+def aggregate_files(report: Report, file_paths: List[str], jobs: int = 1, columnar: bool = False,
+                    chunk_bytes: int = DEFAULT_CHUNK_BYTES, cache: Optional[ParsedCache] = None,
+                    where: Optional[Sequence[Predicate]] = None, quarantine: Optional[Quarantine] = None,
+                    timings: Optional[ReadTimings] = None) -> Any:
+    """
+    Строит состояние отчета по нескольким файлам в пуле процессов.
+
+    Каждый файл (а большой файл - каждый его фрагмент) разбирается
+    в отдельном рабочем процессе, частичные состояния объединяются
+    в родительском процессе в порядке данных. Набор задач не зависит
+    от числа процессов, поэтому результат совпадает с jobs=1.
+
+    Args:
+        report: Описание отчета
+        file_paths: Пути к CSV-файлам
+        jobs: Количество рабочих процессов
+        columnar: Разбирать файлы в колоночное представление
+        chunk_bytes: Размер фрагмента, начиная с которого файл делится на части
+        cache: Дисковый кэш разобранных файлов (файлы кэшируются целиком,
+            без деления на фрагменты)
+        where: Условия фильтрации строк
+        quarantine: Карантин некорректных строк; строки рабочих процессов
+            добавляются в него в порядке данных
+        timings: Накопитель замеров чтения; замеры рабочих процессов
+            добавляются в него (с отметкой concurrent, если был пул)
+
+    Returns:
+        Состояние отчета для передачи в report.finalize
+    """
+    if cache is not None:
+        tasks = [(file_path, None) for file_path in file_paths]
+    else:
+        tasks = plan_tasks(file_paths, chunk_bytes)
+    state = report.create()
+    args = (repeat(report), tasks, repeat(columnar), repeat(cache), repeat(where), repeat(quarantine is not None),
+            repeat(timings is not None))
+
+    # Группы, выгруженные рабочим процессом на диск, передаются каталогом
+    # разделов, а не через память (см. external.share_spill_files)
+    pool = None
+    if jobs > 1 and len(tasks) > 1:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=share_spill_files)
+    try:
+        results = pool.map(_aggregate_task, *args) if pool is not None else map(_aggregate_task, *args)
+        for partial, rejected, task_timings in results:
+            state.merge(partial)
+            if rejected is not None:
+                quarantine.merge(rejected)
+            if task_timings is not None:
+                task_timings.concurrent = pool is not None
+                timings.merge(task_timings)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return state
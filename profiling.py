@@ -0,0 +1,201 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - модуль resource недоступен в Windows
+    resource = None
+
+
+# Порядок этапов в статистике: load - открытие уже разобранных таблиц
+# (кэш, бинарные колоночные файлы), parse и convert - разбор CSV
+STAGE_ORDER = ('load', 'parse', 'convert', 'report', 'format')
+
+# Обработчики, получающие статистику по этапам после каждого запуска
+_STATS_HOOKS: List[Callable[[List[Dict[str, Any]]], None]] = []
+
+
+def register_stats_hook(hook: Callable[[List[Dict[str, Any]]], None]) -> None:
+    """
+    Регистрирует обработчик статистики этапов.
+
+    Обработчик вызывается после каждого запуска с профилированием
+    со списком словарей (по одному на этап), как в PipelineProfiler.stats.
+    """
+    _STATS_HOOKS.append(hook)
+
+
+def unregister_stats_hook(hook: Callable[[List[Dict[str, Any]]], None]) -> None:
+    """Удаляет ранее зарегистрированный обработчик статистики."""
+    _STATS_HOOKS.remove(hook)
+
+
+def _cumulative_peak_rss_bytes() -> Optional[int]:
+    """
+    Пиковая резидентная память с начала работы в байтах.
+
+    Это максимум за все время жизни процесса (а не за этап) по самому
+    процессу и по самому большому из завершившихся дочерних процессов
+    (рабочих процессов --jobs).
+    """
+    if resource is None:
+        return None
+    # ru_maxrss в Linux измеряется в килобайтах
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * 1024
+
+
+def _cpu_time() -> float:
+    """Процессорное время процесса и завершившихся дочерних процессов (пула --jobs)."""
+    cpu = time.process_time()
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu += children.ru_utime + children.ru_stime
+    return cpu
+
+
+class ReadTimings:
+    """
+    Время и количество строк этапов чтения (разбор, конвертация, загрузка).
+
+    Передается в функции чтения (параметр timings в file_reader и
+    других модулях), которые добавляют в него время своих этапов.
+    Объект сериализуется, поэтому рабочие процессы возвращают свои
+    замеры вместе с результатом; concurrent отмечает, что замеры
+    получены в параллельных процессах и их время нельзя вычитать из
+    времени этапа родительского процесса.
+    """
+
+    __slots__ = ('stages', 'concurrent')
+
+    def __init__(self):
+        # Этап -> [время, процессорное время, строки]
+        self.stages: Dict[str, List[float]] = {}
+        self.concurrent = False
+
+    def add(self, stage: str, wall: float, cpu: float, rows: int = 0) -> None:
+        """Добавляет замер этапа."""
+        totals = self.stages.get(stage)
+        if totals is None:
+            self.stages[stage] = [wall, cpu, rows]
+        else:
+            totals[0] += wall
+            totals[1] += cpu
+            totals[2] += rows
+
+    def merge(self, other: 'ReadTimings') -> 'ReadTimings':
+        """Добавляет замеры другого объекта (например, рабочего процесса)."""
+        for stage, (wall, cpu, rows) in other.stages.items():
+            self.add(stage, wall, cpu, rows)
+        self.concurrent = self.concurrent or other.concurrent
+        return self
+
+
+class StageStats:
+    """
+    Накопленная статистика одного этапа конвейера.
+
+    cumulative_peak_rss - пиковая память с начала работы к концу этапа
+    (см. _cumulative_peak_rss_bytes), а не собственный пик этапа: этап
+    не может показать значение меньше, чем у предыдущих. Для вложенных
+    этапов (load, parse, convert) она не заполняется.
+    """
+
+    __slots__ = ('name', 'wall', 'cpu', 'rows', 'cumulative_peak_rss')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.rows = 0
+        self.cumulative_peak_rss = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'stage': self.name,
+            'wall_s': round(self.wall, 6),
+            'cpu_s': round(self.cpu, 6),
+            'rows': self.rows,
+            'rows_per_s': round(self.rows / self.wall) if self.rows and self.wall else None,
+            'cumulative_peak_rss_bytes': self.cumulative_peak_rss,
+        }
+
+
+class PipelineProfiler:
+    """
+    Поэтапное профилирование конвейера: чтение, конвертация, отчет, вывод.
+
+    Внешние этапы (stage) выполняются последовательно и для них
+    фиксируется пиковая память с начала работы (cumulative peak RSS, см.
+    StageStats); процессорное время включает дочерние процессы. При потоковой обработке разбор CSV и конвертация
+    чисел чередуются с группировкой, поэтому их замеряют сами функции
+    чтения: в них передается timings (см. ReadTimings), и после этапа
+    замеры вычитаются из его времени. Для параллельных процессов
+    время parse и convert - суммарное по процессам, а из времени
+    внешнего этапа вычитается только процессорное время.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._stages: Dict[str, StageStats] = {}
+        # Время вложенных этапов, которое надо вычесть из внешнего
+        self._nested_wall = 0.0
+        self._nested_cpu = 0.0
+        # Замеры функций чтения в текущем этапе
+        self.timings: Optional[ReadTimings] = ReadTimings() if enabled else None
+
+    def _get(self, name: str) -> StageStats:
+        stats = self._stages.get(name)
+        if stats is None:
+            stats = self._stages[name] = StageStats(name)
+        return stats
+
+    @contextmanager
+    def stage(self, name: str):
+        """Измеряет внешний этап конвейера."""
+        if not self.enabled:
+            yield
+            return
+
+        stats = self._get(name)
+        self._nested_wall = self._nested_cpu = 0.0
+        self.timings = ReadTimings()
+        wall_start, cpu_start = time.perf_counter(), _cpu_time()
+        try:
+            yield stats
+        finally:
+            self.add_timings(self.timings)
+            self.timings = ReadTimings()
+            stats.wall += time.perf_counter() - wall_start - self._nested_wall
+            stats.cpu += _cpu_time() - cpu_start - self._nested_cpu
+            stats.cumulative_peak_rss = _cumulative_peak_rss_bytes()
+            self._nested_wall = self._nested_cpu = 0.0
+
+    def _add_nested(self, name: str, wall: float, cpu: float, rows: int = 0, concurrent: bool = False) -> None:
+        stats = self._get(name)
+        stats.wall += wall
+        stats.cpu += cpu
+        stats.rows += rows
+        if not concurrent:
+            self._nested_wall += wall
+        self._nested_cpu += cpu
+
+    def add_timings(self, timings: ReadTimings) -> None:
+        """Добавляет замеры функций чтения как вложенные этапы текущего этапа."""
+        for name, (wall, cpu, rows) in timings.stages.items():
+            self._add_nested(name, wall, cpu, rows, timings.concurrent)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Возвращает статистику по этапам в порядке выполнения конвейера."""
+        order = {name: i for i, name in enumerate(STAGE_ORDER)}
+        stages = sorted(self._stages.values(), key=lambda stats: order.get(stats.name, len(order)))
+        return [stats.as_dict() for stats in stages]
+
+    def publish(self) -> List[Dict[str, Any]]:
+        """Передает статистику зарегистрированным обработчикам."""
+        stats = self.stats()
+        if self.enabled:
+            for hook in list(_STATS_HOOKS):
+                hook(stats)
+        return stats
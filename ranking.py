@@ -0,0 +1,144 @@
+import heapq
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from aggregation import GroupKey
+from reports import Report
+
+
+# Сколько сотрудников выводится в рейтинге (на группу) по умолчанию
+DEFAULT_TOP = 10
+
+# Элемент кучи: ключ сравнения, обратный порядковый номер строки, имя
+HeapItem = Tuple[float, int, str]
+
+
+class RankedGroups:
+    """
+    Лучшие (или худшие) N строк по числовому полю в каждой группе.
+
+    Для каждой группы хранится min-куча не больше чем из n элементов,
+    на вершине которой - худший из отобранных. Каждая строка сравнивается
+    с вершиной, и только лучшая вытесняет ее, поэтому время - O(строк *
+    log n), а память - O(групп * n) независимо от объема данных. При
+    равных значениях выше оказывается строка, встретившаяся раньше.
+    """
+
+    def __init__(self, group_by: Optional[GroupKey], value: str, n: int = DEFAULT_TOP, largest: bool = True):
+        """
+        Args:
+            group_by: Поле (или кортеж полей) для группировки; None - общий рейтинг
+            value: Числовое поле, по которому строится рейтинг
+            n: Размер рейтинга в каждой группе
+            largest: Отбирать наибольшие значения (False - наименьшие)
+        """
+        self.group_by = group_by
+        self.value = value
+        self.n = n
+        self.largest = largest
+        self.heaps: Dict[Any, List[HeapItem]] = {}
+        # Количество добавленных строк, из него берутся порядковые номера
+        self.rows = 0
+
+    def key(self, row: Dict) -> Any:
+        """Возвращает ключ группы для строки."""
+        if self.group_by is None:
+            return None
+        if isinstance(self.group_by, tuple):
+            return tuple(row[field] for field in self.group_by)
+        return row[self.group_by]
+
+    def _push(self, key: Any, item: HeapItem) -> None:
+        heap = self.heaps.get(key)
+        if heap is None:
+            heap = self.heaps[key] = []
+        if len(heap) < self.n:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+    def add(self, row: Dict) -> None:
+        """Добавляет одну строку."""
+        value = row[self.value]
+        self._push(self.key(row), (value if self.largest else -value, -self.rows, row['name']))
+        self.rows += 1
+
+    def update(self, rows: Iterable[Dict]) -> 'RankedGroups':
+        """Добавляет все строки из итерируемого объекта."""
+        for row in rows:
+            self.add(row)
+        return self
+
+    def merge(self, other: 'RankedGroups') -> 'RankedGroups':
+        """
+        Объединяет рейтинги другого состояния с текущими.
+
+        Порядковые номера строк other сдвигаются на количество строк
+        текущего состояния, поэтому слияние частичных состояний по порядку
+        данных разрешает равенства так же, как последовательный проход.
+        """
+        offset = self.rows
+        for key, items in other.heaps.items():
+            for ordered, order, name in items:
+                self._push(key, (ordered, order - offset, name))
+        self.rows += other.rows
+        return self
+
+    def ranked(self, key: Any) -> List[Tuple[str, float]]:
+        """
+        Рейтинг группы.
+
+        Returns:
+            List[Tuple]: Пары (имя, значение) от первого места к последнему
+        """
+        items = sorted(self.heaps.get(key, []), reverse=True)
+        return [(name, ordered if self.largest else -ordered) for ordered, _, name in items]
+
+    def groups(self) -> List[Any]:
+        """Ключи групп по возрастанию."""
+        return sorted(self.heaps)
+
+
+class TopReport(Report):
+    """Рейтинг сотрудников по числовому полю, общий или по группам."""
+
+    def __init__(self, value: str, group_by: Optional[GroupKey] = None,
+                 top: int = DEFAULT_TOP, largest: bool = True):
+        """
+        Args:
+            value: Числовое поле, по которому строится рейтинг
+            group_by: Поле (или кортеж полей) для группировки; None - общий рейтинг
+            top: Количество сотрудников в рейтинге (на группу)
+            largest: Лучшие - с наибольшим значением (False - с наименьшим)
+        """
+        self.value = value
+        self.group_by = group_by
+        self.top = top
+        self.largest = largest
+        fields = () if group_by is None else group_by if isinstance(group_by, tuple) else (group_by,)
+        self.fields = fields
+        self.columns = frozenset(fields) | {'name', value}
+
+    def create(self) -> RankedGroups:
+        return RankedGroups(self.group_by, self.value, self.top, self.largest)
+
+    def finalize(self, state: RankedGroups) -> List[Dict[str, Any]]:
+        report_data = []
+        for key in state.groups():
+            values = key if isinstance(self.group_by, tuple) else (key,)
+            group = dict(zip(self.fields, values))
+            for rank, (name, value) in enumerate(state.ranked(key)[:self.top], 1):
+                report_data.append({**group, 'rank': rank, 'name': name, self.value: value})
+
+        return report_data
+
+
+# Лучшие и худшие по эффективности сотрудники
+TOP_PERFORMERS_REPORT = TopReport('performance')
+BOTTOM_PERFORMERS_REPORT = TopReport('performance', largest=False)
+
+# Лучшие по эффективности сотрудники в каждой команде и на каждой должности
+TOP_PERFORMERS_BY_TEAM_REPORT = TopReport('performance', group_by='team')
+TOP_PERFORMERS_BY_POSITION_REPORT = TopReport('performance', group_by='position')
+
+# Сотрудники с наибольшим количеством выполненных задач
+TOP_COMPLETED_TASKS_REPORT = TopReport('completed_tasks')
@@ -0,0 +1,113 @@
+import keyword
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Sequence, Tuple
+
+
+# Колонки стандартного файла сотрудников в порядке заголовка
+EMPLOYEE_FIELDS = ('name', 'position', 'completed_tasks', 'performance', 'skills', 'team', 'experience_years')
+
+# Категориальные колонки: немногие различные значения повторяются во всех
+# строках, поэтому при компактном чтении они интернируются (см. file_reader)
+CATEGORICAL_FIELDS = frozenset({'position', 'team', 'skills'})
+
+
+class Record(Mapping):
+    """
+    Компактная строка данных с фиксированным набором полей.
+
+    Значения хранятся в слотах объекта, а не в собственном словаре
+    строки: имена полей хранятся один раз в классе, поэтому строка
+    занимает в несколько раз меньше памяти, чем dict. Для отчетов запись
+    неотличима от словаря (row['performance'], row.get, dict(row),
+    сравнение со словарем), поэтому ее принимают все отчеты. Подклассы
+    для конкретного набора полей создает record_type.
+    """
+
+    __slots__ = ()
+
+    # Имена полей и соответствующие им слоты
+    _fields: Tuple[str, ...] = ()
+    _slot_of: Dict[str, str] = {}
+
+    def __init__(self, *values: Any):
+        if len(values) != len(self._fields):
+            raise TypeError(f"Ожидалось значений: {len(self._fields)}, получено: {len(values)}")
+        for slot, value in zip(self.__slots__, values):
+            setattr(self, slot, value)
+
+    def __getitem__(self, field: str) -> Any:
+        try:
+            slot = self._slot_of[field]
+        except KeyError:
+            raise KeyError(field) from None
+        return getattr(self, slot)
+
+    def __contains__(self, field: Any) -> bool:
+        return field in self._slot_of
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self) -> Tuple:
+        # Классы создаются во время работы, поэтому при сериализации
+        # сохраняются имена полей, а не ссылка на класс
+        return _rebuild, (self._fields, tuple(getattr(self, slot) for slot in self.__slots__))
+
+
+def _slot_name(field: str, position: int) -> str:
+    """Имя слота поля: само имя, если это допустимый атрибут, иначе по номеру колонки."""
+    if field.isidentifier() and not keyword.iskeyword(field) and not field.startswith('_') \
+            and not hasattr(Record, field):
+        return field
+    return f'_field{position}'
+
+
+def _make_record_type(name: str, fields: Sequence[str]) -> type:
+    fields = tuple(fields)
+    if len(set(fields)) != len(fields):
+        raise ValueError(f"Повторяющиеся колонки: {', '.join(fields)}")
+    slots = tuple(_slot_name(field, i) for i, field in enumerate(fields))
+    return type(name, (Record,), {
+        '__module__': __name__,
+        '__slots__': slots,
+        '_fields': fields,
+        '_slot_of': dict(zip(fields, slots)),
+    })
+
+
+# Запись стандартного файла сотрудников
+Employee = _make_record_type('Employee', EMPLOYEE_FIELDS)
+
+# Созданные классы записей по набору полей
+_RECORD_TYPES: Dict[Tuple[str, ...], type] = {EMPLOYEE_FIELDS: Employee}
+
+
+def record_type(fields: Sequence[str]) -> type:
+    """
+    Возвращает класс компактной записи для набора полей.
+
+    Для стандартного заголовка это Employee, для других наборов
+    (например, при чтении только нужных отчету колонок) класс создается
+    один раз и переиспользуется.
+
+    Args:
+        fields: Имена полей в порядке значений
+
+    Returns:
+        type: Подкласс Record; значения передаются в конструктор по порядку
+    """
+    fields = tuple(fields)
+    cls = _RECORD_TYPES.get(fields)
+    if cls is None:
+        cls = _RECORD_TYPES[fields] = _make_record_type('Record', fields)
+    return cls
+
+
+def _rebuild(fields: Tuple[str, ...], values: Tuple) -> Record:
+    return record_type(fields)(*values)
@@ -1,68 +1,391 @@
-from typing import List, Dict, Any
-from collections import defaultdict
+import copy
+import importlib
+from operator import itemgetter
+from typing import List, Dict, Any, Iterable, Iterator, FrozenSet, Optional, Union
+
+from aggregation import GroupedAggregator, GroupKey
+from external import DEFAULT_MEMORY_BYTES, SpillingAggregator, external_sort
+
+
+class Report:
+    """
+    Базовый класс описания отчета.
+    
+    Отчет создает состояние (накопитель) через create, состояние
+    наполняется данными через feed и может объединяться с другими
+    состояниями через merge, а finalize превращает его в строки отчета.
+    Атрибут columns перечисляет колонки, которые нужны отчету (None -
+    все), чтобы при чтении не конвертировать и не хранить остальные.
+    Отчеты с одинаковым state_key строят одно и то же состояние (разница
+    только в finalize), поэтому при совместном запуске оно строится
+    один раз. Атрибут dictionary_columns перечисляет строковые колонки,
+    которые отчет группирует по колоночной таблице: только они хранятся
+    в ней в словарном кодировании.
+    """
+    
+    columns: Optional[FrozenSet[str]] = None
+    state_key: Optional[str] = None
+    dictionary_columns: FrozenSet[str] = frozenset()
+    
+    def create(self):
+        """Создает пустое состояние отчета."""
+        raise NotImplementedError
+    
+    def feed(self, state, data):
+        """
+        Наполняет состояние данными.
+        
+        Args:
+            state: Состояние, созданное через create
+            data: Итератор строк или колоночная таблица (ColumnarTable)
+        """
+        rows = data.iter_rows() if hasattr(data, 'iter_rows') else data
+        state.update(rows)
+        return state
+    
+    def finalize(self, state) -> List[Dict[str, Any]]:
+        """Формирует строки отчета из накопленного состояния."""
+        raise NotImplementedError
+    
+    def __call__(self, data: Iterable[Dict]) -> List[Dict[str, Any]]:
+        return self.finalize(self.feed(self.create(), data))
+
+
+class GroupReport(Report):
+    """
+    Отчет вида «группировка + агрегат» поверх GroupedAggregator.
+    
+    Если групп больше, чем помещается в бюджет памяти memory_bytes,
+    группы выгружаются на диск (см. external.SpillingAggregator), а строки
+    отчета сортируются внешней сортировкой: результат finalize тогда -
+    итерируемый SortedRuns, а не список.
+    """
+    
+    def __init__(self, group_by: GroupKey, value: str, metric: str = 'avg',
+                 precision: int = 2, descending: bool = True, memory_bytes: int = DEFAULT_MEMORY_BYTES):
+        """
+        Args:
+            group_by: Поле (или кортеж полей) для группировки
+            value: Числовое поле для агрегации, оно же имя колонки в отчете
+            metric: Метрика RunningStats (avg, sum, count, min, max, ...)
+            precision: Количество знаков после запятой при округлении
+            descending: Сортировать по убыванию значения метрики
+            memory_bytes: Бюджет памяти на группы и сортировку в байтах
+        """
+        self.group_by = group_by
+        self.value = value
+        self.columns = frozenset(group_by if isinstance(group_by, tuple) else (group_by,)) | {value}
+        # Колоночная таблица группируется по одной колонке (см. feed)
+        self.dictionary_columns = frozenset() if isinstance(group_by, tuple) else frozenset({group_by})
+        self.metric = metric
+        self.precision = precision
+        self.descending = descending
+        self.memory_bytes = memory_bytes
+    
+    def create(self) -> SpillingAggregator:
+        return SpillingAggregator(self.group_by, self.value, self.memory_bytes)
+    
+    def feed(self, state: GroupedAggregator, data) -> GroupedAggregator:
+        # Колоночную таблицу группируем редукцией по колонкам, без построения строк
+        if hasattr(data, 'group_stats') and data.supports_grouping(self.group_by, self.value):
+            return state.merge(data.group_stats(self.group_by, self.value))
+        return super().feed(state, data)
+    
+    def _iter_rows(self, state: GroupedAggregator) -> Iterator[Dict[str, Any]]:
+        fields = self.group_by if isinstance(self.group_by, tuple) else (self.group_by,)
+        for key, stats in state.items():
+            values = key if isinstance(self.group_by, tuple) else (key,)
+            row = dict(zip(fields, values))
+            row[self.value] = round(stats.value(self.metric), self.precision)
+            yield row
+    
+    def finalize(self, state: GroupedAggregator) -> List[Dict[str, Any]]:
+        if getattr(state, 'spilled', False):
+            return external_sort(self._iter_rows(state), key=itemgetter(self.value),
+                                 reverse=self.descending, memory_bytes=self.memory_bytes)
+        
+        report_data = list(self._iter_rows(state))
+        report_data.sort(key=lambda x: x[self.value], reverse=self.descending)
+        
+        return report_data
+
+
+class MultiState:
+    """Составное состояние: каждая строка передается во все вложенные состояния."""
+    
+    def __init__(self, states: List[Any]):
+        self.states = states
+    
+    def add(self, row: Dict) -> None:
+        for state in self.states:
+            state.add(row)
+    
+    def update(self, rows: Iterable[Dict]) -> 'MultiState':
+        states = self.states
+        for row in rows:
+            for state in states:
+                state.add(row)
+        return self
+    
+    def merge(self, other: 'MultiState') -> 'MultiState':
+        for state, other_state in zip(self.states, other.states):
+            state.merge(other_state)
+        return self
+
+
+class MultiReport(Report):
+    """
+    Несколько отчетов за один проход по данным.
+    
+    Каждая строка передается во все накопители отчетов сразу, поэтому
+    чтение и разбор файлов выполняются один раз на запуск. Отчеты с
+    одинаковым state_key получают общий накопитель. Результат
+    finalize - словарь «название отчета -> строки отчета».
+    """
+    
+    def __init__(self, report_names: List[str], reports: Optional[Dict[str, Report]] = None):
+        """
+        Args:
+            report_names: Названия отчетов из REPORT_REGISTRY
+            reports: Описания отчетов по названию, которые используются
+                вместо описаний из реестра (например, с параметрами запуска)
+        """
+        reports = reports or {}
+        self.report_names = list(report_names)
+        self.reports = [reports[name] if name in reports else get_report(name) for name in self.report_names]
+        # Номер накопителя каждого отчета и отчеты, создающие накопители
+        self.slots: List[int] = []
+        self.owners: List[Report] = []
+        shared: Dict[str, int] = {}
+        for report in self.reports:
+            if report.state_key is not None and report.state_key in shared:
+                self.slots.append(shared[report.state_key])
+                continue
+            if report.state_key is not None:
+                shared[report.state_key] = len(self.owners)
+            self.slots.append(len(self.owners))
+            self.owners.append(report)
+        if all(report.columns is not None for report in self.reports):
+            self.columns = frozenset().union(*(report.columns for report in self.reports))
+        self.dictionary_columns = frozenset().union(*(report.dictionary_columns for report in self.reports))
+    
+    def create(self) -> MultiState:
+        return MultiState([report.create() for report in self.owners])
+    
+    def feed(self, state: MultiState, data) -> MultiState:
+        # Колоночную таблицу каждый отчет обрабатывает своим способом,
+        # поток строк читается один раз для всех отчетов
+        if hasattr(data, 'iter_rows'):
+            for report, report_state in zip(self.owners, state.states):
+                report.feed(report_state, data)
+            return state
+        return state.update(data)
+    
+    def finalize(self, state: MultiState) -> Dict[str, List[Dict[str, Any]]]:
+        return {
+            name: report.finalize(state.states[slot])
+            for name, report, slot in zip(self.report_names, self.reports, self.slots)
+        }
+
+
+# Средняя эффективность по должностям
+PERFORMANCE_REPORT = GroupReport(group_by='position', value='performance')
+
+# Средняя эффективность по командам
+TEAM_REPORT = GroupReport(group_by='team', value='performance')
+
+# Средняя эффективность в зависимости от опыта работы
+EXPERIENCE_REPORT = GroupReport(group_by='experience_years', value='performance')
+
+# Средняя эффективность каждого сотрудника по всем снимкам (групп столько же,
+# сколько сотрудников, при большом их числе группы выгружаются на диск)
+EMPLOYEE_REPORT = GroupReport(group_by='name', value='performance')
 
 
 class ReportGenerator:
     """Базовый класс для генерации отчетов."""
     
     @staticmethod
-    def performance_report(data: List[Dict]) -> List[Dict[str, Any]]:
+    def performance_report(data: Iterable[Dict]) -> List[Dict[str, Any]]:
         """
         Генерирует отчет по средней эффективности по должностям.
         
+        Данные читаются за один проход, для каждой должности хранятся только
+        накопленные статистики, поэтому на вход можно передавать генератор строк.
+        
         Args:
-            data: Список словарей с данными сотрудников
+            data: Список или итератор словарей с данными сотрудников
             
         Returns:
             List[Dict]: Отсортированный список с средней эффективностью по должностям
         """
-        position_stats = defaultdict(list)
-        
-        # Группируем performance по должностям
-        for employee in data:
-            position = employee['position']
-            performance = employee['performance']
-            position_stats[position].append(performance)
-        
-        # Вычисляем среднее для каждой должности
-        report_data = []
-        for position, performances in position_stats.items():
-            avg_performance = sum(performances) / len(performances)
-            report_data.append({
-                'position': position,
-                'performance': round(avg_performance, 2)
-            })
-        
-        # Сортируем по убыванию эффективности
-        report_data.sort(key=lambda x: x['performance'], reverse=True)
-        
-        return report_data
+        return PERFORMANCE_REPORT(data)
 
 
-# Реестр доступных отчетов для легкого добавления новых
+# Реестр доступных отчетов для легкого добавления новых. Значение - описание
+# отчета или строка 'модуль:атрибут': такой модуль импортируется только
+# при первом запросе отчета, а не при запуске программы
 REPORT_REGISTRY = {
-    'performance': ReportGenerator.performance_report
+    'performance': PERFORMANCE_REPORT,
+    'team': TEAM_REPORT,
+    'experience': EXPERIENCE_REPORT,
+    'employee_performance': EMPLOYEE_REPORT,
+    'skills': 'skills:SKILLS_REPORT',
+    'skill_leaders': 'skills:SKILL_LEADERS_REPORT',
+    'performance_quantiles': 'sketches:PERFORMANCE_QUANTILES_REPORT',
+    'distinct_employees': 'sketches:DISTINCT_EMPLOYEES_REPORT',
+    'skill_heavy_hitters': 'sketches:SKILL_HEAVY_HITTERS_REPORT',
+    'top_performers': 'ranking:TOP_PERFORMERS_REPORT',
+    'bottom_performers': 'ranking:BOTTOM_PERFORMERS_REPORT',
+    'top_performers_by_team': 'ranking:TOP_PERFORMERS_BY_TEAM_REPORT',
+    'top_performers_by_position': 'ranking:TOP_PERFORMERS_BY_POSITION_REPORT',
+    'top_completed_tasks': 'ranking:TOP_COMPLETED_TASKS_REPORT',
 }
 
+# Псевдоним для запуска всех отчетов из реестра
+ALL_REPORTS = 'all'
+
+
+def register_report(report_name: str, report: Union[Report, str]) -> None:
+    """
+    Регистрирует отчет в REPORT_REGISTRY.
+    
+    Args:
+        report_name: Название отчета
+        report: Описание отчета или ссылка 'модуль:атрибут' для ленивой загрузки
+    """
+    REPORT_REGISTRY[report_name] = report
+
+
+def configure_reports(report_names: Iterable[str], **options: Any) -> Dict[str, Report]:
+    """
+    Задает параметры отчетов для одного запуска (например, top или skill).
+    
+    Для отчетов, у которых есть атрибут с именем параметра, создаются
+    копии с новыми значениями. Реестр отчетов не меняется: копии
+    передаются вместо описаний из реестра (generate_report, MultiReport).
+    
+    Args:
+        report_names: Названия отчетов
+        **options: Значения атрибутов отчетов (None - не менять)
+        
+    Returns:
+        Dict: Измененные описания отчетов по названию
+    """
+    options = {option: value for option, value in options.items() if value is not None}
+    reports = {}
+    if not options:
+        return reports
+    for name in report_names:
+        report = get_report(name)
+        changed = {option: value for option, value in options.items() if hasattr(report, option)}
+        if changed:
+            report = copy.copy(report)
+            for option, value in changed.items():
+                setattr(report, option, value)
+            reports[name] = report
+    return reports
+
 
 def get_available_reports():
     """Возвращает список доступных отчетов."""
     return list(REPORT_REGISTRY.keys())
 
 
-def generate_report(report_name: str, data: List[Dict]) -> List[Dict[str, Any]]:
+def get_report(report_name: str) -> Report:
     """
-    Генерирует указанный отчет на основе данных.
+    Возвращает описание отчета по имени.
     
     Args:
         report_name: Название отчета
-        data: Данные для анализа
         
     Returns:
-        List[Dict]: Результаты отчета
+        Report: Описание отчета из REPORT_REGISTRY
     """
     if report_name not in REPORT_REGISTRY:
         available_reports = ', '.join(get_available_reports())
         raise ValueError(f"Отчет '{report_name}' не найден. Доступные отчеты: {available_reports}")
     
-    return REPORT_REGISTRY[report_name](data)
+    report = REPORT_REGISTRY[report_name]
+    if isinstance(report, str):
+        # Ленивая регистрация: импортируем модуль отчета при первом запросе
+        module_name, _, attribute = report.partition(':')
+        report = REPORT_REGISTRY[report_name] = getattr(importlib.import_module(module_name), attribute)
+    return report
+
+
+def generate_report(report_name: str, data: Iterable[Dict],
+                    reports: Optional[Dict[str, Report]] = None) -> List[Dict[str, Any]]:
+    """
+    Генерирует указанный отчет на основе данных.
+    
+    Args:
+        report_name: Название отчета
+        data: Данные для анализа (список или итератор строк)
+        reports: Описания отчетов, которые используются вместо реестра
+        
+    Returns:
+        List[Dict]: Результаты отчета
+    """
+    if reports and report_name in reports:
+        return reports[report_name](data)
+    return get_report(report_name)(data)
+
+
+def expand_report_names(report_names: Iterable[str]) -> List[str]:
+    """
+    Раскрывает псевдоним 'all' и убирает повторы, сохраняя порядок.
+    
+    Args:
+        report_names: Названия отчетов
+        
+    Returns:
+        List[str]: Названия отчетов для запуска
+    """
+    expanded = []
+    for name in report_names:
+        for item in (get_available_reports() if name == ALL_REPORTS else [name]):
+            if item not in expanded:
+                expanded.append(item)
+    return expanded
+
+
+def generate_reports(report_names: List[str], data: Iterable[Dict],
+                     reports: Optional[Dict[str, Report]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Генерирует несколько отчетов за один проход по данным.
+    
+    Args:
+        report_names: Названия отчетов (или 'all')
+        data: Данные для анализа (список или итератор строк)
+        reports: Описания отчетов, которые используются вместо реестра
+        
+    Returns:
+        Dict: Результаты по названию отчета
+    """
+    return MultiReport(expand_report_names(report_names), reports)(data)
+
+
+def required_columns(report_names: Iterable[str]) -> Optional[FrozenSet[str]]:
+    """
+    Возвращает колонки, которые нужны отчетам (None - нужны все).
+    
+    Неизвестные названия не считаются ошибкой: для них возвращается
+    None, а ошибку сообщит сама генерация отчета.
+    
+    Args:
+        report_names: Названия отчетов (или 'all')
+        
+    Returns:
+        Набор колонок или None
+    """
+    columns = frozenset()
+    for name in expand_report_names(report_names):
+        try:
+            report = get_report(name)
+        except ValueError:
+            return None
+        if report.columns is None:
+            return None
+        columns |= report.columns
+    return columns
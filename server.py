@@ -0,0 +1,349 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from file_reader import read_csv_files
+from filters import filter_rows, parse_predicates
+from reports import (
+    configure_reports, expand_report_names, generate_report, generate_reports, get_available_reports, get_report,
+)
+
+
+# Количество закэшированных результатов отчетов по умолчанию
+DEFAULT_CACHE_ENTRIES = 128
+
+# Период проверки входных файлов на изменения (секунды)
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Максимальный размер строки запроса и заголовков HTTP
+MAX_REQUEST_BYTES = 64 * 1024
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                500: 'Internal Server Error'}
+
+
+def _file_signature(file_paths: List[str]) -> Tuple:
+    """Размер и время изменения каждого файла; меняется при любой записи в файл."""
+    signature = []
+    for file_path in file_paths:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            signature.append((file_path, None, None))
+        else:
+            signature.append((file_path, stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+class WarmDataset:
+    """
+    Данные CSV-файлов, загруженные в память один раз.
+
+    Данные перечитываются только при изменении файлов (по размеру и
+    времени изменения); каждая загрузка увеличивает version, что
+    делает недействительными результаты, посчитанные по старым данным.
+    Версия и строки заменяются одним присваиванием, поэтому перезагрузка
+    в другом потоке не может вернуть строки одной версии с номером другой.
+    Строки хранятся компактными записями (см. records.Record).
+    Вместе со строками при загрузке один раз строятся общие состояния
+    отчетов (например, индекс навыков, см. Report.state_key): отчеты
+    без условий фильтрации берут их готовыми, не разбирая строки заново.
+    """
+
+    def __init__(self, file_paths: List[str]):
+        """
+        Args:
+            file_paths: Пути к CSV-файлам
+        """
+        self.file_paths = list(file_paths)
+        self.snapshot: Tuple[int, List[Dict[str, Any]], Dict[str, Any]] = (0, [], {})
+        self._signature = None
+
+    @property
+    def version(self) -> int:
+        return self.snapshot[0]
+
+    @property
+    def rows(self) -> List[Dict[str, Any]]:
+        return self.snapshot[1]
+
+    @property
+    def states(self) -> Dict[str, Any]:
+        return self.snapshot[2]
+
+    def is_stale(self) -> bool:
+        """Проверяет, изменились ли файлы с последней загрузки."""
+        return _file_signature(self.file_paths) != self._signature
+
+    def reload(self) -> bool:
+        """
+        Перечитывает файлы, если они изменились.
+
+        Returns:
+            bool: True, если данные были перечитаны
+        """
+        signature = _file_signature(self.file_paths)
+        if signature == self._signature:
+            return False
+        rows = read_csv_files(self.file_paths, compact=True)
+        states = _shared_states(rows)
+        self._signature = signature
+        self.snapshot = (self.version + 1, rows, states)
+        return True
+
+
+def _shared_states(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Строит общие состояния отчетов (по state_key) для всех строк набора данных."""
+    states: Dict[str, Any] = {}
+    if not rows:
+        return states
+    fields = set(rows[0])
+    for name in get_available_reports():
+        report = get_report(name)
+        if report.state_key is None or report.state_key in states:
+            continue
+        if report.columns is not None and not report.columns <= fields:
+            continue
+        states[report.state_key] = report.feed(report.create(), rows)
+    return states
+
+
+class ResultCache:
+    """
+    LRU-кэш готовых результатов отчетов.
+
+    Ключ включает версию данных, поэтому после перезагрузки файлов
+    старые результаты больше не запрашиваются и вытесняются первыми.
+    Отчеты считаются в пуле потоков, поэтому обращения к кэшу
+    защищены блокировкой.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        """
+        Args:
+            max_entries: Максимальное количество результатов в кэше
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        """Возвращает результат по ключу или None."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: Tuple, result: bytes) -> None:
+        """Сохраняет результат и вытесняет давно не использованные."""
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ReportServer:
+    """
+    Сервер отчетов на asyncio с данными в памяти.
+
+    Обрабатывает HTTP-запросы:
+        GET /reports - список доступных отчетов
+        GET /report?name=performance[&name=team][&where=...][&skill=...] - результаты отчета в JSON
+        GET /health - версия данных, количество строк и статистика кэша
+
+    Файлы проверяются на изменения в фоне раз в poll_interval секунд и
+    перечитываются в отдельном потоке, не блокируя обработку запросов.
+    Отчеты, которых нет в кэше, тоже считаются в пуле потоков, чтобы
+    долгий расчет не задерживал остальные запросы (в том числе /health).
+    """
+
+    def __init__(self, file_paths: List[str], cache_entries: int = DEFAULT_CACHE_ENTRIES,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            file_paths: Пути к CSV-файлам
+            cache_entries: Размер кэша результатов
+            poll_interval: Период проверки файлов на изменения (секунды)
+        """
+        self.dataset = WarmDataset(file_paths)
+        self.cache = ResultCache(cache_entries)
+        self.poll_interval = poll_interval
+        self._server = None
+        self._watcher = None
+
+    def render(self, report_names: List[str], where_expressions: List[str], skill: Optional[str] = None) -> bytes:
+        """
+        Возвращает результат отчета в JSON, используя кэш.
+
+        Args:
+            report_names: Названия отчетов (или all)
+            where_expressions: Условия фильтрации строк
+            skill: Навык для отчета skill_leaders (None - все навыки)
+
+        Returns:
+            bytes: JSON-ответ
+
+        Raises:
+            ValueError: Неизвестный отчет, некорректное условие или
+                условие по колонке, которой нет в данных
+        """
+        report_names = expand_report_names(report_names)
+        where = parse_predicates(where_expressions)
+        reports = configure_reports(report_names, skill=skill)
+        version, rows, shared = self.dataset.snapshot
+        if rows:
+            for predicate in where:
+                if predicate.column not in rows[0]:
+                    raise ValueError(f"Колонка '{predicate.column}' отсутствует в данных")
+        key = (tuple(report_names), tuple(repr(predicate) for predicate in where), skill, version)
+
+        result = self.cache.get(key)
+        if result is None:
+            # Общие состояния построены по всем строкам, с условиями
+            # фильтрации отчеты считаются по отфильтрованным строкам
+            if where:
+                shared = {}
+            run = {name: reports.get(name) or get_report(name) for name in report_names}
+            scanned = [name for name, report in run.items() if report.state_key not in shared]
+            results = {}
+            if len(scanned) == 1:
+                results[scanned[0]] = generate_report(scanned[0], filter_rows(rows, where), reports)
+            elif scanned:
+                results = generate_reports(scanned, filter_rows(rows, where), reports)
+            for name, report in run.items():
+                if name not in results:
+                    results[name] = report.finalize(shared[report.state_key])
+            report_results = results[report_names[0]] if len(report_names) == 1 else \
+                {name: results[name] for name in report_names}
+            result = json.dumps({
+                'version': version,
+                'report': report_names[0] if len(report_names) == 1 else report_names,
+                'results': report_results,
+            }, ensure_ascii=False, default=list).encode('utf-8')
+            self.cache.put(key, result)
+        return result
+
+    async def route(self, method: str, target: str) -> Tuple[int, bytes]:
+        """Выбирает обработчик запроса и возвращает код ответа и тело."""
+        if method != 'GET':
+            return 405, _error_body(f"Метод {method} не поддерживается")
+
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        if url.path == '/report':
+            names = query.get('name')
+            if not names:
+                return 400, _error_body("Не указан параметр name")
+            loop = asyncio.get_running_loop()
+            try:
+                return 200, await loop.run_in_executor(None, self.render, names, query.get('where', []),
+                                                       query.get('skill', [None])[0])
+            except ValueError as e:
+                return 400, _error_body(str(e))
+        if url.path == '/reports':
+            return 200, json.dumps({'reports': get_available_reports()}, ensure_ascii=False).encode('utf-8')
+        if url.path == '/health':
+            version, rows, _ = self.dataset.snapshot
+            return 200, json.dumps({
+                'version': version,
+                'rows': len(rows),
+                'cache': {'entries': len(self.cache), 'hits': self.cache.hits, 'misses': self.cache.misses},
+            }).encode('utf-8')
+        return 404, _error_body(f"Путь не найден: {url.path}")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Обрабатывает одно соединение (один запрос, без keep-alive)."""
+        try:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                return
+            request_line = head.split(b'\r\n', 1)[0].decode('latin-1')
+            parts = request_line.split(' ')
+            if len(parts) != 3:
+                status, body = 400, _error_body("Некорректная строка запроса")
+            else:
+                try:
+                    status, body = await self.route(parts[0], parts[1])
+                except Exception as e:
+                    # Ошибка расчета не должна оставлять клиента без ответа
+                    print(f"Ошибка обработки запроса {request_line}: {e!r}", file=sys.stderr)
+                    status, body = 500, _error_body(f"Внутренняя ошибка: {e!r}")
+
+            writer.write(
+                f'HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n'
+                f'Content-Type: application/json; charset=utf-8\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                f'Connection: close\r\n\r\n'.encode('latin-1') + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _watch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if self.dataset.is_stale():
+                try:
+                    await loop.run_in_executor(None, self.dataset.reload)
+                except Exception as e:
+                    # Файл мог быть в процессе перезаписи: продолжаем отдавать
+                    # прежние данные и пробуем снова на следующей проверке
+                    print(f"Ошибка перезагрузки данных: {e}", file=sys.stderr)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080, socket_path: Optional[str] = None) -> None:
+        """
+        Загружает данные и начинает принимать соединения.
+
+        Args:
+            host: Адрес TCP-сервера
+            port: Порт TCP-сервера (0 - выбрать свободный)
+            socket_path: Путь к Unix-сокету; если указан, host и port не используются
+        """
+        await asyncio.get_running_loop().run_in_executor(None, self.dataset.reload)
+        if socket_path:
+            self._server = await asyncio.start_unix_server(self.handle, path=socket_path, limit=MAX_REQUEST_BYTES)
+        else:
+            self._server = await asyncio.start_server(self.handle, host, port, limit=MAX_REQUEST_BYTES)
+        self._watcher = asyncio.ensure_future(self._watch())
+
+    @property
+    def addresses(self) -> List[Any]:
+        """Адреса, на которых сервер принимает соединения."""
+        return [sock.getsockname() for sock in self._server.sockets]
+
+    async def serve_forever(self) -> None:
+        """Обрабатывает запросы до остановки."""
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Останавливает сервер и наблюдение за файлами."""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+def _error_body(message: str) -> bytes:
+    return json.dumps({'error': message}, ensure_ascii=False).encode('utf-8')
@@ -0,0 +1,457 @@
+import hashlib
+import math
+from array import array
+from functools import partial
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from reports import Report
+from skills import split_skills
+
+
+# Относительная погрешность квантилей по умолчанию (1%)
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Максимальное количество корзин в одном хранилище квантильного скетча
+DEFAULT_MAX_BUCKETS = 2048
+
+# Точность HyperLogLog: 2**12 регистров, стандартная ошибка ~1.6%
+DEFAULT_HLL_PRECISION = 12
+
+# Размеры count-min скетча: ширина строки и количество хэш-функций
+DEFAULT_CMS_WIDTH = 2048
+DEFAULT_CMS_DEPTH = 4
+
+# Сколько самых частых значений выводится в отчете
+DEFAULT_HEAVY_HITTERS = 10
+
+
+def _hash64(value: Any, digest_size: int = 8) -> bytes:
+    """Стабильный между процессами хэш значения (встроенный hash() рандомизирован)."""
+    return hashlib.blake2b(str(value).encode('utf-8'), digest_size=digest_size).digest()
+
+
+class QuantileSketch:
+    """
+    Квантильный скетч с относительной погрешностью (DDSketch).
+
+    Значение попадает в корзину с номером ceil(log(x) / log(gamma)), где
+    gamma = (1 + a) / (1 - a), поэтому любой квантиль оценивается
+    с относительной погрешностью не больше a. Память ограничена
+    max_buckets корзинами (при переполнении объединяются корзины
+    самых малых по модулю значений), состояния объединяются сложением
+    счетчиков корзин.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+                 max_buckets: int = DEFAULT_MAX_BUCKETS):
+        """
+        Args:
+            relative_accuracy: Допустимая относительная погрешность (0 < a < 1)
+            max_buckets: Максимальное количество корзин для положительных
+                и для отрицательных значений
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Относительная погрешность должна быть в интервале (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (1 + self.gamma)
+
+    def _collapse(self, bins: Dict[int, int]) -> None:
+        """Объединяет корзины самых малых по модулю значений, пока их больше max_buckets."""
+        if len(bins) <= self.max_buckets:
+            return
+        keys = sorted(bins)
+        excess = keys[:len(keys) - self.max_buckets + 1]
+        bins[excess[-1]] += sum(bins.pop(key) for key in excess[:-1])
+
+    def add(self, value: float) -> None:
+        """Добавляет одно значение."""
+        self.count += 1
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        if value > 0:
+            bins = self.positive
+            key = self._key(value)
+        elif value < 0:
+            bins = self.negative
+            key = self._key(-value)
+        else:
+            self.zero_count += 1
+            return
+        bins[key] = bins.get(key, 0) + 1
+        if len(bins) > self.max_buckets:
+            self._collapse(bins)
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Объединяет скетч с другим скетчем той же точности."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Нельзя объединить квантильные скетчи с разной точностью")
+        for bins, other_bins in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_bins.items():
+                bins[key] = bins.get(key, 0) + count
+            self._collapse(bins)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Оценивает квантиль.
+
+        Args:
+            q: Уровень квантиля от 0 до 1 (0.5 - медиана)
+
+        Returns:
+            Оценка квантиля или None, если значений нет
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Уровень квантиля должен быть от 0 до 1")
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return max(-self._value(key), self.minimum)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return min(self._value(key), self.maximum)
+        return self.maximum
+
+
+class HyperLogLog:
+    """
+    Приближенный подсчет количества различных значений (HyperLogLog).
+
+    Хранит 2**precision однобайтовых регистров независимо от объема
+    данных; стандартная ошибка ~1.04 / sqrt(2**precision). Состояния
+    объединяются поэлементным максимумом регистров.
+    """
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION):
+        """
+        Args:
+            precision: Количество бит хэша для номера регистра (4..16)
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError("Точность HyperLogLog должна быть от 4 до 16")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: Any) -> None:
+        """Добавляет одно значение."""
+        hashed = int.from_bytes(_hash64(value), 'big')
+        bits = 64 - self.precision
+        index = hashed >> bits
+        rest = hashed & ((1 << bits) - 1)
+        rank = bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Объединяет с другим счетчиком той же точности."""
+        if other.precision != self.precision:
+            raise ValueError("Нельзя объединить HyperLogLog с разной точностью")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        """Оценка количества различных значений."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Поправка для малых количеств (linear counting)
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+
+class CountMinSketch:
+    """
+    Count-min скетч частот с отслеживанием самых частых значений.
+
+    Частота значения оценивается сверху минимумом из depth счетчиков,
+    выбранных независимыми хэшами; ошибка не больше total * e / width
+    с вероятностью 1 - exp(-depth). Кроме счетчиков хранится
+    ограниченный набор кандидатов в самые частые значения в порядке
+    первого появления: при равных оценках раньше идет значение,
+    встреченное раньше, поэтому результат не зависит от разбиения
+    данных на части.
+    """
+
+    def __init__(self, width: int = DEFAULT_CMS_WIDTH, depth: int = DEFAULT_CMS_DEPTH,
+                 capacity: int = DEFAULT_HEAVY_HITTERS * 4):
+        """
+        Args:
+            width: Количество счетчиков в строке
+            depth: Количество строк (хэш-функций)
+            capacity: Сколько кандидатов в частые значения хранить
+        """
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.table = [array('q', bytes(8 * width)) for _ in range(depth)]
+        self.total = 0
+        self.candidates: Dict[str, int] = {}
+
+    def _indexes(self, item: str) -> Iterator[Tuple[array, int]]:
+        digest = _hash64(item, digest_size=8 * self.depth)
+        for row, offset in zip(self.table, range(0, 8 * self.depth, 8)):
+            yield row, int.from_bytes(digest[offset:offset + 8], 'little') % self.width
+
+    def _ranked(self) -> List[Tuple[str, int]]:
+        # Сортировка устойчива: равные оценки остаются в порядке первого появления
+        return sorted(self.candidates.items(), key=itemgetter(1), reverse=True)
+
+    def _prune(self) -> None:
+        """Оставляет capacity кандидатов с наибольшими оценками, не меняя их порядок."""
+        if len(self.candidates) > 2 * self.capacity:
+            best = {item for item, _ in self._ranked()[:self.capacity]}
+            self.candidates = {item: count for item, count in self.candidates.items() if item in best}
+
+    def add(self, item: str, count: int = 1) -> None:
+        """Учитывает count появлений значения."""
+        self.total += count
+        estimate = None
+        for row, index in self._indexes(item):
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        self.candidates[item] = estimate
+        self._prune()
+
+    def estimate(self, item: str) -> int:
+        """Оценка частоты значения (не меньше точной)."""
+        return min(row[index] for row, index in self._indexes(item))
+
+    def merge(self, other: 'CountMinSketch') -> 'CountMinSketch':
+        """Объединяет с другим скетчем тех же размеров."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Нельзя объединить count-min скетчи разного размера")
+        for row, other_row in zip(self.table, other.table):
+            for index, count in enumerate(other_row):
+                if count:
+                    row[index] += count
+        self.total += other.total
+        # Кандидаты другого скетча (более поздних данных) добавляются после своих
+        for item in dict.fromkeys(chain(self.candidates, other.candidates)):
+            self.candidates[item] = self.estimate(item)
+        self._prune()
+        return self
+
+    def heavy_hitters(self, n: int = DEFAULT_HEAVY_HITTERS) -> List[Tuple[str, int]]:
+        """Самые частые значения и оценки их частот по убыванию."""
+        return self._ranked()[:n]
+
+
+class GroupedSketches:
+    """
+    Группировка строк со скетчем значений в каждой группе.
+
+    Аналог GroupedAggregator для приближенных агрегатов: память на
+    группу ограничена размером скетча, группы хранятся в порядке
+    первого появления и объединяются через merge.
+    """
+
+    def __init__(self, group_by: str, value: str, factory: Callable[[], Any]):
+        """
+        Args:
+            group_by: Поле для группировки
+            value: Поле, значения которого добавляются в скетч
+            factory: Создает пустой скетч (должен сериализоваться pickle
+                для передачи в рабочие процессы, например functools.partial)
+        """
+        self.group_by = group_by
+        self.value = value
+        self.factory = factory
+        self.groups: Dict[Any, Any] = {}
+
+    def add(self, row: Dict) -> None:
+        """Добавляет одну строку."""
+        key = row[self.group_by]
+        sketch = self.groups.get(key)
+        if sketch is None:
+            sketch = self.groups[key] = self.factory()
+        sketch.add(row[self.value])
+
+    def update(self, rows: Iterable[Dict]) -> 'GroupedSketches':
+        """Добавляет все строки из итерируемого объекта."""
+        for row in rows:
+            self.add(row)
+        return self
+
+    def merge(self, other: 'GroupedSketches') -> 'GroupedSketches':
+        """Объединяет скетчи групп другого состояния с текущими."""
+        for key, other_sketch in other.groups.items():
+            sketch = self.groups.get(key)
+            if sketch is None:
+                sketch = self.groups[key] = self.factory()
+            sketch.merge(other_sketch)
+        return self
+
+    def items(self) -> Iterator[Tuple[Any, Any]]:
+        """Возвращает пары (ключ группы, скетч)."""
+        return iter(self.groups.items())
+
+
+class TokenCounter:
+    """Частоты токенов строковой колонки (например, навыков) в count-min скетче."""
+
+    def __init__(self, column: str, sketch: CountMinSketch):
+        self.column = column
+        self.sketch = sketch
+        # Кэш разбора: исходная строка -> токены
+        self._tokens: Dict[str, Tuple[str, ...]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state['_tokens'] = {}
+        return state
+
+    def add(self, row: Dict) -> None:
+        """Добавляет токены одной строки."""
+        raw = row[self.column]
+        tokens = self._tokens.get(raw)
+        if tokens is None:
+            tokens = self._tokens[raw] = split_skills(raw)
+        for token in tokens:
+            self.sketch.add(token)
+
+    def update(self, rows: Iterable[Dict]) -> 'TokenCounter':
+        """Добавляет все строки из итерируемого объекта."""
+        for row in rows:
+            self.add(row)
+        return self
+
+    def merge(self, other: 'TokenCounter') -> 'TokenCounter':
+        self.sketch.merge(other.sketch)
+        return self
+
+
+class QuantileReport(Report):
+    """Приближенные квантили значения по группам (например, медиана эффективности по должностям)."""
+
+    def __init__(self, group_by: str = 'position', value: str = 'performance',
+                 quantiles: Sequence[float] = (0.5, 0.9),
+                 relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, precision: int = 2):
+        """
+        Args:
+            group_by: Поле для группировки
+            value: Числовое поле
+            quantiles: Уровни квантилей; колонки отчета называются p50, p90 и т.д.
+            relative_accuracy: Относительная погрешность квантилей
+            precision: Количество знаков после запятой при округлении
+        """
+        self.group_by = group_by
+        self.value = value
+        self.columns = frozenset({group_by, value})
+        self.quantiles = tuple(quantiles)
+        self.relative_accuracy = relative_accuracy
+        self.precision = precision
+
+    def create(self) -> GroupedSketches:
+        return GroupedSketches(self.group_by, self.value,
+                               partial(QuantileSketch, relative_accuracy=self.relative_accuracy))
+
+    def finalize(self, state: GroupedSketches) -> List[Dict[str, Any]]:
+        report_data = []
+        for key, sketch in state.items():
+            row = {self.group_by: key}
+            for q in self.quantiles:
+                row[f'p{q * 100:g}'] = round(sketch.quantile(q), self.precision)
+            report_data.append(row)
+
+        first = f'p{self.quantiles[0] * 100:g}'
+        report_data.sort(key=lambda x: x[first], reverse=True)
+
+        return report_data
+
+
+class DistinctCountReport(Report):
+    """Приближенное количество различных значений по группам (HyperLogLog)."""
+
+    def __init__(self, group_by: str = 'position', value: str = 'name', label: str = 'employees',
+                 precision: int = DEFAULT_HLL_PRECISION):
+        """
+        Args:
+            group_by: Поле для группировки
+            value: Поле, различные значения которого считаются
+            label: Название колонки с количеством в отчете
+            precision: Точность HyperLogLog
+        """
+        self.group_by = group_by
+        self.value = value
+        self.columns = frozenset({group_by, value})
+        self.label = label
+        self.precision = precision
+
+    def create(self) -> GroupedSketches:
+        return GroupedSketches(self.group_by, self.value, partial(HyperLogLog, precision=self.precision))
+
+    def finalize(self, state: GroupedSketches) -> List[Dict[str, Any]]:
+        report_data = [{self.group_by: key, self.label: sketch.count()} for key, sketch in state.items()]
+        report_data.sort(key=lambda x: x[self.label], reverse=True)
+        return report_data
+
+
+class HeavyHittersReport(Report):
+    """Самые частые навыки (count-min скетч)."""
+
+    def __init__(self, column: str = 'skills', label: str = 'skill', top: int = DEFAULT_HEAVY_HITTERS,
+                 width: int = DEFAULT_CMS_WIDTH, depth: int = DEFAULT_CMS_DEPTH):
+        """
+        Args:
+            column: Строковая колонка со списком значений через запятую
+            label: Название колонки со значением в отчете
+            top: Количество значений в отчете
+            width: Ширина count-min скетча
+            depth: Глубина count-min скетча
+        """
+        self.column = column
+        self.columns = frozenset({column})
+        self.label = label
+        self.top = top
+        self.width = width
+        self.depth = depth
+
+    def create(self) -> TokenCounter:
+        return TokenCounter(self.column, CountMinSketch(self.width, self.depth, capacity=self.top * 4))
+
+    def finalize(self, state: TokenCounter) -> List[Dict[str, Any]]:
+        return [{self.label: item, 'count': count} for item, count in state.sketch.heavy_hitters(self.top)]
+
+
+# Медиана и 90-й перцентиль эффективности по должностям
+PERFORMANCE_QUANTILES_REPORT = QuantileReport()
+
+# Количество различных сотрудников по должностям
+DISTINCT_EMPLOYEES_REPORT = DistinctCountReport()
+
+# Самые частые навыки
+SKILL_HEAVY_HITTERS_REPORT = HeavyHittersReport()
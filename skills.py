@@ -0,0 +1,219 @@
+import heapq
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from aggregation import RunningStats
+from reports import Report
+
+
+# Typecode массивов номеров строк в индексе
+ROW_ID_TYPECODE = 'q'
+
+# Сколько лучших сотрудников выводится для каждого навыка
+DEFAULT_TOP_EMPLOYEES = 3
+
+
+def split_skills(raw: str) -> Tuple[str, ...]:
+    """
+    Разбивает строку навыков на интернированные токены без повторов.
+
+    Пример: "Python, Django, Python" -> ('Python', 'Django').
+    """
+    tokens = []
+    for token in raw.split(','):
+        token = token.strip()
+        if token:
+            token = sys.intern(token)
+            if token not in tokens:
+                tokens.append(token)
+    return tuple(tokens)
+
+
+class SkillIndex:
+    """
+    Инвертированный индекс «навык -> номера строк».
+
+    Строится один раз при чтении данных: строка навыков каждого
+    сотрудника разбивается на токены (одинаковые строки навыков
+    разбираются один раз), а для каждого навыка хранится массив
+    номеров строк. Для сотрудников хранятся только имя и
+    эффективность, поэтому запросы по навыку - это выборка по
+    индексу без повторного разбора строк.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, array] = {}
+        self.names: List[str] = []
+        self.performance = array('d')
+        # Кэш разбора: исходная строка навыков -> токены
+        self._tokens: Dict[str, Tuple[str, ...]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Кэш разбора восстанавливается при чтении, его не нужно сохранять
+        state = self.__dict__.copy()
+        state['_tokens'] = {}
+        return state
+
+    def __len__(self) -> int:
+        return len(self.performance)
+
+    def _tokenize(self, raw: str) -> Tuple[str, ...]:
+        tokens = self._tokens.get(raw)
+        if tokens is None:
+            tokens = self._tokens[raw] = split_skills(raw)
+        return tokens
+
+    def _append(self, name: str, performance: float, tokens: Tuple[str, ...]) -> None:
+        row_id = len(self.performance)
+        self.names.append(name)
+        self.performance.append(performance)
+        postings = self.postings
+        for token in tokens:
+            row_ids = postings.get(token)
+            if row_ids is None:
+                row_ids = postings[token] = array(ROW_ID_TYPECODE)
+            row_ids.append(row_id)
+
+    def add(self, row: Dict) -> None:
+        """Добавляет одну строку."""
+        self._append(row['name'], row['performance'], self._tokenize(row['skills']))
+
+    def update(self, rows: Iterable[Dict]) -> 'SkillIndex':
+        """Добавляет все строки из итерируемого объекта."""
+        for row in rows:
+            self.add(row)
+        return self
+
+    def update_table(self, table: Any) -> 'SkillIndex':
+        """
+        Добавляет строки колоночной таблицы.
+
+        Строки навыков хранятся в словарном кодировании, поэтому каждое
+        уникальное значение разбирается один раз, а для строк берутся
+        только коды.
+        """
+        skills = table.categorical['skills']
+        tokens = [split_skills(value) for value in skills.values]
+        for name, performance, skills_code in zip(table.column_values('name'), table.numeric['performance'],
+                                                  skills.codes):
+            self._append(name, performance, tokens[skills_code])
+        return self
+
+    def merge(self, other: 'SkillIndex') -> 'SkillIndex':
+        """
+        Добавляет строки другого индекса после строк текущего.
+
+        Номера строк other сдвигаются на размер текущего индекса, поэтому
+        слияние частичных индексов по порядку файлов дает тот же индекс,
+        что и последовательный проход.
+        """
+        offset = len(self.performance)
+        self.names.extend(other.names)
+        self.performance.extend(other.performance)
+        for token, other_ids in other.postings.items():
+            row_ids = self.postings.get(token)
+            if row_ids is None:
+                row_ids = self.postings[token] = array(ROW_ID_TYPECODE)
+            row_ids.extend(row_id + offset for row_id in other_ids)
+        return self
+
+    def skills(self) -> List[str]:
+        """Навыки в порядке первого появления."""
+        return list(self.postings)
+
+    def rows_with(self, skill: str) -> array:
+        """Номера строк сотрудников с навыком."""
+        return self.postings.get(skill, array(ROW_ID_TYPECODE))
+
+    def stats(self, skill: str) -> RunningStats:
+        """Статистики эффективности сотрудников с навыком."""
+        stats = RunningStats()
+        performance = self.performance
+        for row_id in self.rows_with(skill):
+            stats.add(performance[row_id])
+        return stats
+
+    def top_employees(self, skill: str, n: int = DEFAULT_TOP_EMPLOYEES) -> List[Dict[str, Any]]:
+        """
+        Лучшие по эффективности сотрудники с навыком.
+
+        Args:
+            skill: Навык
+            n: Количество сотрудников
+
+        Returns:
+            List[Dict]: name и performance, по убыванию эффективности
+            (при равенстве - в порядке данных)
+        """
+        performance = self.performance
+        best = heapq.nlargest(n, self.rows_with(skill), key=performance.__getitem__)
+        return [{'name': self.names[row_id], 'performance': performance[row_id]} for row_id in best]
+
+
+class SkillsReport(Report):
+    """Средняя эффективность и количество сотрудников по навыкам."""
+
+    columns = frozenset({'name', 'performance', 'skills'})
+    # Все отчеты по навыкам строят один и тот же индекс
+    state_key = 'skill_index'
+    # Каждая уникальная строка навыков разбирается один раз (см. SkillIndex.update_table)
+    dictionary_columns = frozenset({'skills'})
+
+    def __init__(self, precision: int = 2):
+        """
+        Args:
+            precision: Количество знаков после запятой при округлении
+        """
+        self.precision = precision
+
+    def create(self) -> SkillIndex:
+        return SkillIndex()
+
+    def feed(self, state: SkillIndex, data) -> SkillIndex:
+        if hasattr(data, 'categorical') and 'skills' in data.categorical:
+            return state.update_table(data)
+        return super().feed(state, data)
+
+    def finalize(self, state: SkillIndex) -> List[Dict[str, Any]]:
+        report_data = []
+        for skill in state.skills():
+            stats = state.stats(skill)
+            report_data.append({
+                'skill': skill,
+                'performance': round(stats.avg, self.precision),
+                'employees': stats.count,
+            })
+
+        report_data.sort(key=lambda x: x['performance'], reverse=True)
+
+        return report_data
+
+
+class SkillLeadersReport(SkillsReport):
+    """Лучшие по эффективности сотрудники для каждого навыка."""
+
+    def __init__(self, top: int = DEFAULT_TOP_EMPLOYEES, skill: Optional[str] = None):
+        """
+        Args:
+            top: Количество сотрудников на навык
+            skill: Навык; если не указан, выводятся все навыки
+        """
+        super().__init__()
+        self.top = top
+        self.skill = skill
+
+    def finalize(self, state: SkillIndex) -> List[Dict[str, Any]]:
+        skills = [self.skill] if self.skill is not None else state.skills()
+        return [
+            {'skill': skill, **employee}
+            for skill in skills
+            for employee in state.top_employees(skill, self.top)
+        ]
+
+
+# Эффективность и численность по навыкам
+SKILLS_REPORT = SkillsReport()
+
+# Лучшие сотрудники по каждому навыку
+SKILL_LEADERS_REPORT = SkillLeadersReport()
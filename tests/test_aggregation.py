@@ -0,0 +1,126 @@
+import math
+import statistics
+
+import pytest
+from aggregation import RunningStats, GroupedAggregator
+
+
+class TestRunningStats:
+    """Тесты для накопителя RunningStats."""
+    
+    def test_basic_metrics(self):
+        """Тест count/sum/min/max/avg на наборе значений."""
+        stats = RunningStats()
+        for value in [4.5, 4.7, 4.3, 5.0]:
+            stats.add(value)
+        
+        assert stats.value('count') == 4
+        assert stats.value('sum') == pytest.approx(18.5)
+        assert stats.value('min') == 4.3
+        assert stats.value('max') == 5.0
+        assert stats.value('avg') == pytest.approx(4.625)
+    
+    def test_variance_matches_statistics(self):
+        """Тест дисперсии по Уэлфорду против модуля statistics."""
+        values = [3.14, 4.8, 4.1, 4.9, 2.7, 4.6]
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+        
+        assert stats.variance == pytest.approx(statistics.pvariance(values))
+        assert stats.stddev == pytest.approx(math.sqrt(statistics.pvariance(values)))
+    
+    def test_merge_equals_sequential(self):
+        """Тест объединения частичных накопителей."""
+        values = [4.5, 4.7, 4.3, 5.0, 3.9, 4.1, 4.8]
+        sequential = RunningStats()
+        left, right = RunningStats(), RunningStats()
+        for i, value in enumerate(values):
+            sequential.add(value)
+            (left if i < 3 else right).add(value)
+        
+        merged = RunningStats().merge(left).merge(right)
+        
+        assert merged.count == sequential.count
+        assert merged.minimum == sequential.minimum
+        assert merged.maximum == sequential.maximum
+        assert merged.avg == pytest.approx(sequential.avg)
+        assert merged.variance == pytest.approx(sequential.variance)
+    
+    def test_sum_does_not_depend_on_order(self):
+        """Тест что сумма и среднее точные и не зависят от порядка объединения."""
+        values = [0.1] * 10 + [1e16, 1.0, -1e16] + [4.1, 4.2, 3.9] * 40
+        sequential = RunningStats()
+        for value in values:
+            sequential.add(value)
+        parts = [RunningStats() for _ in range(3)]
+        for i, value in enumerate(values):
+            parts[i % 3].add(value)
+        
+        merged = RunningStats()
+        for part in reversed(parts):
+            merged.merge(part)
+        
+        assert sequential.total == merged.total == math.fsum(values)
+        assert sequential.avg == merged.avg
+    
+    def test_empty_stats(self):
+        """Тест метрик пустого накопителя."""
+        stats = RunningStats()
+        assert stats.avg == 0.0
+        assert stats.variance == 0.0
+    
+    def test_unknown_metric(self):
+        """Тест ошибки для неизвестной метрики."""
+        with pytest.raises(ValueError) as exc_info:
+            RunningStats().value('median')
+        
+        assert 'Неизвестная метрика' in str(exc_info.value)
+
+
+class TestGroupedAggregator:
+    """Тесты для группирующего агрегатора."""
+    
+    def test_groups_by_field(self):
+        """Тест группировки по одному полю."""
+        aggregator = GroupedAggregator('position', 'performance').update([
+            {'position': 'Developer', 'performance': 4.5},
+            {'position': 'QA', 'performance': 4.3},
+            {'position': 'Developer', 'performance': 4.7},
+        ])
+        
+        groups = dict(aggregator.items())
+        
+        assert len(aggregator) == 2
+        assert groups['Developer'].count == 2
+        assert groups['Developer'].avg == pytest.approx(4.6)
+        assert groups['QA'].count == 1
+    
+    def test_groups_by_tuple_of_fields(self):
+        """Тест группировки по составному ключу."""
+        aggregator = GroupedAggregator(('team', 'position'), 'completed_tasks').update([
+            {'team': 'A', 'position': 'Dev', 'completed_tasks': 10},
+            {'team': 'A', 'position': 'Dev', 'completed_tasks': 20},
+            {'team': 'B', 'position': 'Dev', 'completed_tasks': 5},
+        ])
+        
+        groups = dict(aggregator.items())
+        
+        assert groups[('A', 'Dev')].total == 30
+        assert groups[('B', 'Dev')].total == 5
+    
+    def test_merge_keeps_first_appearance_order(self):
+        """Тест что слияние сохраняет порядок групп последовательного прохода."""
+        rows = [
+            {'position': 'QA', 'performance': 4.0},
+            {'position': 'Dev', 'performance': 4.5},
+            {'position': 'Ops', 'performance': 4.2},
+            {'position': 'Dev', 'performance': 4.9},
+        ]
+        sequential = GroupedAggregator('position', 'performance').update(rows)
+        merged = GroupedAggregator('position', 'performance')
+        merged.merge(GroupedAggregator('position', 'performance').update(rows[:2]))
+        merged.merge(GroupedAggregator('position', 'performance').update(rows[2:]))
+        
+        assert [key for key, _ in merged.items()] == [key for key, _ in sequential.items()]
+        assert dict(merged.items())['Dev'].count == 2
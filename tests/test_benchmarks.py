@@ -0,0 +1,69 @@
+import tempfile
+
+from benchmarks.datagen import generate_dataset
+from benchmarks.run import find_regressions, measure, measure_startup, run_benchmarks
+from file_reader import read_csv_files
+
+
+class TestDatagen:
+    """Тесты для генератора синтетических данных."""
+    
+    def test_generate_dataset_shape(self):
+        """Тест количества строк, файлов и различных значений."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = generate_dataset(temp_dir, rows=101, files=3, positions=15, teams=4, skills_per_row=6)
+            rows = read_csv_files(paths)
+            
+            assert len(paths) == 3
+            assert len(rows) == 101
+            assert len({row['position'] for row in rows}) <= 15
+            assert len({row['team'] for row in rows}) <= 4
+            assert all(len(row['skills'].split(', ')) == 6 for row in rows)
+            assert all(3.0 <= row['performance'] <= 5.0 for row in rows)
+    
+    def test_generation_is_deterministic(self):
+        """Тест воспроизводимости данных при одинаковом seed."""
+        with tempfile.TemporaryDirectory() as first_dir, tempfile.TemporaryDirectory() as second_dir:
+            first = read_csv_files(generate_dataset(first_dir, rows=20, seed=7))
+            second = read_csv_files(generate_dataset(second_dir, rows=20, seed=7))
+        
+        assert first == second
+
+
+class TestBenchmarks:
+    """Тесты для запуска бенчмарков."""
+    
+    def test_measure_fields(self):
+        """Тест набора измеряемых метрик."""
+        result = measure(lambda: [0] * 1000, repeat=1, rows=1000)
+        
+        assert set(result) == {'wall_s', 'cpu_s', 'rows_per_s', 'peak_memory_bytes'}
+        assert result['peak_memory_bytes'] > 0
+    
+    def test_run_benchmarks_on_small_dataset(self):
+        """Тест запуска всех бенчмарков на маленьком наборе данных."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = generate_dataset(temp_dir, rows=50, files=2)
+            results = run_benchmarks(paths, rows=50, repeat=1)
+        
+        assert 'read_csv_files' in results
+        assert 'performance_report' in results
+        assert 'main_performance' in results
+        assert 'startup' in results
+    
+    def test_measure_startup(self):
+        """Тест замера времени импорта и запуска CLI."""
+        result = measure_startup(repeat=1)
+        
+        assert result['import_s'] > 0
+        assert result['help_s'] >= result['import_s']
+    
+    def test_find_regressions(self):
+        """Тест поиска регрессий относительно базовых результатов."""
+        baseline = {'read_csv_files': {'wall_s': 1.0, 'peak_memory_bytes': 1000}}
+        results = {
+            'read_csv_files': {'wall_s': 1.5, 'peak_memory_bytes': 1100},
+            'new_benchmark': {'wall_s': 9.0, 'peak_memory_bytes': 9000},
+        }
+        
+        assert find_regressions(results, baseline, tolerance=0.2) == ['read_csv_files.wall_s: 1.0 -> 1.5']
@@ -0,0 +1,168 @@
+import csv
+import os
+import tempfile
+import time
+
+import pytest
+from cache import ParsedCache, CACHE_SUFFIX
+from columnar import convert_files
+from file_reader import read_csv_files
+from parallel import aggregate_files
+from reports import PERFORMANCE_REPORT
+from validation import Quarantine
+
+
+HEADER = ['name', 'position', 'completed_tasks', 'performance', 'skills', 'team', 'experience_years']
+
+
+def _write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows)
+
+
+class TestParsedCache:
+    """Тесты для дискового кэша разобранных файлов."""
+    
+    def test_repeat_read_skips_parsing(self, monkeypatch):
+        """Тест что повторное чтение неизмененного файла берется из кэша."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            _write_csv(csv_path, [['John', 'Developer', '10', '4.5', 'Python, SQL', 'Team A', '2']])
+            cache = ParsedCache(os.path.join(temp_dir, 'cache'))
+            
+            first = cache.get_table(csv_path)
+            
+            # Разбор CSV при повторном чтении недоступен
+            monkeypatch.setattr('cache.read_columnar', None)
+            second = cache.get_table(csv_path)
+            
+            assert list(second.iter_rows()) == list(first.iter_rows())
+            assert list(second.iter_rows()) == read_csv_files([csv_path])
+    
+    def test_modified_file_invalidates_entry(self):
+        """Тест что изменение размера/времени файла сбрасывает запись."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            _write_csv(csv_path, [['John', 'Developer', '10', '4.5', 'Python', 'Team A', '2']])
+            cache = ParsedCache(os.path.join(temp_dir, 'cache'))
+            cache.get_table(csv_path)
+            
+            _write_csv(csv_path, [
+                ['John', 'Developer', '10', '4.5', 'Python', 'Team A', '2'],
+                ['Jane', 'QA', '12', '4.1', 'Testing', 'Team B', '3'],
+            ])
+            
+            assert cache.load(csv_path) is None
+            assert len(cache.get_table(csv_path)) == 2
+    
+    def test_content_hash_in_key(self):
+        """Тест что при hash_content ключ зависит от содержимого файла."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            _write_csv(csv_path, [['John', 'Developer', '10', '4.5', 'Python', 'Team A', '2']])
+            cache = ParsedCache(temp_dir, hash_content=True)
+            key = cache.key(csv_path)
+            stat = os.stat(csv_path)
+            
+            # Тот же размер и время изменения, но другое содержимое
+            _write_csv(csv_path, [['Jane', 'Developer', '10', '4.5', 'Python', 'Team A', '2']])
+            os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            
+            assert cache.key(csv_path) != key
+    
+    def test_format_version_in_key(self, monkeypatch):
+        """Тест что записи другой версии формата кэша не читаются."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            _write_csv(csv_path, [['John', 'Developer', '10', '4.5', 'Python', 'Team A', '2']])
+            cache = ParsedCache(os.path.join(temp_dir, 'cache'))
+            cache.get_table(csv_path)
+            
+            monkeypatch.setattr('cache.CACHE_FORMAT_VERSION', -1)
+            
+            assert cache.load(csv_path) is None
+    
+    def test_lru_eviction(self):
+        """Тест что при превышении размера удаляются давно не использованные записи."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = []
+            for i in range(3):
+                path = os.path.join(temp_dir, f'employees{i}.csv')
+                _write_csv(path, [[f'Name {i}', 'Developer', '10', '4.5', 'Python', 'Team A', '2']])
+                paths.append(path)
+            cache_dir = os.path.join(temp_dir, 'cache')
+            cache = ParsedCache(cache_dir)
+            
+            for path in paths:
+                cache.get_table(path)
+                time.sleep(0.01)
+            entry_size = os.path.getsize(os.path.join(cache_dir, os.listdir(cache_dir)[0]))
+            
+            # Обращение к первому файлу делает его самым свежим
+            cache.get_table(paths[0])
+            cache.max_bytes = entry_size * 2
+            cache.evict()
+            
+            entries = [name for name in os.listdir(cache_dir) if name.endswith(CACHE_SUFFIX)]
+            assert len(entries) == 2
+            assert cache.load(paths[0]) is not None
+            assert cache.load(paths[1]) is None
+    
+    def test_missing_file(self):
+        """Тест ошибки для отсутствующего файла."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with pytest.raises(FileNotFoundError) as exc_info:
+                ParsedCache(temp_dir).get_table('nonexistent_file.csv')
+            
+            assert 'Файл не найден' in str(exc_info.value)
+
+    def test_columnar_input_is_not_cached(self):
+        """Тест что бинарный колоночный файл открывается напрямую, а не разбирается как CSV."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            _write_csv(csv_path, [['John', 'Developer', '10', '4.5', 'Python, SQL', 'Team A', '2'],
+                                  ['Jane', 'QA', '8', '4.1', 'Go', 'Team B', '3']])
+            columnar_path = os.path.join(temp_dir, 'employees.ecol')
+            convert_files([csv_path], columnar_path)
+            cache_dir = os.path.join(temp_dir, 'cache')
+            
+            state = aggregate_files(PERFORMANCE_REPORT, [columnar_path], cache=ParsedCache(cache_dir))
+            
+            assert PERFORMANCE_REPORT.finalize(state) == PERFORMANCE_REPORT(read_csv_files([csv_path]))
+            assert not os.path.exists(cache_dir) or not os.listdir(cache_dir)
+
+    def test_rejected_rows_are_replayed(self):
+        """Тест что некорректные строки из записи кэша снова попадают в карантин или вызывают ошибку."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            _write_csv(csv_path, [['John', 'Developer', '10', '4.5', 'Python', 'Team A', '2'],
+                                  ['Bad', 'QA', 'ten', '4.1', 'Go', 'Team B', '3']])
+            cache = ParsedCache(os.path.join(temp_dir, 'cache'))
+            
+            first = Quarantine()
+            assert len(cache.get_table(csv_path, first)) == 1
+            
+            # Строгое чтение из кэша останавливается на той же строке, что и без кэша
+            with pytest.raises(Exception, match="строка 3, колонка 'completed_tasks'"):
+                cache.get_table(csv_path)
+            
+            second = Quarantine()
+            assert len(cache.get_table(csv_path, second)) == 1
+            assert second.records == first.records
+            assert second.count == 1
+    
+    def test_strict_miss_is_cached(self):
+        """Тест что строгое чтение некорректного файла кэширует его для карантина."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            _write_csv(csv_path, [['Bad', 'QA', '1', 'high', 'Go', 'Team B', '3']])
+            cache = ParsedCache(os.path.join(temp_dir, 'cache'))
+            
+            with pytest.raises(Exception, match="строка 2, колонка 'performance'"):
+                cache.get_table(csv_path)
+            
+            quarantine = Quarantine()
+            assert len(cache.get_table(csv_path, quarantine)) == 0
+            assert quarantine.by_column == {'performance': 1}
@@ -0,0 +1,179 @@
+import math
+import os
+import tempfile
+
+import pytest
+import columnar
+from columnar import (
+    ColumnarTable, DictionaryColumn, read_columnar, write_table, load_table,
+    open_table, read_table, is_columnar_file, convert_files,
+)
+from file_reader import iter_csv_files, read_csv_files
+from reports import ReportGenerator, GroupReport
+
+
+DATA_FILES = [
+    os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees1.csv'),
+    os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees2.csv'),
+]
+
+
+class TestDictionaryColumn:
+    """Тесты для словарной колонки."""
+    
+    def test_codes_in_first_appearance_order(self):
+        """Тест что коды выдаются в порядке первого появления значения."""
+        column = DictionaryColumn()
+        for value in ['QA', 'Dev', 'QA', 'Ops', 'Dev']:
+            column.append(value)
+        
+        assert list(column.codes) == [0, 1, 0, 2, 1]
+        assert column.values == ['QA', 'Dev', 'Ops']
+        assert column[3] == 'Ops'
+        assert len(column) == 5
+
+
+class TestColumnarTable:
+    """Тесты для колоночной таблицы."""
+    
+    def test_roundtrip_rows(self):
+        """Тест что iter_rows возвращает исходные строки."""
+        rows = read_csv_files(DATA_FILES)
+        table = ColumnarTable.from_rows(rows)
+        
+        assert len(table) == len(rows)
+        assert list(table.iter_rows()) == rows
+    
+    def test_typed_columns(self):
+        """Тест типизированного хранения колонок."""
+        table = read_columnar(DATA_FILES)
+        
+        assert table.numeric['performance'].typecode == 'd'
+        assert table.numeric['completed_tasks'].typecode == 'q'
+        assert len(table.categorical['position'].values) < len(table)
+    
+    def test_performance_report_matches_row_path(self):
+        """Тест что отчет по таблице совпадает с отчетом по строкам."""
+        table = read_columnar(DATA_FILES)
+        
+        assert ReportGenerator.performance_report(table) == \
+            ReportGenerator.performance_report(read_csv_files(DATA_FILES))
+    
+    def test_group_stats_without_numpy(self, monkeypatch):
+        """Тест групповой редукции без numpy."""
+        monkeypatch.setattr(columnar, '_load_numpy', lambda: None)
+        table = read_columnar(DATA_FILES)
+        
+        stats = dict(table.group_stats('position', 'performance').items())
+        
+        assert stats['Backend Developer'].count == 3
+        assert stats['Backend Developer'].maximum == 4.9
+    
+    def test_unsupported_grouping_falls_back_to_rows(self):
+        """Тест отчета по составному ключу через построчный проход."""
+        table = read_columnar(DATA_FILES)
+        report = GroupReport(group_by=('team', 'position'), value='performance')
+        
+        assert not table.supports_grouping(report.group_by, report.value)
+        assert report(table) == report(read_csv_files(DATA_FILES))
+    
+    def test_exact_group_sums(self):
+        """Тест что суммы по группам точны, как у RunningStats, при любом порядке величин."""
+        values = [1e16, 1.0, -1e16, 0.1, 3.0, -0.0, 2.5e-8, 7]
+        rows = [{'team': 'A' if i % 3 else 'B', 'performance': value}
+                for i, value in enumerate(values * 50)]
+        table = ColumnarTable.from_rows(rows, columns={'team', 'performance'})
+        
+        stats = dict(table.group_stats('team', 'performance').items())
+        
+        for team in ('A', 'B'):
+            expected = math.fsum(row['performance'] for row in rows if row['team'] == team)
+            assert stats[team].total == expected
+    
+    def test_group_sums_of_infinite_values(self):
+        """Тест групповой редукции значений, для которых разложение на мантиссы не подходит."""
+        rows = [{'team': 'A', 'performance': value} for value in (1.0, float('inf'), 2.0)]
+        table = ColumnarTable.from_rows(rows, columns={'team', 'performance'})
+        
+        stats = dict(table.group_stats('team', 'performance').items())
+        
+        assert stats['A'].total == float('inf')
+        assert stats['A'].count == 3
+    
+    def test_projected_table(self):
+        """Тест таблицы из части колонок со словарным кодированием только колонки группировки."""
+        columns = {'name', 'position', 'performance'}
+        rows = list(iter_csv_files(DATA_FILES, columns=columns))
+        table = ColumnarTable.from_rows(rows, columns, dictionary_columns={'position'})
+        
+        assert set(table.categorical) == {'position'}
+        assert set(table.strings) == {'name'}
+        assert set(table.numeric) == {'performance'}
+        assert list(table.iter_rows()) == rows
+        assert ReportGenerator.performance_report(table) == \
+            ReportGenerator.performance_report(read_csv_files(DATA_FILES))
+    
+    def test_empty_table(self):
+        """Тест пустой таблицы."""
+        table = ColumnarTable.from_rows([])
+        
+        assert len(table) == 0
+        assert ReportGenerator.performance_report(table) == []
+
+
+class TestBinaryFormat:
+    """Тесты для бинарного колоночного формата."""
+    
+    def test_write_and_load_roundtrip(self):
+        """Тест сохранения и загрузки таблицы."""
+        table = read_columnar(DATA_FILES)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'employees.ecol')
+            write_table(table, path)
+            loaded = load_table(path)
+        
+        assert len(loaded) == len(table)
+        assert list(loaded.iter_rows()) == list(table.iter_rows())
+        assert loaded.categorical['position'].values == table.categorical['position'].values
+    
+    def test_invalid_file(self):
+        """Тест ошибки при чтении файла другого формата."""
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.ecol') as f:
+            f.write(b'name,position\n')
+            temp_path = f.name
+        
+        try:
+            with pytest.raises(ValueError) as exc_info:
+                load_table(temp_path)
+            
+            assert 'Неверный формат' in str(exc_info.value)
+        finally:
+            os.unlink(temp_path)
+    
+    def test_open_table_uses_memory_views(self):
+        """Тест открытия файла через mmap с колонками-представлениями."""
+        table = read_columnar(DATA_FILES)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'employees.ecol')
+            write_table(table, path)
+            opened = open_table(path)
+            
+            assert isinstance(opened.numeric['performance'], memoryview)
+            assert isinstance(opened.categorical['position'].codes, memoryview)
+            assert list(opened.iter_rows()) == list(table.iter_rows())
+            assert ReportGenerator.performance_report(opened) == ReportGenerator.performance_report(table)
+            del opened
+    
+    def test_read_table_detects_format(self):
+        """Тест выбора способа чтения по сигнатуре файла."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'snapshot.bin')
+            
+            assert convert_files(DATA_FILES, path) == 15
+            assert is_columnar_file(path)
+            assert not is_columnar_file(DATA_FILES[0])
+            assert not is_columnar_file('nonexistent_file.ecol')
+            assert list(read_table(path).iter_rows()) == list(read_table(DATA_FILES[0]).iter_rows()) + \
+                list(read_table(DATA_FILES[1]).iter_rows())
@@ -0,0 +1,176 @@
+import bz2
+import gzip
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import pytest
+from compressed import PrefetchReader, detect_compression, open_csv
+from file_reader import iter_csv_files, read_csv_files
+from incremental import IncrementalReport
+from parallel import aggregate_files, plan_tasks
+from reports import PERFORMANCE_REPORT
+
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees1.csv')
+
+
+@pytest.fixture
+def temp_dir():
+    directory = tempfile.mkdtemp()
+    yield directory
+    shutil.rmtree(directory)
+
+
+def _compress(directory, name, opener):
+    path = os.path.join(directory, name)
+    with open(DATA_FILE, 'rb') as source, opener(path, 'wb') as target:
+        shutil.copyfileobj(source, target)
+    return path
+
+
+class TestDetectCompression:
+    """Тесты для определения формата сжатия."""
+
+    def test_detect_by_magic_bytes(self, temp_dir):
+        """Тест что формат определяется по сигнатуре, а не по имени файла."""
+        gzip_path = _compress(temp_dir, 'data.csv', gzip.open)
+        bz2_path = _compress(temp_dir, 'data.bin', bz2.open)
+
+        assert detect_compression(gzip_path) == 'gzip'
+        assert detect_compression(bz2_path) == 'bz2'
+        assert detect_compression(DATA_FILE) is None
+
+    def test_detect_by_suffix(self, temp_dir):
+        """Тест что без сигнатуры формат определяется по расширению."""
+        path = os.path.join(temp_dir, 'data.csv.zst')
+        with open(path, 'wb') as f:
+            f.write(b'not compressed')
+
+        assert detect_compression(path) == 'zstd'
+
+
+class TestOpenCsv:
+    """Тесты для чтения сжатых CSV-файлов."""
+
+    @pytest.mark.parametrize('name, opener', [('data.csv.gz', gzip.open), ('data.csv.bz2', bz2.open)])
+    def test_compressed_matches_plain(self, temp_dir, name, opener):
+        """Тест что сжатый файл читается так же, как исходный."""
+        path = _compress(temp_dir, name, opener)
+
+        assert read_csv_files([path]) == read_csv_files([DATA_FILE])
+
+    def test_zstd(self, temp_dir):
+        """Тест чтения файла zstd."""
+        zstandard = pytest.importorskip('zstandard')
+        path = os.path.join(temp_dir, 'data.csv.zst')
+        with open(DATA_FILE, 'rb') as f:
+            data = f.read()
+        with open(path, 'wb') as f:
+            f.write(zstandard.ZstdCompressor().compress(data))
+
+        assert read_csv_files([path]) == read_csv_files([DATA_FILE])
+
+    def test_zstd_multiple_frames(self, temp_dir):
+        """Тест чтения файла zstd из нескольких кадров (например, от pzstd)."""
+        zstandard = pytest.importorskip('zstandard')
+        path = os.path.join(temp_dir, 'data.csv.zst')
+        with open(DATA_FILE, 'rb') as f:
+            data = f.read()
+        header, _, body = data.partition(b'\n')
+        compressor = zstandard.ZstdCompressor()
+        with open(path, 'wb') as f:
+            f.write(compressor.compress(header + b'\n'))
+            f.write(compressor.compress(body))
+
+        assert read_csv_files([path]) == read_csv_files([DATA_FILE])
+
+    def test_zstd_without_package(self, temp_dir, monkeypatch):
+        """Тест понятной ошибки, если пакет zstandard не установлен."""
+        monkeypatch.setitem(sys.modules, 'zstandard', None)
+        path = os.path.join(temp_dir, 'data.csv.zst')
+        with open(path, 'wb') as f:
+            f.write(b'\x28\xb5\x2f\xfd')
+
+        with pytest.raises(Exception, match="zstandard"):
+            read_csv_files([path])
+
+    def test_without_prefetch(self, temp_dir):
+        """Тест распаковки без фонового потока."""
+        path = _compress(temp_dir, 'data.csv.gz', gzip.open)
+
+        with open_csv(path, prefetch=False) as f, open(DATA_FILE, encoding='utf-8') as plain:
+            assert f.read() == plain.read()
+
+    def test_corrupted_file(self, temp_dir):
+        """Тест что ошибка распаковки из фонового потока доходит до читателя."""
+        path = _compress(temp_dir, 'data.csv.gz', gzip.open)
+        with open(path, 'r+b') as f:
+            f.seek(20)
+            f.write(b'\xff' * 64)
+
+        with pytest.raises(Exception, match="Ошибка при чтении файла"):
+            read_csv_files([path])
+
+    def test_early_close_stops_thread(self, temp_dir):
+        """Тест что незавершенное чтение не оставляет фоновый поток."""
+        path = _compress(temp_dir, 'data.csv.gz', gzip.open)
+        threads = threading.active_count()
+
+        rows = iter_csv_files([path])
+        next(rows)
+        rows.close()
+
+        assert threading.active_count() == threads
+
+
+class TestPrefetchReader:
+    """Тесты для чтения с упреждением в фоновом потоке."""
+
+    def test_reads_all_blocks(self):
+        """Тест что данные читаются целиком и в исходном порядке."""
+        data = bytes(range(256)) * 1000
+        reader = PrefetchReader(io.BytesIO(data), block_bytes=1000, prefetch_blocks=2)
+
+        with io.BufferedReader(reader, 4096) as f:
+            assert f.read() == data
+
+    def test_small_reads(self):
+        """Тест чтения частями меньше блока."""
+        reader = PrefetchReader(io.BytesIO(b'abcdefgh'), block_bytes=3)
+
+        assert reader.read(2) == b'ab'
+        assert reader.read(5) == b'c'
+        assert reader.read(5) == b'def'
+        assert reader.read(5) == b'gh'
+        assert reader.read(5) == b''
+        reader.close()
+
+
+class TestCompressedPipelines:
+    """Тесты сжатых файлов в параллельном и инкрементальном режимах."""
+
+    def test_compressed_file_is_not_split(self, temp_dir):
+        """Тест что сжатый файл обрабатывается одной задачей."""
+        path = _compress(temp_dir, 'data.csv.gz', gzip.open)
+
+        assert plan_tasks([path], chunk_bytes=16) == [(path, None)]
+
+    def test_parallel(self, temp_dir):
+        """Тест разбора сжатых файлов в рабочих процессах."""
+        paths = [_compress(temp_dir, 'a.csv.gz', gzip.open), _compress(temp_dir, 'b.csv.bz2', bz2.open)]
+
+        state = aggregate_files(PERFORMANCE_REPORT, paths, jobs=2)
+
+        assert PERFORMANCE_REPORT.finalize(state) == \
+            PERFORMANCE_REPORT.finalize(PERFORMANCE_REPORT.feed(PERFORMANCE_REPORT.create(), read_csv_files(paths)))
+
+    def test_incremental_rejects_compressed(self, temp_dir):
+        """Тест что инкрементальный режим отказывается читать сжатые файлы."""
+        path = _compress(temp_dir, 'data.csv.gz', gzip.open)
+
+        with pytest.raises(ValueError, match="сжатых"):
+            IncrementalReport(os.path.join(temp_dir, 'state.pkl'), 'performance').refresh([path])
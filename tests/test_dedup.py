@@ -0,0 +1,167 @@
+import csv
+import os
+import tempfile
+import tracemalloc
+from unittest.mock import patch
+
+import pytest
+from columnar import convert_files
+from dedup import EmployeeIndex, iter_deduplicated, order_snapshots, read_deduplicated
+from filters import parse_predicates
+from main import main
+from reports import generate_report
+
+
+FIELDS = ['name', 'position', 'completed_tasks', 'performance', 'skills', 'team', 'experience_years']
+
+
+@pytest.fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as directory:
+        yield directory
+
+
+def _write(directory, name, rows, mtime=None):
+    path = os.path.join(directory, name)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def _row(name, performance, team='API Team', position='Developer'):
+    return [name, position, '10', str(performance), 'Python', team, '3']
+
+
+class TestEmployeeIndex:
+    """Тесты для индекса сотрудников."""
+
+    def test_last_row_wins(self):
+        """Тест что повторная строка заменяет прежнюю и не меняет порядок."""
+        index = EmployeeIndex().update([
+            {'name': 'Alex', 'performance': 4.0},
+            {'name': 'Maria', 'performance': 4.5},
+            {'name': 'Alex', 'performance': 4.8},
+        ])
+
+        assert list(index.iter_rows()) == [{'name': 'Alex', 'performance': 4.8}, {'name': 'Maria', 'performance': 4.5}]
+        assert index.duplicates == 1
+        assert len(index) == 2
+
+    def test_composite_key(self):
+        """Тест составного ключа."""
+        index = EmployeeIndex(key=('name', 'team')).update([
+            {'name': 'Alex', 'team': 'API', 'performance': 4.0},
+            {'name': 'Alex', 'team': 'Web', 'performance': 4.5},
+        ])
+
+        assert len(index) == 2
+
+    def test_missing_key_column(self):
+        """Тест ошибки при отсутствии поля ключа."""
+        with pytest.raises(ValueError, match="Колонка 'id' отсутствует"):
+            EmployeeIndex(key=('id',)).add({'name': 'Alex'})
+
+    def test_merge_applies_later_snapshot(self):
+        """Тест что слияние применяет строки другого индекса поверх текущих."""
+        first = EmployeeIndex().update([{'name': 'Alex', 'performance': 4.0}])
+        second = EmployeeIndex().update([{'name': 'Alex', 'performance': 4.9}, {'name': 'Olga', 'performance': 4.1}])
+
+        assert list(first.merge(second).iter_rows())[0] == {'name': 'Alex', 'performance': 4.9}
+        assert len(first) == 2
+
+
+class TestSnapshots:
+    """Тесты объединения снимков."""
+
+    def test_order_by_policy(self, temp_dir):
+        """Тест порядка применения файлов для политик last и latest."""
+        newer = _write(temp_dir, 'a.csv', [], mtime=2_000_000)
+        older = _write(temp_dir, 'b.csv', [], mtime=1_000_000)
+
+        assert order_snapshots([newer, older], 'last') == [newer, older]
+        assert order_snapshots([newer, older], 'latest') == [older, newer]
+        with pytest.raises(ValueError, match="Неизвестная политика"):
+            order_snapshots([newer], 'first')
+
+    def test_employee_counted_once(self, temp_dir):
+        """Тест что сотрудник из двух файлов учитывается в отчете один раз."""
+        first = _write(temp_dir, 'day1.csv', [_row('Alex', 4.0), _row('Maria', 4.4)])
+        second = _write(temp_dir, 'day2.csv', [_row('Alex', 5.0)])
+
+        result = generate_report('performance', iter_deduplicated([first, second]))
+
+        assert result == [{'position': 'Developer', 'performance': 4.7}]
+
+    def test_where_applies_to_latest_version(self, temp_dir):
+        """Тест что условие проверяется по последней версии строки."""
+        first = _write(temp_dir, 'day1.csv', [_row('Alex', 4.0, team='API Team')])
+        second = _write(temp_dir, 'day2.csv', [_row('Alex', 4.0, team='Web Team')])
+
+        rows = list(iter_deduplicated([first, second], columns={'name'},
+                                      where=parse_predicates(["team == 'API Team'"])))
+
+        assert rows == []
+
+    def test_columns_projection(self, temp_dir):
+        """Тест что читаются только нужные колонки и поля ключа."""
+        path = _write(temp_dir, 'day1.csv', [_row('Alex', 4.0)])
+
+        index = read_deduplicated([path], columns={'performance'})
+
+        assert set(index.fields) == {'name', 'performance'}
+
+    def test_columnar_snapshot(self, temp_dir):
+        """Тест объединения CSV и бинарного колоночного снимка."""
+        first = _write(temp_dir, 'day1.csv', [_row('Alex', 4.0)])
+        second = os.path.join(temp_dir, 'day2.ecol')
+        convert_files([_write(temp_dir, 'tmp.csv', [_row('Alex', 4.6)])], second)
+
+        rows = list(iter_deduplicated([first, second], columns={'name', 'performance'}))
+
+        assert [(row['name'], row['performance']) for row in rows] == [('Alex', 4.6)]
+
+    def test_memory_bounded_by_employees(self, temp_dir):
+        """Тест что память зависит от числа сотрудников, а не от числа снимков."""
+        rows = [_row(f'employee{i}', 4.0 + i % 10 / 10, team=f'Team {i % 5}') for i in range(500)]
+        paths = [_write(temp_dir, f'day{day}.csv', rows) for day in range(10)]
+
+        def measure(file_paths):
+            tracemalloc.start()
+            index = read_deduplicated(file_paths)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return index, peak
+
+        single, single_peak = measure(paths[:1])
+        index, peak = measure(paths)
+
+        assert len(index) == 500
+        assert index.duplicates == 4500
+        assert peak < single_peak * 1.5
+
+
+class TestDedupOption:
+    """Тесты параметров --dedup и --dedup-key."""
+
+    def test_main_dedup(self, temp_dir, capsys):
+        """Тест отчета по объединенным снимкам из командной строки."""
+        first = _write(temp_dir, 'day1.csv', [_row('Alex', 4.0), _row('Maria', 4.4)])
+        second = _write(temp_dir, 'day2.csv', [_row('Alex', 5.0)])
+
+        with patch('sys.argv', ['main.py', '--files', first, second, '--report', 'performance',
+                                '--dedup', 'last', '--format', 'tsv']):
+            assert main() == 0
+
+        assert capsys.readouterr().out.splitlines()[1] == 'Developer\t4.7'
+
+    def test_incompatible_options(self, temp_dir):
+        """Тест что --dedup нельзя совместить с пулом процессов."""
+        path = _write(temp_dir, 'day1.csv', [])
+        with patch('sys.argv', ['main.py', '--files', path, '--report', 'performance',
+                                '--dedup', 'last', '--jobs', '2']):
+            with pytest.raises(SystemExit):
+                main()
@@ -0,0 +1,182 @@
+import csv
+import gc
+import os
+import pickle
+import random
+from unittest.mock import patch
+
+import pytest
+import external
+from aggregation import GroupedAggregator
+from external import GROUP_BYTES, ROW_BYTES, SortedRuns, SpillingAggregator, external_sort
+from main import main
+from parallel import aggregate_files
+from reports import GroupReport
+
+
+def _random_rows(count, names, seed=1):
+    generator = random.Random(seed)
+    return [
+        {'name': f'employee{generator.randrange(names)}', 'team': generator.choice(['API', 'Web']),
+         'performance': round(generator.uniform(3, 5), 1)}
+        for _ in range(count)
+    ]
+
+
+def _groups(aggregator):
+    return {key: (stats.count, round(stats.total, 6)) for key, stats in aggregator.items()}
+
+
+class TestSpillingAggregator:
+    """Тесты для группировки с выгрузкой на диск."""
+
+    def test_matches_in_memory(self):
+        """Тест что выгрузка на диск не меняет результат группировки."""
+        rows = _random_rows(5000, names=1000)
+        state = SpillingAggregator('name', 'performance', memory_bytes=GROUP_BYTES * 50, partitions=8)
+        for row in rows:
+            state.add(row)
+            assert len(state.groups) <= state.max_groups
+
+        assert state.spilled and state.spills > 1
+        assert _groups(state) == _groups(GroupedAggregator('name', 'performance').update(rows))
+        assert len(state) == len({row['name'] for row in rows})
+
+    def test_without_spill(self):
+        """Тест что в пределах бюджета группы остаются в памяти в порядке появления."""
+        rows = _random_rows(100, names=5)
+        state = SpillingAggregator('name', 'performance').update(rows)
+
+        assert not state.spilled
+        assert list(state.groups) == list(GroupedAggregator('name', 'performance').update(rows).groups)
+
+    def test_merge_spilled_states(self):
+        """Тест слияния частичных состояний, выгруженных на диск."""
+        rows = _random_rows(4000, names=800)
+        merged = SpillingAggregator('name', 'performance', memory_bytes=GROUP_BYTES * 100)
+        for start in range(0, len(rows), 1000):
+            part = SpillingAggregator('name', 'performance', memory_bytes=GROUP_BYTES * 100)
+            merged.merge(part.update(rows[start:start + 1000]))
+
+        assert _groups(merged) == _groups(GroupedAggregator('name', 'performance').update(rows))
+
+    def test_pickle_keeps_memory_budget(self):
+        """Тест что восстановленное состояние снова выгружает группы на диск, а не держит их в памяти."""
+        rows = _random_rows(1000, names=300)
+        state = SpillingAggregator('name', 'performance', memory_bytes=GROUP_BYTES * 20).update(rows)
+
+        restored = pickle.loads(pickle.dumps(state))
+
+        assert restored.spilled
+        assert restored._directory != state._directory
+        assert len(restored.groups) <= restored.max_groups
+        assert _groups(restored) == _groups(state)
+
+    def test_shared_spill_files(self, monkeypatch):
+        """Тест передачи каталога разделов из рабочего процесса."""
+        monkeypatch.setattr(external, '_SHARE_SPILL_FILES', True)
+        rows = _random_rows(1000, names=300)
+        state = SpillingAggregator('name', 'performance', memory_bytes=GROUP_BYTES * 20).update(rows)
+        expected = _groups(SpillingAggregator('name', 'performance').update(rows))
+        directory = state._directory
+
+        data = pickle.dumps(state)
+        del state
+        gc.collect()
+        restored = pickle.loads(data)
+
+        assert restored._directory == directory
+        assert not restored.groups
+        assert _groups(restored) == expected
+
+        del restored
+        gc.collect()
+        assert not os.path.exists(directory)
+
+    def test_temp_files_removed(self):
+        """Тест что временный каталог удаляется вместе с состоянием."""
+        state = SpillingAggregator('name', 'performance', memory_bytes=GROUP_BYTES * 10)
+        state.update(_random_rows(200, names=100))
+        directory = state._directory
+        assert os.path.isdir(directory)
+
+        del state
+        gc.collect()
+
+        assert not os.path.exists(directory)
+
+
+class TestExternalSort:
+    """Тесты внешней сортировки."""
+
+    @pytest.mark.parametrize('reverse', [False, True])
+    def test_matches_stable_sort(self, reverse):
+        """Тест что слияние серий совпадает с устойчивой сортировкой в памяти."""
+        rows = [{'id': i, 'value': random.Random(i).randint(0, 20)} for i in range(2500)]
+
+        result = external_sort(rows, key=lambda row: row['value'], reverse=reverse, memory_bytes=ROW_BYTES * 300)
+
+        assert isinstance(result, SortedRuns)
+        assert len(result.run_paths) == 9
+        assert len(result) == 2500
+        assert list(result) == sorted(rows, key=lambda row: row['value'], reverse=reverse)
+        # Результат можно перебирать повторно
+        assert list(result) == list(result)
+
+    def test_empty(self):
+        """Тест сортировки пустых данных."""
+        result = external_sort([], key=lambda row: row)
+
+        assert list(result) == [] and not result
+
+
+class TestGroupReportSpill:
+    """Тесты отчетов с группами, не помещающимися в память."""
+
+    def test_report_matches_in_memory(self):
+        """Тест что отчет с выгрузкой содержит те же строки в порядке убывания."""
+        rows = _random_rows(3000, names=600)
+        spilled = GroupReport('name', 'performance', memory_bytes=GROUP_BYTES * 100)(rows)
+        in_memory = GroupReport('name', 'performance')(rows)
+
+        result = list(spilled)
+        assert isinstance(spilled, SortedRuns)
+        # Суммы групп, сброшенных несколько раз, складываются в другом
+        # порядке, поэтому округленное среднее может отличаться на 0.01
+        expected = {row['name']: row['performance'] for row in in_memory}
+        assert {row['name']: row['performance'] for row in result} == pytest.approx(expected, abs=0.011)
+        values = [row['performance'] for row in result]
+        assert values == sorted(values, reverse=True)
+
+    def test_parallel(self, tmp_path):
+        """Тест выгрузки в рабочих процессах и в родительском процессе."""
+        path = tmp_path / 'data.csv'
+        rows = _random_rows(3000, names=900)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['name', 'team', 'performance'])
+            writer.writeheader()
+            writer.writerows(rows)
+        report = GroupReport('name', 'performance', metric='count', memory_bytes=GROUP_BYTES * 100)
+
+        state = aggregate_files(report, [str(path)], jobs=2, chunk_bytes=16 * 1024)
+
+        assert sorted(map(tuple, map(dict.items, report.finalize(state)))) == \
+            sorted(map(tuple, map(dict.items, GroupReport('name', 'performance', metric='count')(rows))))
+
+    def test_memory_option(self, tmp_path, capsys):
+        """Тест параметра --memory-mb."""
+        path = tmp_path / 'data.csv'
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['name', 'position', 'completed_tasks', 'performance', 'skills', 'team', 'experience_years'])
+            for i in range(6000):
+                writer.writerow([f'employee{i}', 'Developer', 10, 3 + i % 20 / 10, 'Python', 'API', 3])
+
+        with patch('sys.argv', ['main.py', '--files', str(path), '--report', 'employee_performance',
+                                '--memory-mb', '1', '--format', 'tsv']):
+            assert main() == 0
+
+        lines = capsys.readouterr().out.splitlines()[1:]
+        values = [float(line.split('\t')[1]) for line in lines]
+        assert len(lines) == 6000
+        assert values == sorted(values, reverse=True)
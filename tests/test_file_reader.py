@@ -2,7 +2,9 @@ import pytest
 import csv
 import tempfile
 import os
-from file_reader import read_csv_files
+import file_reader
+from file_reader import read_csv_files, iter_csv_files, split_csv_file, iter_csv_range
+from filters import parse_predicates
 
 
 class TestReadCsvFiles:
@@ -155,3 +157,161 @@ class TestReadCsvFiles:
         finally:
             os.unlink(temp_path)
 
+
+
+class TestIterCsvFiles:
+    """Тесты для потокового чтения iter_csv_files."""
+    
+    def test_returns_iterator(self):
+        """Тест что функция возвращает ленивый итератор."""
+        # Файл не открывается до первого обращения к итератору
+        rows = iter_csv_files(['nonexistent_file.csv'])
+        assert iter(rows) is rows
+        
+        with pytest.raises(FileNotFoundError):
+            next(rows)
+    
+    def test_yields_converted_rows_in_order(self):
+        """Тест построчной выдачи с конвертацией типов из нескольких файлов."""
+        temp_files = []
+        
+        try:
+            for name in ('Alice', 'Bob'):
+                with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(['name', 'position', 'completed_tasks', 'performance', 'skills', 'team', 'experience_years'])
+                    writer.writerow([name, 'Developer', '15', '4.7', 'Python', 'Team A', '3'])
+                    temp_files.append(f.name)
+            
+            rows = list(iter_csv_files(temp_files))
+            
+            assert [row['name'] for row in rows] == ['Alice', 'Bob']
+            assert rows[0]['completed_tasks'] == 15
+            assert rows[0]['performance'] == 4.7
+            assert rows == read_csv_files(temp_files)
+        finally:
+            for path in temp_files:
+                os.unlink(path)
+
+
+class TestSplitCsvFile:
+    """Тесты для разбиения файла на фрагменты по границам записей."""
+    
+    def _write_rows(self, rows):
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['name', 'position', 'completed_tasks', 'performance', 'skills', 'team', 'experience_years'])
+            writer.writerows(rows)
+            return f.name
+    
+    def test_chunks_cover_all_rows(self):
+        """Тест что фрагменты в сумме дают все строки файла."""
+        temp_path = self._write_rows([
+            [f'Name {i}', 'Developer', str(i), '4.5', 'Python, Django, "Docker"', 'Team A', '3']
+            for i in range(50)
+        ])
+        
+        try:
+            fieldnames, ranges = split_csv_file(temp_path, chunk_bytes=200)
+            rows = [row for start, end in ranges for row in iter_csv_range(temp_path, start, end, fieldnames)]
+            
+            assert len(ranges) > 1
+            assert fieldnames[0] == 'name'
+            assert rows == read_csv_files([temp_path])
+        finally:
+            os.unlink(temp_path)
+    
+    def test_newlines_inside_quoted_fields(self, monkeypatch):
+        """Тест что граница не попадает на перевод строки внутри кавычек."""
+        # Маленький блок сканирования проверяет и переходы между блоками
+        monkeypatch.setattr(file_reader, 'SCAN_BLOCK_BYTES', 7)
+        temp_path = self._write_rows([
+            [f'Name {i}', 'Developer', str(i), '4.5', 'Python,\nDjango,\n"SQL"', 'Team A', '3']
+            for i in range(30)
+        ])
+        
+        try:
+            for chunk_bytes in (1, 10, 100):
+                fieldnames, ranges = split_csv_file(temp_path, chunk_bytes=chunk_bytes)
+                rows = [row for start, end in ranges for row in iter_csv_range(temp_path, start, end, fieldnames)]
+                
+                assert rows == read_csv_files([temp_path])
+        finally:
+            os.unlink(temp_path)
+    
+    def test_header_only_file(self):
+        """Тест файла без строк данных."""
+        temp_path = self._write_rows([])
+        
+        try:
+            fieldnames, ranges = split_csv_file(temp_path)
+            
+            assert len(fieldnames) == 7
+            assert ranges == []
+        finally:
+            os.unlink(temp_path)
+
+
+class TestProjectionAndFilters:
+    """Тесты для чтения только нужных колонок и фильтрации при чтении."""
+    
+    def _write_rows(self, rows):
+        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['name', 'position', 'completed_tasks', 'performance', 'skills', 'team', 'experience_years'])
+            writer.writerows(rows)
+            return f.name
+    
+    def test_column_projection(self):
+        """Тест что в строках остаются только нужные колонки."""
+        temp_path = self._write_rows([['John', 'Developer', '10', '4.5', 'Python, SQL', 'Team A', '2']])
+        
+        try:
+            rows = list(iter_csv_files([temp_path], columns={'position', 'performance'}))
+            
+            assert rows == [{'position': 'Developer', 'performance': 4.5}]
+        finally:
+            os.unlink(temp_path)
+    
+    def test_unused_columns_are_not_converted(self):
+        """Тест что некорректные значения в ненужных колонках не мешают чтению."""
+        temp_path = self._write_rows([['John', 'Developer', 'n/a', '4.5', 'Python', 'Team A', '?']])
+        
+        try:
+            rows = list(iter_csv_files([temp_path], columns={'position', 'performance'}))
+            
+            assert rows == [{'position': 'Developer', 'performance': 4.5}]
+        finally:
+            os.unlink(temp_path)
+    
+    def test_where_drops_rows_before_building(self):
+        """Тест фильтрации строк при чтении."""
+        temp_path = self._write_rows([
+            ['John', 'Developer', '10', '4.5', 'Python', 'API Team', '2'],
+            ['Jane', 'Developer', '12', '4.9', 'Go', 'API Team', '5'],
+            ['Bob', 'QA', '8', '4.0', 'Testing', 'Web Team', '6'],
+        ])
+        where = parse_predicates(["team == 'API Team'", 'experience_years >= 3'])
+        
+        try:
+            rows = list(iter_csv_files([temp_path], columns={'name'}, where=where))
+            fieldnames, ranges = split_csv_file(temp_path)
+            range_rows = list(iter_csv_range(temp_path, *ranges[0], fieldnames, columns={'name'}, where=where))
+            
+            assert rows == [{'name': 'Jane'}]
+            assert range_rows == rows
+        finally:
+            os.unlink(temp_path)
+    
+    def test_unknown_column(self):
+        """Тест ошибки для колонки, которой нет в файле."""
+        temp_path = self._write_rows([['John', 'Developer', '10', '4.5', 'Python', 'Team A', '2']])
+        
+        try:
+            with pytest.raises(Exception) as exc_info:
+                list(iter_csv_files([temp_path], columns={'salary'}))
+            
+            assert 'Ошибка при чтении файла' in str(exc_info.value)
+            assert 'salary' in str(exc_info.value)
+        finally:
+            os.unlink(temp_path)
@@ -0,0 +1,63 @@
+import pytest
+from filters import Predicate, parse_predicate, parse_predicates, filter_rows
+
+
+class TestParsePredicate:
+    """Тесты для разбора условий фильтрации."""
+    
+    def test_string_condition(self):
+        """Тест условия по строковой колонке в кавычках."""
+        predicate = parse_predicate("team == 'API Team'")
+        
+        assert predicate.column == 'team'
+        assert predicate.op == '=='
+        assert predicate.value == 'API Team'
+        assert predicate({'team': 'API Team'})
+        assert not predicate({'team': 'Web Team'})
+    
+    def test_numeric_condition_is_typed(self):
+        """Тест приведения значения к типу числовой колонки."""
+        predicate = parse_predicate('experience_years >= 3')
+        
+        assert predicate.value == 3
+        assert isinstance(predicate.value, int)
+        assert predicate.matches('5')
+        assert not predicate.matches('2')
+        assert parse_predicate('performance<4.5').matches('4.4')
+    
+    @pytest.mark.parametrize('expression', ['team', 'team ~= x', 'performance > high', '== 3'])
+    def test_invalid_conditions(self, expression):
+        """Тест ошибок для некорректных условий."""
+        with pytest.raises(ValueError) as exc_info:
+            parse_predicate(expression)
+        
+        assert 'Некорректное условие фильтрации' in str(exc_info.value)
+    
+    def test_unknown_operator(self):
+        """Тест ошибки для неизвестного оператора."""
+        with pytest.raises(ValueError):
+            Predicate('team', '=~', 'API Team')
+    
+    def test_parse_predicates_empty(self):
+        """Тест пустого списка условий."""
+        assert parse_predicates(None) == []
+
+
+class TestFilterRows:
+    """Тесты для фильтрации уже прочитанных строк."""
+    
+    def test_filter_rows_and_semantics(self):
+        """Тест объединения условий по И."""
+        rows = [
+            {'team': 'API Team', 'experience_years': 5},
+            {'team': 'API Team', 'experience_years': 1},
+            {'team': 'Web Team', 'experience_years': 7},
+        ]
+        where = parse_predicates(["team == 'API Team'", 'experience_years >= 3'])
+        
+        assert list(filter_rows(rows, where)) == [rows[0]]
+    
+    def test_no_conditions_returns_data(self):
+        """Тест что без условий данные не оборачиваются."""
+        rows = [{'team': 'API Team'}]
+        assert filter_rows(rows, []) is rows
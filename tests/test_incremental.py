@@ -0,0 +1,191 @@
+import csv
+import os
+import tempfile
+
+import pytest
+from columnar import convert_files
+from file_reader import read_csv_files
+from incremental import IncrementalReport
+from reports import ReportGenerator
+
+
+HEADER = ['name', 'position', 'completed_tasks', 'performance', 'skills', 'team', 'experience_years']
+
+
+def _append_rows(path, rows, header=False):
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(HEADER)
+        writer.writerows(rows)
+
+
+class TestIncrementalReport:
+    """Тесты для инкрементального обновления отчета."""
+    
+    def test_refresh_reads_only_appended_rows(self):
+        """Тест что повторный запуск разбирает только дописанные строки."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            state_path = os.path.join(temp_dir, 'state.pkl')
+            _append_rows(csv_path, [
+                ['John', 'Developer', '10', '4.5', 'Python, SQL', 'Team A', '2'],
+                ['Jane', 'QA', '12', '4.1', 'Testing', 'Team B', '3'],
+            ], header=True)
+            
+            first = IncrementalReport(state_path, 'performance')
+            first.refresh([csv_path])
+            assert first.rows_read == 2
+            
+            _append_rows(csv_path, [['Bob', 'Developer', '15', '4.9', 'Go', 'Team A', '4']])
+            second = IncrementalReport(state_path, 'performance')
+            result = second.refresh([csv_path])
+            
+            assert second.rows_read == 1
+            assert result == ReportGenerator.performance_report(read_csv_files([csv_path]))
+    
+    def test_incomplete_last_record_is_not_consumed(self):
+        """Тест что недописанная последняя запись читается при следующем запуске."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            state_path = os.path.join(temp_dir, 'state.pkl')
+            _append_rows(csv_path, [['John', 'Developer', '10', '4.5', 'Python', 'Team A', '2']], header=True)
+            with open(csv_path, 'a', encoding='utf-8') as f:
+                f.write('Jane,QA,12,4.1,"Testing,')
+            
+            report = IncrementalReport(state_path, 'performance')
+            assert report.refresh([csv_path]) == [{'position': 'Developer', 'performance': 4.5}]
+            
+            with open(csv_path, 'a', encoding='utf-8') as f:
+                f.write(' Selenium",Team B,3\n')
+            result = report.refresh([csv_path])
+            
+            assert report.rows_read == 1
+            assert result == ReportGenerator.performance_report(read_csv_files([csv_path]))
+    
+    def test_last_record_without_newline(self):
+        """Тест что полная последняя запись без перевода строки учитывается сразу."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            state_path = os.path.join(temp_dir, 'state.pkl')
+            _append_rows(csv_path, [['John', 'Developer', '10', '4.5', 'Python', 'Team A', '2']], header=True)
+            with open(csv_path, 'a', encoding='utf-8') as f:
+                f.write('Jane,QA,12,4.1,"Testing, Selenium",Team B,3')
+            
+            report = IncrementalReport(state_path, 'performance')
+            result = report.refresh([csv_path])
+            
+            assert report.rows_read == 2
+            assert result == ReportGenerator.performance_report(read_csv_files([csv_path]))
+            
+            # Новая запись с новой строки дочитывается без пересчета
+            with open(csv_path, 'a', encoding='utf-8') as f:
+                f.write('\nBob,QA,15,3.9,Go,Team B,4\n')
+            result = report.refresh([csv_path])
+            
+            assert report.rows_read == 1
+            assert result == ReportGenerator.performance_report(read_csv_files([csv_path]))
+    
+    def test_continued_last_record_triggers_rebuild(self):
+        """Тест пересчета, если дописанные байты продолжают учтенную запись без перевода строки."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            state_path = os.path.join(temp_dir, 'state.pkl')
+            _append_rows(csv_path, [['John', 'Developer', '10', '4.5', 'Python', 'Team A', '2']], header=True)
+            with open(csv_path, 'a', encoding='utf-8') as f:
+                f.write('Jane,QA,12,4.1,Testing,Team B,3')
+            
+            report = IncrementalReport(state_path, 'performance')
+            report.refresh([csv_path])
+            with open(csv_path, 'a', encoding='utf-8') as f:
+                f.write('5\n')
+            result = report.refresh([csv_path])
+            
+            assert report.rows_read == 2
+            assert result == ReportGenerator.performance_report(read_csv_files([csv_path]))
+    
+    def test_short_last_record_is_not_consumed(self):
+        """Тест что последняя запись без перевода строки с недостающими полями не читается."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            state_path = os.path.join(temp_dir, 'state.pkl')
+            _append_rows(csv_path, [['John', 'Developer', '10', '4.5', 'Python', 'Team A', '2']], header=True)
+            with open(csv_path, 'a', encoding='utf-8') as f:
+                f.write('Jane,QA,12,4.')
+            
+            report = IncrementalReport(state_path, 'performance')
+            assert report.refresh([csv_path]) == [{'position': 'Developer', 'performance': 4.5}]
+            
+            with open(csv_path, 'a', encoding='utf-8') as f:
+                f.write('1,Testing,Team B,3\n')
+            result = report.refresh([csv_path])
+            
+            assert report.rows_read == 1
+            assert result == ReportGenerator.performance_report(read_csv_files([csv_path]))
+    
+    def test_sample_files_match_full_read(self, tmp_path):
+        """Тест что отчет по файлам из employees_data совпадает с обычным чтением."""
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+        files = [os.path.join(data_dir, 'employees1.csv'), os.path.join(data_dir, 'employees2.csv')]
+        
+        result = IncrementalReport(str(tmp_path / 'state.pkl'), 'performance').refresh(files)
+        
+        assert result == ReportGenerator.performance_report(read_csv_files(files))
+    
+    def test_rewritten_file_triggers_rebuild(self):
+        """Тест полного пересчета после перезаписи файла."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            csv_path = os.path.join(temp_dir, 'employees.csv')
+            other_path = os.path.join(temp_dir, 'other.csv')
+            state_path = os.path.join(temp_dir, 'state.pkl')
+            _append_rows(csv_path, [['John', 'Developer', '10', '4.5', 'Python', 'Team A', '2']], header=True)
+            _append_rows(other_path, [['Ann', 'QA', '11', '4.0', 'Testing', 'Team B', '1']], header=True)
+            
+            report = IncrementalReport(state_path, 'performance')
+            report.refresh([csv_path, other_path])
+            
+            os.unlink(csv_path)
+            _append_rows(csv_path, [['Jane', 'Developer', '12', '3.9', 'Java', 'Team A', '3']], header=True)
+            result = report.refresh([csv_path, other_path])
+            
+            assert report.rows_read == 2
+            assert result == ReportGenerator.performance_report(read_csv_files([csv_path, other_path]))
+    
+    def test_removed_file_triggers_rebuild(self):
+        """Тест полного пересчета после исключения файла из списка."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [os.path.join(temp_dir, f'employees{i}.csv') for i in range(2)]
+            state_path = os.path.join(temp_dir, 'state.pkl')
+            for i, path in enumerate(paths):
+                _append_rows(path, [[f'Name {i}', f'Position {i}', '10', '4.5', 'Python', 'Team A', '2']], header=True)
+            
+            report = IncrementalReport(state_path, 'performance')
+            report.refresh(paths)
+            result = report.refresh(paths[:1])
+            
+            assert result == [{'position': 'Position 0', 'performance': 4.5}]
+    
+    def test_missing_file(self):
+        """Тест ошибки для отсутствующего файла."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report = IncrementalReport(os.path.join(temp_dir, 'state.pkl'), 'performance')
+            
+            with pytest.raises(FileNotFoundError) as exc_info:
+                report.refresh(['nonexistent_file.csv'])
+            
+            assert 'Файл не найден' in str(exc_info.value)
+    
+    def test_columnar_file_is_rejected(self, tmp_path):
+        """Тест что бинарный колоночный файл не читается как CSV."""
+        csv_path = str(tmp_path / 'employees.csv')
+        ecol_path = str(tmp_path / 'employees.ecol')
+        _append_rows(csv_path, [['John', 'Developer', '10', '4.5', 'Python, SQL', 'Team A', '2']], header=True)
+        convert_files([csv_path], ecol_path)
+
+        with pytest.raises(ValueError, match='колоночных'):
+            IncrementalReport(str(tmp_path / 'state.pkl'), 'performance').refresh([ecol_path])
+
+    def test_unknown_report(self):
+        """Тест ошибки для неизвестного отчета."""
+        with pytest.raises(ValueError):
+            IncrementalReport('state.pkl', 'invalid_report')
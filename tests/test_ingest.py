@@ -0,0 +1,203 @@
+import io
+import os
+import shutil
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from file_reader import expand_inputs, read_csv_files
+from ingest import ConcurrentIngest, iter_csv_concurrent
+from main import main
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+DATA_FILES = [os.path.join(DATA_DIR, 'employees1.csv'), os.path.join(DATA_DIR, 'employees2.csv')]
+
+
+class SlowReader(io.RawIOBase):
+    """Замена медленного сетевого диска: каждое чтение ждет delay секунд."""
+
+    def __init__(self, data, delay, stats):
+        super().__init__()
+        self._data = io.BytesIO(data)
+        self._delay = delay
+        self._stats = stats
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        time.sleep(self._delay)
+        self._stats['reads'] += 1
+        return self._data.readinto(buffer)
+
+    def close(self):
+        if not self.closed:
+            with self._stats['lock']:
+                self._stats['open'] -= 1
+        super().close()
+
+
+class GatedReader(SlowReader):
+    """Первое чтение ждет события gate (не дольше 5 секунд) и запоминает, дождалось ли."""
+
+    def __init__(self, data, stats, gate=None):
+        super().__init__(data, 0, stats)
+        self._gate = gate
+        self.passed = None
+
+    def readinto(self, buffer):
+        if self.passed is None and self._gate is not None:
+            self.passed = self._gate.wait(5)
+        return super().readinto(buffer)
+
+
+class SlowSource:
+    """Открывает файлы с задержкой и считает одновременно открытые."""
+
+    def __init__(self, delay=0.01, data=None):
+        self.delay = delay
+        self.data = data
+        self.stats = {'reads': 0, 'open': 0, 'max_open': 0, 'lock': threading.Lock()}
+
+    def __call__(self, path):
+        time.sleep(self.delay)
+        with self.stats['lock']:
+            self.stats['open'] += 1
+            self.stats['max_open'] = max(self.stats['max_open'], self.stats['open'])
+        if self.data is not None:
+            data = self.data
+        else:
+            with open(path, 'rb') as f:
+                data = f.read()
+        return SlowReader(data, self.delay, self.stats)
+
+
+class TestExpandInputs:
+    """Тесты для раскрытия шаблонов и каталогов во входных путях."""
+
+    def test_directory(self, tmp_path):
+        """Тест что из каталога берутся файлы данных по алфавиту."""
+        for name in ('b.csv', 'a.csv.gz', 'notes.txt'):
+            (tmp_path / name).write_bytes(b'')
+        (tmp_path / 'nested.csv').mkdir()
+
+        assert expand_inputs([str(tmp_path)]) == [str(tmp_path / 'a.csv.gz'), str(tmp_path / 'b.csv')]
+
+    def test_glob(self, tmp_path):
+        """Тест рекурсивного шаблона и удаления повторов."""
+        (tmp_path / 'day1').mkdir()
+        (tmp_path / 'day2').mkdir()
+        for path in (tmp_path / 'day1' / 'x.csv', tmp_path / 'day2' / 'y.csv'):
+            path.write_bytes(b'')
+
+        result = expand_inputs([str(tmp_path / '**' / '*.csv'), str(tmp_path / 'day1' / 'x.csv')])
+
+        assert result == [str(tmp_path / 'day1' / 'x.csv'), str(tmp_path / 'day2' / 'y.csv')]
+
+    def test_plain_paths_are_kept(self):
+        """Тест что обычные пути (даже несуществующие) остаются как есть."""
+        assert expand_inputs(['missing.csv', DATA_FILES[0]]) == ['missing.csv', DATA_FILES[0]]
+
+    def test_glob_without_matches(self, tmp_path):
+        """Тест ошибки для шаблона без совпадений."""
+        with pytest.raises(FileNotFoundError, match="Файлы не найдены"):
+            expand_inputs([str(tmp_path / '*.csv')])
+
+
+class TestConcurrentIngest:
+    """Тесты одновременного чтения файлов."""
+
+    def test_matches_sequential(self):
+        """Тест что строки и их порядок совпадают с последовательным чтением."""
+        files = DATA_FILES * 6
+
+        assert list(iter_csv_concurrent(files, concurrency=4, opener=SlowSource())) == read_csv_files(files)
+
+    def test_reads_files_concurrently(self):
+        """Тест что одновременно открыто несколько файлов, но не больше concurrency."""
+        source = SlowSource(delay=0.02)
+
+        list(iter_csv_concurrent(DATA_FILES * 5, concurrency=3, opener=source))
+
+        assert source.stats['max_open'] == 3
+        assert source.stats['open'] == 0
+
+    def test_next_files_open_while_first_is_read(self):
+        """Тест что следующие файлы открываются, пока первый еще не прочитан (без замеров времени)."""
+        stats = {'reads': 0, 'open': 0, 'lock': threading.Lock()}
+        all_open = threading.Event()
+        readers = []
+
+        def opener(path):
+            with open(path, 'rb') as f:
+                data = f.read()
+            with stats['lock']:
+                stats['open'] += 1
+                if stats['open'] == 3:
+                    all_open.set()
+                reader = GatedReader(data, stats, all_open if not readers else None)
+                readers.append(reader)
+            return reader
+
+        rows = list(iter_csv_concurrent(DATA_FILES * 3, concurrency=3, opener=opener))
+
+        assert rows == read_csv_files(DATA_FILES * 3)
+        # При последовательном чтении первый файл ждал бы открытия третьего до тайм-аута
+        assert readers[0].passed
+
+    def test_backpressure(self):
+        """Тест что чтение останавливается, когда разбор отстает."""
+        source = SlowSource(delay=0, data=b'x' * 1024 * 1024)
+        with ConcurrentIngest(['a', 'b', 'c', 'd'], concurrency=2, queue_blocks=2, block_bytes=1024,
+                              opener=source) as ingest:
+            _, stream = next(ingest.streams())
+            stream.read(10)
+            time.sleep(0.2)
+
+            # Два файла в работе, у каждого не больше двух блоков в очереди
+            # и одного ожидающего места в ней
+            assert source.stats['max_open'] == 2
+            assert source.stats['reads'] <= 2 * (2 + 2)
+
+    def test_missing_file(self, tmp_path):
+        """Тест ошибки для несуществующего файла."""
+        with pytest.raises(FileNotFoundError, match="Файл не найден"):
+            list(iter_csv_concurrent([DATA_FILES[0], str(tmp_path / 'missing.csv')]))
+
+    def test_read_error(self):
+        """Тест что ошибка чтения из пула потоков доходит до потребителя."""
+        def opener(path):
+            raise OSError('сетевой диск недоступен')
+
+        with pytest.raises(Exception, match="сетевой диск недоступен"):
+            list(iter_csv_concurrent(DATA_FILES, opener=opener))
+
+    def test_early_close(self):
+        """Тест что незавершенное чтение останавливает цикл событий и потоки."""
+        threads = threading.active_count()
+        rows = iter_csv_concurrent(DATA_FILES * 10, concurrency=4, opener=SlowSource())
+        next(rows)
+        rows.close()
+
+        assert threading.active_count() == threads
+
+
+class TestConcurrencyOption:
+    """Тесты параметра --concurrency и каталогов в --files."""
+
+    def test_directory_input(self, tmp_path, capsys):
+        """Тест чтения каталога с одновременной загрузкой файлов."""
+        for path in DATA_FILES:
+            shutil.copy(path, tmp_path)
+
+        with patch('sys.argv', ['main.py', '--files', str(tmp_path), '--report', 'performance',
+                                '--concurrency', '4', '--format', 'tsv']):
+            assert main() == 0
+        concurrent = capsys.readouterr().out
+
+        with patch('sys.argv', ['main.py', '--files', *DATA_FILES, '--report', 'performance', '--format', 'tsv']):
+            assert main() == 0
+
+        assert concurrent == capsys.readouterr().out
@@ -1,20 +1,26 @@
+import csv
+import json
+import os
 import pytest
+import subprocess
 import sys
+import tempfile
 from unittest.mock import patch, MagicMock
 from main import main
+from writers import iter_binary_stream
 
 
 class TestMain:
     """Тесты для функции main."""
     
-    @patch('main.read_csv_files')
+    @patch('main.iter_csv_files')
     @patch('main.generate_report')
     @patch('main.tabulate')
     @patch('builtins.print')
-    def test_main_success_performance_report(self, mock_print, mock_tabulate, mock_generate_report, mock_read_csv_files):
+    def test_main_success_performance_report(self, mock_print, mock_tabulate, mock_generate_report, mock_iter_csv_files):
         """Тест успешного выполнения с отчетом performance."""
         # Настройка моков
-        mock_read_csv_files.return_value = [
+        mock_iter_csv_files.return_value = [
             {'position': 'Developer', 'performance': 4.5}
         ]
         mock_generate_report.return_value = [
@@ -29,18 +35,21 @@ class TestMain:
             result = main()
         
         assert result == 0
-        mock_read_csv_files.assert_called_once_with(['test.csv'])
+        mock_iter_csv_files.assert_called_once_with(
+            ['test.csv'], columns=frozenset({'position', 'performance'}), where=[], quarantine=None,
+            timings=None
+        )
         mock_generate_report.assert_called_once()
         mock_tabulate.assert_called_once()
         mock_print.assert_called()
     
-    @patch('main.read_csv_files')
+    @patch('main.iter_csv_files')
     @patch('main.generate_report')
     @patch('main.tabulate')
     @patch('builtins.print')
-    def test_main_success_other_report(self, mock_print, mock_tabulate, mock_generate_report, mock_read_csv_files):
+    def test_main_success_other_report(self, mock_print, mock_tabulate, mock_generate_report, mock_iter_csv_files):
         """Тест успешного выполнения с другим типом отчета."""
-        mock_read_csv_files.return_value = [{'key': 'value'}]
+        mock_iter_csv_files.return_value = [{'key': 'value'}]
         mock_generate_report.return_value = [{'key': 'value'}]
         mock_tabulate.return_value = 'formatted_table'
         
@@ -52,11 +61,11 @@ class TestMain:
         assert result == 0
         mock_tabulate.assert_called_once()
     
-    @patch('main.read_csv_files')
+    @patch('main.iter_csv_files')
     @patch('builtins.print')
-    def test_main_empty_data(self, mock_print, mock_read_csv_files):
+    def test_main_empty_data(self, mock_print, mock_iter_csv_files):
         """Тест обработки пустых данных."""
-        mock_read_csv_files.return_value = []
+        mock_iter_csv_files.return_value = []
         
         test_args = ['main.py', '--files', 'test.csv', '--report', 'performance']
         
@@ -66,11 +75,11 @@ class TestMain:
         assert result == 0
         mock_print.assert_called_with("Нет данных для анализа")
     
-    @patch('main.read_csv_files')
+    @patch('main.iter_csv_files')
     @patch('builtins.print')
-    def test_main_file_error(self, mock_print, mock_read_csv_files):
+    def test_main_file_error(self, mock_print, mock_iter_csv_files):
         """Тест обработки ошибки чтения файла."""
-        mock_read_csv_files.side_effect = FileNotFoundError("Файл не найден")
+        mock_iter_csv_files.side_effect = FileNotFoundError("Файл не найден")
         
         test_args = ['main.py', '--files', 'test.csv', '--report', 'performance']
         
@@ -81,12 +90,12 @@ class TestMain:
         mock_print.assert_called()
         assert 'Ошибка' in str(mock_print.call_args)
     
-    @patch('main.read_csv_files')
+    @patch('main.iter_csv_files')
     @patch('main.generate_report')
     @patch('builtins.print')
-    def test_main_report_error(self, mock_print, mock_generate_report, mock_read_csv_files):
+    def test_main_report_error(self, mock_print, mock_generate_report, mock_iter_csv_files):
         """Тест обработки ошибки генерации отчета."""
-        mock_read_csv_files.return_value = [{'position': 'Developer', 'performance': 4.5}]
+        mock_iter_csv_files.return_value = [{'position': 'Developer', 'performance': 4.5}]
         mock_generate_report.side_effect = ValueError("Отчет не найден")
         
         test_args = ['main.py', '--files', 'test.csv', '--report', 'invalid']
@@ -98,13 +107,13 @@ class TestMain:
         mock_print.assert_called()
         assert 'Ошибка' in str(mock_print.call_args)
     
-    @patch('main.read_csv_files')
+    @patch('main.iter_csv_files')
     @patch('main.generate_report')
     @patch('main.tabulate')
     @patch('builtins.print')
-    def test_main_multiple_files(self, mock_print, mock_tabulate, mock_generate_report, mock_read_csv_files):
+    def test_main_multiple_files(self, mock_print, mock_tabulate, mock_generate_report, mock_iter_csv_files):
         """Тест обработки нескольких файлов."""
-        mock_read_csv_files.return_value = [
+        mock_iter_csv_files.return_value = [
             {'position': 'Developer', 'performance': 4.5}
         ]
         mock_generate_report.return_value = [
@@ -118,5 +127,219 @@ class TestMain:
             result = main()
         
         assert result == 0
-        mock_read_csv_files.assert_called_once_with(['file1.csv', 'file2.csv'])
+        mock_iter_csv_files.assert_called_once_with(
+            ['file1.csv', 'file2.csv'], columns=frozenset({'position', 'performance'}), where=[], quarantine=None,
+            timings=None
+        )
 
+
+    @patch('builtins.print')
+    def test_main_columnar_mode(self, mock_print):
+        """Тест что колоночный режим выдает тот же отчет."""
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+        files = [os.path.join(data_dir, 'employees1.csv'), os.path.join(data_dir, 'employees2.csv')]
+        outputs = []
+        
+        for extra in ([], ['--columnar']):
+            with patch('sys.argv', ['main.py', '--files', *files, '--report', 'performance', *extra]):
+                assert main() == 0
+            outputs.append(mock_print.call_args)
+        
+        assert outputs[0] == outputs[1]
+        assert 'Backend Developer' in str(outputs[1])
+
+    @patch('builtins.print')
+    def test_main_parallel_jobs(self, mock_print):
+        """Тест что режим --jobs выдает тот же отчет, что и последовательный."""
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+        files = [os.path.join(data_dir, 'employees1.csv'), os.path.join(data_dir, 'employees2.csv')]
+        outputs = []
+        
+        for extra in ([], ['--jobs', '2']):
+            with patch('sys.argv', ['main.py', '--files', *files, '--report', 'performance', *extra]):
+                assert main() == 0
+            outputs.append(mock_print.call_args)
+        
+        assert outputs[0] == outputs[1]
+
+    @patch('builtins.print')
+    def test_main_cache_dir(self, mock_print):
+        """Тест что повторный запуск с --cache-dir выдает тот же отчет из кэша."""
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+        files = [os.path.join(data_dir, 'employees1.csv'), os.path.join(data_dir, 'employees2.csv')]
+        outputs = []
+        
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for extra in ([], ['--cache-dir', cache_dir], ['--cache-dir', cache_dir]):
+                with patch('sys.argv', ['main.py', '--files', *files, '--report', 'performance', *extra]):
+                    assert main() == 0
+                outputs.append(mock_print.call_args)
+            
+            assert len(os.listdir(cache_dir)) == 2
+        
+        assert outputs[0] == outputs[1] == outputs[2]
+
+    @patch('builtins.print')
+    def test_main_state(self, mock_print):
+        """Тест что отчет с --state совпадает с обычным запуском."""
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+        files = [os.path.join(data_dir, 'employees1.csv'), os.path.join(data_dir, 'employees2.csv')]
+        outputs = []
+        
+        with tempfile.TemporaryDirectory() as state_dir:
+            state_path = os.path.join(state_dir, 'state.pkl')
+            for extra in ([], ['--state', state_path], ['--state', state_path]):
+                with patch('sys.argv', ['main.py', '--files', *files, '--report', 'performance', *extra]):
+                    assert main() == 0
+                outputs.append(mock_print.call_args)
+        
+        assert outputs[0] == outputs[1] == outputs[2]
+        assert 'Fullstack Developer' in str(outputs[0])
+
+    @patch('builtins.print')
+    def test_main_convert_subcommand(self, mock_print):
+        """Тест подкоманды convert и чтения бинарного колоночного файла."""
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+        files = [os.path.join(data_dir, 'employees1.csv'), os.path.join(data_dir, 'employees2.csv')]
+        
+        with patch('sys.argv', ['main.py', '--files', *files, '--report', 'performance']):
+            assert main() == 0
+        expected = mock_print.call_args
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, 'snapshot.ecol')
+            
+            with patch('sys.argv', ['main.py', 'convert', '--files', *files, '--output', output]):
+                assert main() == 0
+            assert 'Записано строк: 15' in str(mock_print.call_args)
+            
+            with patch('sys.argv', ['main.py', '--files', output, '--report', 'performance']):
+                assert main() == 0
+            assert mock_print.call_args == expected
+    
+    @patch('builtins.print')
+    def test_main_convert_missing_file(self, mock_print):
+        """Тест ошибки подкоманды convert для отсутствующего файла."""
+        with patch('sys.argv', ['main.py', 'convert', '--files', 'nonexistent_file.csv', '--output', 'out.ecol']):
+            assert main() == 1
+        
+        assert 'Ошибка' in str(mock_print.call_args)
+
+    def test_main_stats_and_profile(self, capsys):
+        """Тест вывода статистики этапов и сохранения профиля cProfile."""
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+        files = [os.path.join(data_dir, 'employees1.csv'), os.path.join(data_dir, 'employees2.csv')]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            profile_path = os.path.join(temp_dir, 'run.prof')
+            
+            with patch('sys.argv', ['main.py', '--files', *files, '--report', 'performance', '--profile', profile_path]):
+                assert main() == 0
+            
+            assert os.path.getsize(profile_path) > 0
+        
+        captured = capsys.readouterr()
+        assert 'Backend Developer' in captured.out
+        for stage in ('parse', 'convert', 'report', 'format'):
+            assert stage in captured.err
+
+    def test_main_multiple_reports(self, capsys):
+        """Тест вывода нескольких отчетов за один запуск."""
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+        files = [os.path.join(data_dir, 'employees1.csv'), os.path.join(data_dir, 'employees2.csv')]
+        
+        with patch('sys.argv', ['main.py', '--files', *files, '--report', 'performance', 'team']):
+            assert main() == 0
+        
+        output = capsys.readouterr().out
+        assert 'Отчет: performance' in output
+        assert 'Отчет: team' in output
+        assert 'API Team' in output
+
+    def test_main_where_filter(self, capsys):
+        """Тест фильтрации строк через --where во всех режимах чтения."""
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+        files = [os.path.join(data_dir, 'employees1.csv'), os.path.join(data_dir, 'employees2.csv')]
+        outputs = []
+        
+        for extra in ([], ['--columnar'], ['--jobs', '2']):
+            argv = ['main.py', '--files', *files, '--report', 'performance', '--where', "team == 'API Team'", *extra]
+            with patch('sys.argv', argv):
+                assert main() == 0
+            outputs.append(capsys.readouterr().out)
+        
+        assert outputs[0] == outputs[1] == outputs[2]
+        assert 'Backend Developer' in outputs[0]
+        assert 'QA Engineer' not in outputs[0]
+
+
+class TestStartup:
+    """Тесты быстрого запуска CLI."""
+    
+    def test_import_main_is_lightweight(self):
+        """Тест что импорт main не загружает модули необязательных режимов."""
+        root = os.path.join(os.path.dirname(__file__), '..')
+        code = ("import sys, main; "
+                "print(sorted(m for m in ('numpy', 'tabulate', 'parallel', 'cache', 'incremental', "
+                "'columnar', 'cProfile', 'concurrent.futures') if m in sys.modules))")
+        completed = subprocess.run([sys.executable, '-c', code], cwd=root, capture_output=True, text=True, check=True)
+        
+        assert completed.stdout.strip() == '[]'
+    
+    def test_main_tsv_format(self, capsys):
+        """Тест вывода отчета в формате TSV без tabulate."""
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+        files = [os.path.join(data_dir, 'employees1.csv'), os.path.join(data_dir, 'employees2.csv')]
+        
+        with patch('sys.argv', ['main.py', '--files', *files, '--report', 'performance', '--format', 'tsv']):
+            assert main() == 0
+        
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == 'position\tperformance'
+        assert lines[1] == 'Backend Developer\t4.83'
+
+
+class TestOutputFormats:
+    """Тесты машиночитаемых форматов вывода."""
+    
+    FILES = [
+        os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees1.csv'),
+        os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees2.csv'),
+    ]
+    
+    def test_jsonl_multiple_reports(self, capsys):
+        """Тест JSON Lines с пометкой отчета в каждой строке."""
+        with patch('sys.argv', ['main.py', '--files', *self.FILES, '--report', 'performance', 'team',
+                                '--format', 'jsonl']):
+            assert main() == 0
+        
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert rows[0] == {'report': 'performance', 'position': 'Backend Developer', 'performance': 4.83}
+        assert {row['report'] for row in rows} == {'performance', 'team'}
+    
+    def test_csv_to_file(self):
+        """Тест записи CSV в файл через --output."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, 'report.csv')
+            with patch('sys.argv', ['main.py', '--files', *self.FILES, '--report', 'performance',
+                                    '--format', 'csv', '--output', output]):
+                assert main() == 0
+            
+            with open(output, encoding='utf-8') as file:
+                rows = list(csv.DictReader(file))
+        
+        assert rows[0] == {'position': 'Backend Developer', 'performance': '4.83'}
+    
+    def test_binary_to_file(self):
+        """Тест бинарного вывода в файл и его чтения."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = os.path.join(temp_dir, 'report.bin')
+            with patch('sys.argv', ['main.py', '--files', *self.FILES, '--report', 'performance',
+                                    '--format', 'binary', '--output', output]):
+                assert main() == 0
+            
+            with open(output, 'rb') as file:
+                batches = list(iter_binary_stream(file))
+        
+        assert batches[0][0] is None
+        assert batches[0][1][0] == {'position': 'Backend Developer', 'performance': 4.83}
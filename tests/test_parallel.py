@@ -0,0 +1,77 @@
+import os
+
+import pytest
+from benchmarks.datagen import generate_dataset
+from parallel import aggregate_files, plan_tasks
+from reports import ReportGenerator, PERFORMANCE_REPORT, GroupReport, MultiReport, generate_reports
+from file_reader import iter_csv_files, read_csv_files
+
+
+DATA_FILES = [
+    os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees1.csv'),
+    os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees2.csv'),
+]
+
+
+class TestAggregateFiles:
+    """Тесты для параллельного разбора файлов."""
+    
+    def test_sequential_matches_streaming_report(self):
+        """Тест что объединение частичных агрегатов дает исходный отчет."""
+        state = aggregate_files(PERFORMANCE_REPORT, DATA_FILES, jobs=1)
+        
+        assert PERFORMANCE_REPORT.finalize(state) == \
+            ReportGenerator.performance_report(read_csv_files(DATA_FILES))
+    
+    def test_process_pool_matches_sequential(self):
+        """Тест что пул процессов дает тот же результат, что и один процесс."""
+        report = GroupReport(group_by='team', value='completed_tasks', metric='sum')
+        
+        sequential = report.finalize(aggregate_files(report, DATA_FILES, jobs=1))
+        parallel = report.finalize(aggregate_files(report, DATA_FILES, jobs=2))
+        
+        assert parallel == sequential
+    
+    def test_columnar_workers(self):
+        """Тест разбора файлов в колоночное представление в рабочих процессах."""
+        state = aggregate_files(PERFORMANCE_REPORT, DATA_FILES, jobs=2, columnar=True)
+        
+        assert PERFORMANCE_REPORT.finalize(state) == \
+            ReportGenerator.performance_report(read_csv_files(DATA_FILES))
+    
+    def test_averages_match_sequential_on_generated_data(self, tmp_path):
+        """Тест что средние по многим строкам совпадают с последовательным проходом до последнего знака."""
+        files = generate_dataset(str(tmp_path), rows=30000, files=3, seed=7)
+        report = MultiReport(['performance', 'employee_performance'])
+        
+        sequential = report.finalize(report.feed(report.create(), iter_csv_files(files)))
+        parallel = report.finalize(aggregate_files(report, files, jobs=3, chunk_bytes=64 * 1024))
+        
+        assert parallel == sequential
+    
+    def test_missing_file_error(self):
+        """Тест что ошибка рабочего процесса доходит до вызывающего кода."""
+        with pytest.raises(FileNotFoundError) as exc_info:
+            aggregate_files(PERFORMANCE_REPORT, [DATA_FILES[0], 'nonexistent_file.csv'], jobs=2)
+        
+        assert 'nonexistent_file.csv' in str(exc_info.value)
+
+    def test_large_file_split_into_chunks(self):
+        """Тест что большой файл делится на фрагменты с тем же результатом."""
+        tasks = plan_tasks(DATA_FILES, chunk_bytes=128)
+        
+        sequential = aggregate_files(PERFORMANCE_REPORT, DATA_FILES, jobs=1, chunk_bytes=128)
+        parallel = aggregate_files(PERFORMANCE_REPORT, DATA_FILES, jobs=2, chunk_bytes=128, columnar=True)
+        
+        assert len(tasks) > len(DATA_FILES)
+        assert PERFORMANCE_REPORT.finalize(parallel) == PERFORMANCE_REPORT.finalize(sequential)
+        assert PERFORMANCE_REPORT.finalize(sequential) == \
+            ReportGenerator.performance_report(read_csv_files(DATA_FILES))
+
+    def test_multiple_reports_in_workers(self):
+        """Тест нескольких отчетов за один проход в рабочих процессах."""
+        report = MultiReport(['performance', 'team', 'experience'])
+        
+        state = aggregate_files(report, DATA_FILES, jobs=2, columnar=True)
+        
+        assert report.finalize(state) == generate_reports(report.report_names, read_csv_files(DATA_FILES))
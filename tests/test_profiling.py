@@ -0,0 +1,104 @@
+import os
+
+from columnar import convert_files
+from file_reader import iter_csv_files
+from parallel import aggregate_files
+from profiling import PipelineProfiler, ReadTimings, register_stats_hook, unregister_stats_hook
+from reports import PERFORMANCE_REPORT
+
+
+DATA_FILES = [
+    os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees1.csv'),
+    os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees2.csv'),
+]
+
+
+class TestPipelineProfiler:
+    """Тесты для поэтапного профилирования."""
+    
+    def test_stage_stats(self):
+        """Тест замера внешнего этапа."""
+        profiler = PipelineProfiler()
+        
+        with profiler.stage('report'):
+            sum(range(10000))
+        
+        stats = profiler.stats()
+        assert [item['stage'] for item in stats] == ['report']
+        assert stats[0]['wall_s'] >= 0
+        assert set(stats[0]) == {'stage', 'wall_s', 'cpu_s', 'rows', 'rows_per_s', 'cumulative_peak_rss_bytes'}
+    
+    def test_cumulative_peak_rss(self):
+        """Тест что пиковая память - накопленный с начала работы максимум только для внешних этапов."""
+        profiler = PipelineProfiler()
+        
+        with profiler.stage('report'):
+            list(iter_csv_files(DATA_FILES, timings=profiler.timings))
+        with profiler.stage('format'):
+            pass
+        
+        stats = {item['stage']: item['cumulative_peak_rss_bytes'] for item in profiler.stats()}
+        assert stats['parse'] is None and stats['convert'] is None
+        assert stats['format'] >= stats['report'] > 0
+    
+    def test_read_timings_split_parse_and_convert(self):
+        """Тест разделения времени чтения строк на разбор и конвертацию."""
+        profiler = PipelineProfiler()
+        
+        with profiler.stage('report'):
+            rows = list(iter_csv_files(DATA_FILES, timings=profiler.timings))
+        
+        stats = {item['stage']: item for item in profiler.stats()}
+        assert len(rows) == 15
+        assert [item['stage'] for item in profiler.stats()] == ['parse', 'convert', 'report']
+        assert stats['parse']['rows'] == 15
+        assert stats['convert']['rows'] == 15
+    
+    def test_worker_timings(self):
+        """Тест замеров рабочих процессов: строки учитываются, время этапа не уменьшается."""
+        profiler = PipelineProfiler()
+        
+        with profiler.stage('report'):
+            state = aggregate_files(PERFORMANCE_REPORT, DATA_FILES, jobs=2, timings=profiler.timings)
+        
+        stats = {item['stage']: item for item in profiler.stats()}
+        assert PERFORMANCE_REPORT.finalize(state)
+        assert stats['parse']['rows'] == 15
+        assert stats['convert']['rows'] == 15
+        assert stats['report']['wall_s'] > 0
+    
+    def test_columnar_input_is_loaded(self, tmp_path):
+        """Тест что строки бинарного колоночного файла учитываются в этапе load."""
+        path = str(tmp_path / 'data.ecol')
+        convert_files(DATA_FILES, path)
+        timings = ReadTimings()
+        
+        aggregate_files(PERFORMANCE_REPORT, [path], timings=timings)
+        
+        assert timings.stages['load'][2] == 15
+        assert 'parse' not in timings.stages
+    
+    def test_disabled_profiler(self):
+        """Тест что выключенный профилировщик не собирает статистику."""
+        profiler = PipelineProfiler(enabled=False)
+        
+        with profiler.stage('report'):
+            pass
+        
+        assert profiler.timings is None
+        assert profiler.stats() == []
+    
+    def test_stats_hook(self):
+        """Тест передачи статистики зарегистрированному обработчику."""
+        received = []
+        register_stats_hook(received.append)
+        try:
+            profiler = PipelineProfiler()
+            with profiler.stage('format'):
+                pass
+            profiler.publish()
+        finally:
+            unregister_stats_hook(received.append)
+        
+        assert len(received) == 1
+        assert received[0][0]['stage'] == 'format'
@@ -0,0 +1,163 @@
+import os
+import random
+from unittest.mock import patch
+
+import pytest
+import reports
+from columnar import ColumnarTable
+from file_reader import read_csv_files
+from incremental import IncrementalReport
+from main import main
+from parallel import aggregate_files
+from ranking import RankedGroups, TopReport, TOP_PERFORMERS_BY_TEAM_REPORT
+from reports import generate_report
+
+
+DATA_FILES = [
+    os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees1.csv'),
+    os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees2.csv'),
+]
+
+
+def _random_rows(count, seed=1):
+    generator = random.Random(seed)
+    return [
+        {
+            'name': f'employee{i}',
+            'team': generator.choice(['API', 'Web', 'Mobile']),
+            'performance': round(generator.uniform(3, 5), 1),
+            'completed_tasks': generator.randint(0, 50),
+        }
+        for i in range(count)
+    ]
+
+
+def _sorted_top(rows, value, n, largest=True):
+    # Эталон: полная сортировка, при равенстве - порядок данных
+    ordered = sorted(rows, key=lambda row: row[value], reverse=largest)
+    return [(row['name'], row[value]) for row in ordered[:n]]
+
+
+class TestRankedGroups:
+    """Тесты для отбора лучших строк на ограниченных кучах."""
+
+    @pytest.mark.parametrize('largest', [True, False])
+    def test_matches_full_sort(self, largest):
+        """Тест что куча дает тот же рейтинг, что и полная сортировка (с равенствами)."""
+        rows = _random_rows(2000)
+        state = RankedGroups(None, 'performance', n=25, largest=largest).update(rows)
+
+        assert state.ranked(None) == _sorted_top(rows, 'performance', 25, largest)
+
+    def test_memory_is_bounded(self):
+        """Тест что в каждой группе хранится не больше n строк."""
+        state = RankedGroups('team', 'completed_tasks', n=5).update(_random_rows(5000))
+
+        assert state.groups() == ['API', 'Mobile', 'Web']
+        assert all(len(heap) == 5 for heap in state.heaps.values())
+
+    def test_merge_matches_sequential(self):
+        """Тест что слияние частичных состояний по порядку данных дает последовательный результат."""
+        rows = _random_rows(3000)
+        sequential = RankedGroups('team', 'performance', n=10).update(rows)
+        merged = RankedGroups('team', 'performance', n=10)
+        for start in range(0, len(rows), 700):
+            merged.merge(RankedGroups('team', 'performance', n=10).update(rows[start:start + 700]))
+
+        for team in sequential.groups():
+            assert merged.ranked(team) == sequential.ranked(team)
+        assert merged.rows == len(rows)
+
+
+class TestTopReport:
+    """Тесты рейтинговых отчетов."""
+
+    def test_top_performers(self):
+        """Тест общего рейтинга по эффективности."""
+        result = generate_report('top_performers', read_csv_files(DATA_FILES))
+
+        assert result[0] == {'rank': 1, 'name': 'Tom Anderson', 'performance': 4.9}
+        assert [row['rank'] for row in result] == list(range(1, 11))
+        assert [row['performance'] for row in result] == sorted((row['performance'] for row in result), reverse=True)
+
+    def test_per_group(self):
+        """Тест рейтинга по командам."""
+        rows = _random_rows(500)
+        result = TopReport('completed_tasks', group_by='team', top=3)(rows)
+
+        assert [row['team'] for row in result] == ['API'] * 3 + ['Mobile'] * 3 + ['Web'] * 3
+        web = [row for row in rows if row['team'] == 'Web']
+        assert [(row['name'], row['completed_tasks']) for row in result[6:]] == \
+            _sorted_top(web, 'completed_tasks', 3)
+
+    def test_columns(self):
+        """Тест что отчету нужны только имя, поле рейтинга и поля группировки."""
+        assert TOP_PERFORMERS_BY_TEAM_REPORT.columns == {'name', 'performance', 'team'}
+
+    def test_parallel_matches_streaming(self):
+        """Тест что пул процессов и фрагменты файлов дают тот же рейтинг."""
+        report = TopReport('performance', top=4)
+        state = aggregate_files(report, DATA_FILES, jobs=2, chunk_bytes=64)
+
+        assert report.finalize(state) == report(read_csv_files(DATA_FILES))
+
+    def test_columnar(self):
+        """Тест рейтинга по колоночной таблице."""
+        table = ColumnarTable.from_rows(read_csv_files(DATA_FILES))
+
+        assert TOP_PERFORMERS_BY_TEAM_REPORT(table) == TOP_PERFORMERS_BY_TEAM_REPORT(read_csv_files(DATA_FILES))
+
+
+class TestTopOption:
+    """Тесты параметра --top."""
+
+    def test_top_option(self, capsys):
+        """Тест что --top ограничивает размер рейтинга."""
+        with patch('sys.argv', ['main.py', '--files', *DATA_FILES, '--report', 'top_performers',
+                                '--top', '3', '--format', 'tsv']):
+            assert main() == 0
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == 'rank\tname\tperformance'
+        assert len(lines) == 4
+
+    def test_top_with_jobs(self, capsys):
+        """Тест --top в параллельном режиме."""
+        with patch('sys.argv', ['main.py', '--files', *DATA_FILES, '--report', 'top_performers_by_team',
+                                '--top', '1', '--jobs', '2', '--format', 'tsv']):
+            assert main() == 0
+
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 1 + len({row['team'] for row in read_csv_files(DATA_FILES)})
+
+    def test_incremental_state_depends_on_top(self, tmp_path):
+        """Тест что состояние, накопленное для меньшего --top, не используется для большего."""
+        state_path = str(tmp_path / 'state.pkl')
+        first = IncrementalReport(state_path, 'top_performers')
+        first.refresh(DATA_FILES)
+
+        refresh = IncrementalReport(state_path, 'top_performers', report=TopReport('performance', top=12))
+        result = refresh.refresh(DATA_FILES)
+
+        assert len(result) == 12
+        assert refresh.rows_read == first.rows_read
+
+    def test_top_does_not_leak_into_next_run(self, capsys):
+        """Тест что --top действует только на свой запуск и не меняет реестр отчетов."""
+        registered = reports.get_report('top_performers')
+        with patch('sys.argv', ['main.py', '--files', *DATA_FILES, '--report', 'top_performers',
+                                '--top', '3', '--format', 'tsv']):
+            assert main() == 0
+        capsys.readouterr()
+
+        with patch('sys.argv', ['main.py', '--files', *DATA_FILES, '--report', 'top_performers', '--format', 'tsv']):
+            assert main() == 0
+
+        assert reports.get_report('top_performers') is registered
+        assert len(capsys.readouterr().out.splitlines()) == 1 + min(registered.top, len(read_csv_files(DATA_FILES)))
+
+    def test_invalid_top(self):
+        """Тест проверки значения --top."""
+        with patch('sys.argv', ['main.py', '--files', *DATA_FILES, '--report', 'top_performers', '--top', '0']):
+            with pytest.raises(SystemExit):
+                main()
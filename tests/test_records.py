@@ -0,0 +1,164 @@
+import csv
+import os
+import pickle
+import random
+import tracemalloc
+
+import pytest
+from file_reader import iter_csv_files, read_csv_files
+from filters import parse_predicates
+from records import EMPLOYEE_FIELDS, Employee, Record, record_type
+from reports import generate_reports
+from validation import Quarantine
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+DATA_FILES = [os.path.join(DATA_DIR, 'employees1.csv'), os.path.join(DATA_DIR, 'employees2.csv')]
+
+POSITIONS = ['Backend Developer', 'Frontend Developer', 'Data Scientist', 'QA Engineer']
+TEAMS = ['API Team', 'Web Team', 'AI Team']
+SKILLS = ['Python, Django, PostgreSQL', 'React, TypeScript, Redux', 'Python, ML, Pandas', 'Selenium, Pytest']
+
+
+@pytest.fixture
+def large_file(tmp_path):
+    """Файл, в котором должности, команды и навыки повторяются, а имена уникальны."""
+    path = tmp_path / 'employees.csv'
+    rng = random.Random(42)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(EMPLOYEE_FIELDS)
+        for i in range(20000):
+            writer.writerow([f'Employee {i}', rng.choice(POSITIONS), rng.randint(1, 60),
+                             round(rng.uniform(3.0, 5.0), 1), rng.choice(SKILLS), rng.choice(TEAMS),
+                             rng.randint(0, 15)])
+    return str(path)
+
+
+def _retained_bytes(read):
+    """Память, занятая результатом read() (без временных объектов чтения)."""
+    tracemalloc.start()
+    try:
+        rows = read()
+        return tracemalloc.get_traced_memory()[0], rows
+    finally:
+        tracemalloc.stop()
+
+
+class TestRecord:
+    """Тесты для компактных записей."""
+
+    def test_mapping_interface(self):
+        """Тест что запись ведет себя как словарь строки."""
+        row = Employee('Alex', 'QA', 10, 4.5, 'Python', 'API Team', 2)
+
+        assert row['performance'] == 4.5
+        assert row.performance == 4.5
+        assert row.get('missing', 0) == 0
+        assert 'team' in row and 'missing' not in row
+        assert list(row) == list(EMPLOYEE_FIELDS)
+        assert dict(row)['name'] == 'Alex'
+        assert row == {'name': 'Alex', 'position': 'QA', 'completed_tasks': 10, 'performance': 4.5,
+                       'skills': 'Python', 'team': 'API Team', 'experience_years': 2}
+        with pytest.raises(KeyError):
+            row['missing']
+
+    def test_no_instance_dict(self):
+        """Тест что у записи нет собственного словаря атрибутов."""
+        row = Employee('Alex', 'QA', 10, 4.5, 'Python', 'API Team', 2)
+
+        assert not hasattr(row, '__dict__')
+        with pytest.raises(TypeError, match="Ожидалось значений: 7"):
+            Employee('Alex')
+
+    def test_record_type_is_cached(self):
+        """Тест что класс для набора полей создается один раз."""
+        assert record_type(EMPLOYEE_FIELDS) is Employee
+        assert record_type(('team', 'performance')) is record_type(['team', 'performance'])
+        assert issubclass(record_type(('team',)), Record)
+
+    def test_fields_that_are_not_identifiers(self):
+        """Тест полей, имена которых нельзя использовать как атрибуты."""
+        row = record_type(('experience years', 'keys', 'class'))(1, 2, 3)
+
+        assert dict(row) == {'experience years': 1, 'keys': 2, 'class': 3}
+
+    def test_pickle(self):
+        """Тест сериализации (для передачи между процессами)."""
+        row = record_type(('team', 'performance'))('API Team', 4.5)
+
+        restored = pickle.loads(pickle.dumps(row))
+
+        assert type(restored) is type(row)
+        assert restored == row
+
+
+class TestCompactReading:
+    """Тесты для чтения строк компактными записями."""
+
+    def test_same_rows_as_dicts(self):
+        """Тест что записи совпадают со строками-словарями."""
+        rows = read_csv_files(DATA_FILES, compact=True)
+
+        assert all(type(row) is Employee for row in rows)
+        assert rows == read_csv_files(DATA_FILES)
+
+    def test_categorical_values_are_shared(self):
+        """Тест что одинаковые значения категориальных и числовых колонок хранятся одним объектом."""
+        rows = read_csv_files([DATA_FILES[0], DATA_FILES[0]], compact=True)
+        first, second = rows[0], rows[len(rows) // 2]
+
+        assert first['team'] is second['team']
+        assert first['skills'] is second['skills']
+        # Числа объединяются в пределах пачки строк одного файла
+        by_value = {}
+        for row in rows[:len(rows) // 2]:
+            assert by_value.setdefault(row['performance'], row['performance']) is row['performance']
+
+    def test_projection_and_filters(self):
+        """Тест записей с частью колонок и условиями."""
+        where = parse_predicates(["team == 'API Team'"])
+        rows = list(iter_csv_files(DATA_FILES, columns={'position', 'performance'}, where=where, compact=True))
+
+        assert rows == list(iter_csv_files(DATA_FILES, columns={'position', 'performance'}, where=where))
+        assert list(rows[0]) == ['position', 'performance']
+
+    def test_quarantined_batch(self, tmp_path):
+        """Тест пачки с некорректной строкой."""
+        path = tmp_path / 'bad.csv'
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(EMPLOYEE_FIELDS)
+            writer.writerow(['Alex', 'QA', '10', '4.5', 'Python', 'API Team', '2'])
+            writer.writerow(['Bad', 'QA', 'ten', '4.5', 'Python', 'API Team', '2'])
+            writer.writerow(['John', 'QA', '7', '4.3', 'Go', 'API Team', '3'])
+
+        rows = read_csv_files([str(path)], quarantine=Quarantine(), compact=True)
+
+        assert [row['name'] for row in rows] == ['Alex', 'John']
+        assert all(type(row) is Employee for row in rows)
+
+    def test_all_reports_accept_records(self):
+        """Тест что все отчеты дают одинаковый результат по записям и по словарям."""
+        expected = generate_reports(['all'], read_csv_files(DATA_FILES))
+
+        assert generate_reports(['all'], read_csv_files(DATA_FILES, compact=True)) == expected
+
+
+class TestCompactMemory:
+    """Регрессионные тесты потребления памяти."""
+
+    def test_rows_take_three_times_less_memory(self, large_file):
+        """Тест что строка-запись занимает как минимум в 3 раза меньше памяти, чем словарь."""
+        dict_bytes, dict_rows = _retained_bytes(lambda: read_csv_files([large_file]))
+        del dict_rows
+        compact_bytes, compact_rows = _retained_bytes(lambda: read_csv_files([large_file], compact=True))
+
+        assert len(compact_rows) == 20000
+        assert dict_bytes / compact_bytes >= 3
+
+    def test_record_is_smaller_than_dict(self):
+        """Тест размера самого объекта строки."""
+        values = ('Alex', 'QA', 10, 4.5, 'Python', 'API Team', 2)
+
+        assert Employee(*values).__sizeof__() * 3 < dict(zip(EMPLOYEE_FIELDS, values)).__sizeof__()
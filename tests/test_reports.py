@@ -1,5 +1,8 @@
 import pytest
-from reports import ReportGenerator, get_available_reports, generate_report
+from reports import (
+    ReportGenerator, GroupReport, MultiReport, get_available_reports, generate_report,
+    generate_reports, expand_report_names, register_report, get_report, REPORT_REGISTRY,
+)
 
 
 class TestReportGenerator:
@@ -72,6 +75,20 @@ class TestReportGenerator:
         result = ReportGenerator.performance_report([])
         assert result == []
     
+    def test_performance_report_accepts_iterator(self):
+        """Тест отчета по потоку строк (генератору)."""
+        data = (
+            {'position': position, 'performance': performance}
+            for position, performance in [('Developer', 4.5), ('QA', 4.1), ('Developer', 4.7)]
+        )
+        
+        result = ReportGenerator.performance_report(data)
+        
+        assert result == [
+            {'position': 'Developer', 'performance': 4.6},
+            {'position': 'QA', 'performance': 4.1}
+        ]
+    
     def test_performance_report_full_employee_data(self):
         """Тест отчета с полными данными сотрудников."""
         data = [
@@ -113,6 +130,39 @@ class TestReportGenerator:
         assert result[1]['performance'] == 4.3
 
 
+class TestGroupReport:
+    """Тесты для отчетов вида «группировка + агрегат»."""
+    
+    def test_custom_metric_and_ordering(self):
+        """Тест отчета с метрикой max и сортировкой по возрастанию."""
+        report = GroupReport(group_by='team', value='completed_tasks', metric='max', descending=False)
+        data = [
+            {'team': 'A', 'completed_tasks': 10},
+            {'team': 'B', 'completed_tasks': 5},
+            {'team': 'A', 'completed_tasks': 30},
+        ]
+        
+        assert report(data) == [
+            {'team': 'B', 'completed_tasks': 5},
+            {'team': 'A', 'completed_tasks': 30}
+        ]
+    
+    def test_merge_partial_states(self):
+        """Тест что объединенные состояния дают тот же отчет."""
+        report = GroupReport(group_by='position', value='performance')
+        data = [
+            {'position': 'Developer', 'performance': 4.5},
+            {'position': 'QA', 'performance': 4.3},
+            {'position': 'Developer', 'performance': 4.7},
+        ]
+        
+        state = report.create()
+        state.merge(report.create().update(data[:1]))
+        state.merge(report.create().update(data[1:]))
+        
+        assert report.finalize(state) == report(data)
+
+
 class TestGetAvailableReports:
     """Тесты для функции get_available_reports."""
     
@@ -132,6 +182,29 @@ class TestGetAvailableReports:
         assert len(result) > 0
 
 
+class TestRegisterReport:
+    """Тесты для регистрации отчетов."""
+    
+    def test_lazy_registration(self, monkeypatch):
+        """Тест что отчет по ссылке 'модуль:атрибут' загружается при первом запросе."""
+        monkeypatch.setitem(REPORT_REGISTRY, 'lazy_team', 'reports:TEAM_REPORT')
+        
+        report = get_report('lazy_team')
+        
+        assert report.group_by == 'team'
+        assert REPORT_REGISTRY['lazy_team'] is report
+    
+    def test_register_report(self, monkeypatch):
+        """Тест регистрации нового отчета."""
+        monkeypatch.setattr('reports.REPORT_REGISTRY', dict(REPORT_REGISTRY))
+        register_report('by_team', GroupReport('team', 'completed_tasks', metric='sum'))
+        
+        assert 'by_team' in get_available_reports()
+        assert generate_report('by_team', [{'team': 'A', 'completed_tasks': 3}]) == [
+            {'team': 'A', 'completed_tasks': 3}
+        ]
+
+
 class TestGenerateReport:
     """Тесты для функции generate_report."""
     
@@ -204,3 +277,64 @@ class TestGenerateReport:
         assert result[1]['position'] == 'Frontend Developer'
         assert result[1]['performance'] == 4.7
 
+
+
+class TestGenerateReports:
+    """Тесты для генерации нескольких отчетов за один проход."""
+    
+    DATA = [
+        {'name': 'Alex', 'position': 'Developer', 'team': 'API Team', 'experience_years': 3,
+         'performance': 4.5, 'skills': 'Python, Docker', 'completed_tasks': 30},
+        {'name': 'Maria', 'position': 'QA', 'team': 'API Team', 'experience_years': 2,
+         'performance': 4.1, 'skills': 'Python', 'completed_tasks': 25},
+        {'name': 'John', 'position': 'Developer', 'team': 'Web Team', 'experience_years': 3,
+         'performance': 4.7, 'skills': 'React', 'completed_tasks': 41},
+    ]
+    
+    def test_single_pass_over_iterator(self):
+        """Тест что все отчеты строятся по одному проходу генератора."""
+        consumed = []
+        
+        def rows():
+            for row in self.DATA:
+                consumed.append(row)
+                yield row
+        
+        result = generate_reports(['performance', 'team'], rows())
+        
+        assert len(consumed) == len(self.DATA)
+        assert result['performance'] == generate_report('performance', self.DATA)
+        assert result['team'] == [
+            {'team': 'Web Team', 'performance': 4.7},
+            {'team': 'API Team', 'performance': 4.3}
+        ]
+    
+    def test_all_reports(self):
+        """Тест псевдонима all."""
+        result = generate_reports(['all'], self.DATA)
+        
+        assert list(result) == get_available_reports()
+        assert result['experience'][0] == {'experience_years': 3, 'performance': 4.6}
+        assert result['skills'][-1] == {'skill': 'Python', 'performance': 4.3, 'employees': 2}
+    
+    def test_expand_report_names(self):
+        """Тест раскрытия all и удаления повторов."""
+        assert expand_report_names(['team', 'all', 'team']) == ['team'] + [
+            name for name in get_available_reports() if name != 'team'
+        ]
+    
+    def test_merge_multi_states(self):
+        """Тест объединения частичных состояний нескольких отчетов."""
+        report = MultiReport(['performance', 'team'])
+        state = report.create()
+        state.merge(report.create().update(self.DATA[:1]))
+        state.merge(report.create().update(self.DATA[1:]))
+        
+        assert report.finalize(state) == report(self.DATA)
+    
+    def test_unknown_report_in_list(self):
+        """Тест ошибки для неизвестного отчета в списке."""
+        with pytest.raises(ValueError) as exc_info:
+            generate_reports(['performance', 'invalid_report'], self.DATA)
+        
+        assert 'invalid_report' in str(exc_info.value)
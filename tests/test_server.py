@@ -0,0 +1,241 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+
+import server as server_module
+from file_reader import read_csv_files
+from server import ReportServer, ResultCache, WarmDataset
+from skills import SKILLS_REPORT, SkillIndex
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+
+
+async def _get(server, target):
+    """Отправляет GET-запрос и возвращает код ответа и разобранный JSON."""
+    host, port = server.addresses[0][:2]
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f'GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode('latin-1'))
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, body = response.split(b'\r\n\r\n', 1)
+    return int(head.split(b' ')[1]), json.loads(body)
+
+
+class TestResultCache:
+    """Тесты для кэша результатов отчетов."""
+    
+    def test_lru_eviction(self):
+        """Тест вытеснения давно не использованных результатов."""
+        cache = ResultCache(max_entries=2)
+        cache.put('a', b'1')
+        cache.put('b', b'2')
+        cache.get('a')
+        cache.put('c', b'3')
+        
+        assert cache.get('b') is None
+        assert cache.get('a') == b'1'
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (2, 1)
+
+
+class TestWarmDataset:
+    """Тесты для данных в памяти."""
+    
+    def test_reload_only_on_change(self):
+        """Тест что файлы перечитываются только после изменения."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = shutil.copy(os.path.join(DATA_DIR, 'employees1.csv'), temp_dir)
+            dataset = WarmDataset([path])
+            
+            assert dataset.reload()
+            assert not dataset.reload()
+            assert dataset.version == 1
+            
+            with open(path, 'a', encoding='utf-8') as file:
+                file.write('\nNew Person,QA Engineer,10,4.0,Python,QA Team,1\n')
+            
+            assert dataset.is_stale()
+            assert dataset.reload()
+            assert dataset.version == 2
+            assert dataset.rows[-1]['name'] == 'New Person'
+
+
+class TestReportServer:
+    """Тесты для сервера отчетов."""
+    
+    FILES = [os.path.join(DATA_DIR, 'employees1.csv'), os.path.join(DATA_DIR, 'employees2.csv')]
+    
+    def test_report_is_cached(self):
+        """Тест что повторный запрос отдается из кэша без пересчета."""
+        async def scenario():
+            server = ReportServer(self.FILES)
+            await server.start(port=0)
+            try:
+                with patch('server.generate_report', wraps=server_module.generate_report) as mock_generate:
+                    first = await _get(server, '/report?name=performance')
+                    second = await _get(server, '/report?name=performance')
+                return first, second, mock_generate.call_count
+            finally:
+                await server.close()
+        
+        first, second, calls = asyncio.run(scenario())
+        
+        assert first == second
+        assert first[0] == 200
+        assert first[1]['results'][0] == {'position': 'Backend Developer', 'performance': 4.83}
+        assert calls == 1
+    
+    def test_multiple_reports_and_where(self):
+        """Тест нескольких отчетов и фильтрации."""
+        async def scenario():
+            server = ReportServer(self.FILES)
+            await server.start(port=0)
+            try:
+                return await _get(server, "/report?name=performance&name=team&where=team%20%3D%3D%20'API%20Team'")
+            finally:
+                await server.close()
+        
+        status, body = asyncio.run(scenario())
+        
+        assert status == 200
+        assert body['results']['team'] == [{'team': 'API Team', 'performance': 4.83}]
+    
+    def test_skill_reports_use_dataset_index(self):
+        """Тест что отчеты по навыкам берут индекс, построенный при загрузке данных."""
+        async def scenario():
+            server = ReportServer(self.FILES)
+            await server.start(port=0)
+            try:
+                with patch.object(SkillIndex, '_append', side_effect=AssertionError('индекс строится заново')):
+                    both = await _get(server, '/report?name=skills&name=skill_leaders')
+                    python = await _get(server, '/report?name=skill_leaders&skill=Python')
+                filtered = await _get(server, "/report?name=skills&where=team%20%3D%3D%20'API%20Team'")
+                return both, python, filtered
+            finally:
+                await server.close()
+        
+        both, python, filtered = asyncio.run(scenario())
+        rows = read_csv_files(self.FILES)
+        
+        assert both[0] == 200
+        assert both[1]['results']['skills'] == SKILLS_REPORT(rows)
+        assert python[0] == 200
+        assert python[1]['results'] and all(row['skill'] == 'Python' for row in python[1]['results'])
+        assert filtered[1]['results'] == SKILLS_REPORT([row for row in rows if row['team'] == 'API Team'])
+    
+    def test_errors(self):
+        """Тест ответов на некорректные запросы."""
+        async def scenario():
+            server = ReportServer(self.FILES)
+            await server.start(port=0)
+            try:
+                return [
+                    await _get(server, '/report?name=invalid'),
+                    await _get(server, '/report'),
+                    await _get(server, '/unknown'),
+                ]
+            finally:
+                await server.close()
+        
+        responses = asyncio.run(scenario())
+        
+        assert [status for status, _ in responses] == [400, 400, 404]
+        assert 'invalid' in responses[0][1]['error']
+    
+    def test_where_on_unknown_column(self):
+        """Тест условия по колонке, которой нет в данных."""
+        async def scenario():
+            server = ReportServer(self.FILES)
+            await server.start(port=0)
+            try:
+                return await _get(server, '/report?name=performance&where=salary%3E3')
+            finally:
+                await server.close()
+        
+        status, body = asyncio.run(scenario())
+        
+        assert status == 400
+        assert "'salary'" in body['error']
+    
+    def test_internal_error_is_reported(self, capsys):
+        """Тест что любая ошибка расчета возвращается клиенту как JSON с кодом 500."""
+        async def scenario():
+            server = ReportServer(self.FILES)
+            await server.start(port=0)
+            try:
+                with patch('server.generate_report', side_effect=KeyError('salary')):
+                    failed = await _get(server, '/report?name=performance')
+                return failed, await _get(server, '/health')
+            finally:
+                await server.close()
+        
+        failed, health = asyncio.run(scenario())
+        
+        assert failed[0] == 500
+        assert 'salary' in failed[1]['error']
+        assert health[0] == 200
+        assert 'salary' in capsys.readouterr().err
+    
+    def test_report_does_not_block_other_requests(self):
+        """Тест что /health отвечает, пока отчет еще считается."""
+        release = threading.Event()
+        generate_report = server_module.generate_report
+        
+        def slow_report(*args):
+            release.wait(10)
+            return generate_report(*args)
+        
+        async def scenario():
+            server = ReportServer(self.FILES)
+            await server.start(port=0)
+            try:
+                with patch('server.generate_report', side_effect=slow_report):
+                    report = asyncio.ensure_future(_get(server, '/report?name=performance'))
+                    health = await asyncio.wait_for(_get(server, '/health'), 5)
+                    finished_before_release = report.done()
+                    release.set()
+                    return health, finished_before_release, await report
+            finally:
+                release.set()
+                await server.close()
+        
+        health, finished_before_release, report = asyncio.run(scenario())
+        
+        assert health[0] == 200
+        assert not finished_before_release
+        assert report[0] == 200
+    
+    def test_reload_on_file_change(self):
+        """Тест что после изменения файла отдаются новые данные."""
+        async def scenario(path):
+            server = ReportServer([path], poll_interval=0.01)
+            await server.start(port=0)
+            try:
+                before = await _get(server, '/report?name=performance')
+                rows_before = len(server.dataset.rows)
+                with open(path, 'a', encoding='utf-8') as file:
+                    file.write('\nNew Person,Tester,10,5.0,Python,QA Team,1\n')
+                for _ in range(200):
+                    await asyncio.sleep(0.01)
+                    if server.dataset.version > 1:
+                        break
+                after = await _get(server, '/report?name=performance')
+                health = await _get(server, '/health')
+                return before, after, health, rows_before
+            finally:
+                await server.close()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = shutil.copy(self.FILES[0], temp_dir)
+            before, after, health, rows_before = asyncio.run(scenario(path))
+        
+        assert before[1]['version'] == 1
+        assert after[1]['version'] == 2
+        assert {'position': 'Tester', 'performance': 5.0} in after[1]['results']
+        assert health[1]['rows'] == rows_before + 1
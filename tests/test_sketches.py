@@ -0,0 +1,184 @@
+import os
+import pickle
+import random
+
+import pytest
+from file_reader import read_csv_files
+from parallel import aggregate_files
+from reports import MultiReport, generate_report
+from sketches import (
+    CountMinSketch, HyperLogLog, QuantileSketch, QuantileReport,
+    DISTINCT_EMPLOYEES_REPORT, PERFORMANCE_QUANTILES_REPORT, SKILL_HEAVY_HITTERS_REPORT,
+)
+
+
+DATA_FILES = [
+    os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees1.csv'),
+    os.path.join(os.path.dirname(__file__), '..', 'employees_data', 'employees2.csv'),
+]
+
+
+class TestQuantileSketch:
+    """Тесты для квантильного скетча."""
+    
+    def test_relative_accuracy(self):
+        """Тест что квантили оцениваются с заданной относительной погрешностью."""
+        generator = random.Random(1)
+        values = [generator.uniform(-5, 100) for _ in range(10000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+        
+        ordered = sorted(values)
+        for q in (0.01, 0.25, 0.5, 0.9, 0.99):
+            exact = ordered[int(q * (len(values) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.011)
+    
+    def test_merge_matches_sequential(self):
+        """Тест что объединение частичных скетчей совпадает с одним скетчем."""
+        values = [3.0, 4.5, 0.0, 4.9, 3.7, 4.1]
+        whole, first, second = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for value in values:
+            whole.add(value)
+        for value in values[:3]:
+            first.add(value)
+        for value in values[3:]:
+            second.add(value)
+        
+        merged = first.merge(second)
+        
+        assert [merged.quantile(q) for q in (0, 0.5, 1)] == [whole.quantile(q) for q in (0, 0.5, 1)]
+        assert merged.quantile(0) == 0.0
+        assert merged.quantile(1) == 4.9
+    
+    def test_bounded_buckets(self):
+        """Тест ограничения памяти при широком диапазоне значений."""
+        sketch = QuantileSketch(max_buckets=64)
+        for exponent in range(-50, 50):
+            sketch.add(10.0 ** exponent)
+        
+        assert len(sketch.positive) <= 64
+        assert sketch.quantile(1) == pytest.approx(1e49, rel=0.01)
+    
+    def test_errors(self):
+        """Тест ошибок параметров."""
+        with pytest.raises(ValueError):
+            QuantileSketch(relative_accuracy=0)
+        with pytest.raises(ValueError):
+            QuantileSketch().quantile(1.5)
+        with pytest.raises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
+        assert QuantileSketch().quantile(0.5) is None
+
+
+class TestHyperLogLog:
+    """Тесты для HyperLogLog."""
+    
+    @pytest.mark.parametrize('distinct', [10, 1000, 50000])
+    def test_estimate_error(self, distinct):
+        """Тест погрешности оценки количества различных значений."""
+        counter = HyperLogLog()
+        for i in range(distinct):
+            counter.add(f'employee-{i}')
+            counter.add(f'employee-{i}')
+        
+        assert counter.count() == pytest.approx(distinct, rel=0.05)
+    
+    def test_merge(self):
+        """Тест объединения счетчиков с пересекающимися значениями."""
+        first, second = HyperLogLog(), HyperLogLog()
+        for i in range(3000):
+            first.add(i)
+        for i in range(2000, 5000):
+            second.add(i)
+        
+        merged = pickle.loads(pickle.dumps(first)).merge(second)
+        
+        assert merged.count() == pytest.approx(5000, rel=0.05)
+        with pytest.raises(ValueError):
+            first.merge(HyperLogLog(precision=10))
+
+
+class TestCountMinSketch:
+    """Тесты для count-min скетча."""
+    
+    def test_heavy_hitters(self):
+        """Тест поиска самых частых значений в потоке с длинным хвостом."""
+        sketch = CountMinSketch(width=512, depth=4, capacity=8)
+        for i in range(5000):
+            sketch.add(f'rare-{i}')
+            if i % 5 == 0:
+                sketch.add('Python')
+            if i % 10 == 0:
+                sketch.add('Docker')
+        
+        hitters = sketch.heavy_hitters(2)
+        
+        assert [item for item, _ in hitters] == ['Python', 'Docker']
+        assert hitters[0][1] >= 1000
+        assert sketch.estimate('Python') <= 1000 + sketch.total * 2.72 / 512
+    
+    def test_merge(self):
+        """Тест объединения скетчей."""
+        first, second = CountMinSketch(), CountMinSketch()
+        first.add('Python', 3)
+        second.add('Python', 2)
+        second.add('Go')
+        
+        merged = first.merge(second)
+        
+        assert merged.estimate('Python') == 5
+        assert merged.heavy_hitters() == [('Python', 5), ('Go', 1)]
+        with pytest.raises(ValueError):
+            first.merge(CountMinSketch(width=16))
+    
+    def test_ties_in_order_of_first_appearance(self):
+        """Тест что равные частоты упорядочены по первому появлению и после объединения частей."""
+        items = [f'skill-{i}' for i in range(50)]
+        sequential = CountMinSketch(capacity=100)
+        parts = [CountMinSketch(capacity=100) for _ in range(5)]
+        for i, item in enumerate(items * 2):
+            sequential.add(item)
+            parts[i * len(parts) // (2 * len(items))].add(item)
+        
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+        
+        assert [item for item, _ in sequential.heavy_hitters(50)] == items
+        assert merged.heavy_hitters(50) == sequential.heavy_hitters(50)
+
+
+class TestSketchReports:
+    """Тесты для приближенных отчетов."""
+    
+    def test_quantile_report_close_to_exact(self):
+        """Тест что медиана по должностям близка к точной."""
+        rows = read_csv_files(DATA_FILES)
+        result = generate_report('performance_quantiles', rows)
+        
+        by_position = {}
+        for row in rows:
+            by_position.setdefault(row['position'], []).append(row['performance'])
+        for row in result:
+            values = sorted(by_position[row['position']])
+            assert row['p50'] == pytest.approx(values[(len(values) - 1) // 2], rel=0.02)
+    
+    def test_custom_quantiles_columns(self):
+        """Тест названий колонок квантилей."""
+        report = QuantileReport(group_by='team', quantiles=(0.25, 0.999))
+        
+        assert list(report([{'team': 'A', 'performance': 4.0}])[0]) == ['team', 'p25', 'p99.9']
+    
+    def test_reports_alongside_performance(self):
+        """Тест что скетчи считаются вместе с точным отчетом в параллельном режиме."""
+        report = MultiReport(['performance', 'performance_quantiles', 'distinct_employees', 'skill_heavy_hitters'])
+        
+        state = aggregate_files(report, DATA_FILES, jobs=2, chunk_bytes=256)
+        result = report.finalize(state)
+        
+        rows = read_csv_files(DATA_FILES)
+        assert result['performance'] == generate_report('performance', rows)
+        assert result['performance_quantiles'] == PERFORMANCE_QUANTILES_REPORT(rows)
+        assert result['distinct_employees'] == DISTINCT_EMPLOYEES_REPORT(rows)
+        assert result['skill_heavy_hitters'][0] == SKILL_HEAVY_HITTERS_REPORT(rows)[0]
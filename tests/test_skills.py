@@ -0,0 +1,149 @@
+import os
+import pickle
+
+from unittest.mock import patch
+
+import pytest
+from columnar import ColumnarTable
+from file_reader import read_csv_files
+from main import main
+from parallel import aggregate_files
+from reports import MultiReport, generate_report, get_report
+from skills import SKILL_LEADERS_REPORT, SKILLS_REPORT, SkillIndex, SkillLeadersReport, split_skills
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+DATA_FILES = [os.path.join(DATA_DIR, 'employees1.csv'), os.path.join(DATA_DIR, 'employees2.csv')]
+
+ROWS = [
+    {'name': 'Alex', 'performance': 4.5, 'skills': 'Python, Docker'},
+    {'name': 'Maria', 'performance': 4.9, 'skills': 'Python, React, Python'},
+    {'name': 'John', 'performance': 4.1, 'skills': 'Docker'},
+    {'name': 'Anna', 'performance': 4.7, 'skills': 'Python, Docker'},
+]
+
+
+class TestSplitSkills:
+    """Тесты для разбора строки навыков."""
+    
+    def test_split_and_deduplicate(self):
+        """Тест разбиения, удаления пробелов и повторов."""
+        assert split_skills(' Python,Django , Python,, ') == ('Python', 'Django')
+    
+    def test_tokens_are_interned(self):
+        """Тест что одинаковые навыки - один и тот же объект строки."""
+        first = split_skills('Python, ' + 'Dja' + 'ngo')[1]
+        second = split_skills(''.join(['Django']))[0]
+        
+        assert first is second
+
+
+class TestSkillIndex:
+    """Тесты для инвертированного индекса навыков."""
+    
+    def test_postings(self):
+        """Тест номеров строк по навыку."""
+        index = SkillIndex().update(ROWS)
+        
+        assert list(index.rows_with('Python')) == [0, 1, 3]
+        assert list(index.rows_with('Docker')) == [0, 2, 3]
+        assert list(index.rows_with('Go')) == []
+        assert index.skills() == ['Python', 'Docker', 'React']
+    
+    def test_stats_and_top(self):
+        """Тест статистик и лучших сотрудников по навыку."""
+        index = SkillIndex().update(ROWS)
+        
+        assert index.stats('Docker').count == 3
+        assert index.stats('Docker').avg == pytest.approx(4.433333, rel=1e-5)
+        assert index.top_employees('Python', 2) == [
+            {'name': 'Maria', 'performance': 4.9},
+            {'name': 'Anna', 'performance': 4.7},
+        ]
+    
+    def test_merge_shifts_row_ids(self):
+        """Тест что слияние частичных индексов совпадает с последовательным проходом."""
+        merged = SkillIndex().update(ROWS[:2]).merge(SkillIndex().update(ROWS[2:]))
+        sequential = SkillIndex().update(ROWS)
+        
+        assert merged.postings == sequential.postings
+        assert merged.names == sequential.names
+    
+    def test_pickle_skips_token_cache(self):
+        """Тест сохранения индекса без кэша разбора."""
+        index = SkillIndex().update(ROWS)
+        restored = pickle.loads(pickle.dumps(index))
+        
+        assert restored.postings == index.postings
+        assert restored._tokens == {}
+        restored.add(ROWS[0])
+        assert len(restored) == len(ROWS) + 1
+    
+    def test_columnar_table(self):
+        """Тест построения индекса по колоночной таблице."""
+        rows = read_csv_files(DATA_FILES)
+        
+        from_table = SkillIndex().update_table(ColumnarTable.from_rows(rows))
+        from_rows = SkillIndex().update(rows)
+        
+        assert from_table.postings == from_rows.postings
+        assert from_table.names == from_rows.names
+
+
+class TestSkillsReports:
+    """Тесты для отчетов по навыкам."""
+    
+    def test_skills_report(self):
+        """Тест средней эффективности и численности по навыкам."""
+        assert SKILLS_REPORT(ROWS) == [
+            {'skill': 'React', 'performance': 4.9, 'employees': 1},
+            {'skill': 'Python', 'performance': 4.7, 'employees': 3},
+            {'skill': 'Docker', 'performance': 4.43, 'employees': 3},
+        ]
+    
+    def test_skill_leaders_report(self):
+        """Тест лучших сотрудников по навыкам."""
+        assert SkillLeadersReport(top=1)(ROWS) == [
+            {'skill': 'Python', 'name': 'Maria', 'performance': 4.9},
+            {'skill': 'Docker', 'name': 'Anna', 'performance': 4.7},
+            {'skill': 'React', 'name': 'Maria', 'performance': 4.9},
+        ]
+        assert SkillLeadersReport(top=5, skill='Docker')(ROWS)[-1] == {
+            'skill': 'Docker', 'name': 'John', 'performance': 4.1
+        }
+    
+    def test_registered_lazily(self):
+        """Тест что отчеты доступны через реестр."""
+        assert get_report('skills') is SKILLS_REPORT
+        assert get_report('skill_leaders') is SKILL_LEADERS_REPORT
+        assert generate_report('skills', ROWS)[0]['skill'] == 'React'
+    
+    def test_parallel_matches_sequential(self):
+        """Тест что параллельная сборка индекса дает тот же отчет."""
+        state = aggregate_files(SKILLS_REPORT, DATA_FILES, jobs=2, chunk_bytes=256)
+        
+        assert SKILLS_REPORT.finalize(state) == SKILLS_REPORT(read_csv_files(DATA_FILES))
+    
+    def test_one_index_for_all_skill_reports(self):
+        """Тест что отчеты по навыкам в одном проходе строят один общий индекс."""
+        report = MultiReport(['skills', 'skill_leaders', 'performance'])
+        
+        state = report.create()
+        
+        assert len(state.states) == 2
+        assert report.finalize(report.feed(state, read_csv_files(DATA_FILES))) == {
+            'skills': SKILLS_REPORT(read_csv_files(DATA_FILES)),
+            'skill_leaders': SKILL_LEADERS_REPORT(read_csv_files(DATA_FILES)),
+            'performance': generate_report('performance', read_csv_files(DATA_FILES)),
+        }
+    
+    def test_skill_option(self, capsys):
+        """Тест параметра --skill."""
+        with patch('sys.argv', ['main.py', '--files', *DATA_FILES, '--report', 'skill_leaders',
+                                '--skill', 'Python', '--format', 'tsv']):
+            assert main() == 0
+        
+        lines = capsys.readouterr().out.splitlines()[1:]
+        assert lines
+        assert all(line.startswith('Python\t') for line in lines)
+        assert get_report('skill_leaders').skill is None
@@ -0,0 +1,175 @@
+import csv
+import gzip
+import json
+import os
+import shutil
+from unittest.mock import patch
+
+import pytest
+from filters import parse_predicates
+from main import main
+from trends import SnapshotCache, TrendReport, find_snapshots, trend_report
+from writers import iter_binary_stream
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'employees_data')
+FIELDS = ['name', 'position', 'completed_tasks', 'performance', 'skills', 'team', 'experience_years']
+
+
+def _write(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+
+
+def _row(name, position, performance, team='API Team'):
+    return [name, position, '10', str(performance), 'Python', team, '3']
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    day1 = tmp_path / '2026-10-01'
+    day1.mkdir()
+    _write(day1 / 'employees.csv', [_row('Alex', 'Developer', 4.0), _row('Maria', 'QA', 4.2)])
+    day2 = tmp_path / '2026-10-02'
+    day2.mkdir()
+    _write(day2 / 'employees.csv', [_row('Alex', 'Developer', 4.4), _row('Maria', 'QA', 4.1)])
+    return tmp_path
+
+
+class TestFindSnapshots:
+    """Тесты для поиска датированных снимков."""
+
+    def test_directories_and_files(self, snapshots):
+        """Тест снимков-каталогов и снимков-файлов, в том числе сжатых."""
+        with open(os.path.join(DATA_DIR, 'employees1.csv'), 'rb') as source, \
+                gzip.open(snapshots / 'employees_20260930.csv.gz', 'wb') as target:
+            shutil.copyfileobj(source, target)
+        (snapshots / 'notes.txt').write_text('без даты')
+        (snapshots / '2026-10-01' / 'employees.csv.bak').write_text('резервная копия')
+        (snapshots / '.trend_cache.pkl').write_bytes(b'')
+
+        result = find_snapshots(str(snapshots))
+
+        assert [date for date, _ in result] == ['2026-09-30', '2026-10-01', '2026-10-02']
+        assert result[0][1] == [str(snapshots / 'employees_20260930.csv.gz')]
+        assert result[1][1] == [str(snapshots / '2026-10-01' / 'employees.csv')]
+
+    def test_missing_directory(self, tmp_path):
+        """Тест ошибки для несуществующего каталога."""
+        with pytest.raises(FileNotFoundError, match="Каталог не найден"):
+            find_snapshots(str(tmp_path / 'missing'))
+
+
+class TestTrendReport:
+    """Тесты для отчета о динамике."""
+
+    def test_series_with_deltas(self, snapshots):
+        """Тест рядов по группам с изменением относительно предыдущего снимка."""
+        result = TrendReport().compute(find_snapshots(str(snapshots)))
+
+        assert result == [
+            {'date': '2026-10-01', 'position': 'Developer', 'performance': 4.0, 'delta': None},
+            {'date': '2026-10-02', 'position': 'Developer', 'performance': 4.4, 'delta': 0.4},
+            {'date': '2026-10-01', 'position': 'QA', 'performance': 4.2, 'delta': None},
+            {'date': '2026-10-02', 'position': 'QA', 'performance': 4.1, 'delta': -0.1},
+        ]
+
+    def test_new_snapshot_scans_only_new_day(self, snapshots):
+        """Тест что при добавлении снимка разбирается только он."""
+        cache_path = str(snapshots / 'cache.pkl')
+        report = TrendReport(group_by='team')
+        report.compute(find_snapshots(str(snapshots)), SnapshotCache(cache_path))
+        assert report.scanned == ['2026-10-01', '2026-10-02']
+
+        _write(snapshots / 'employees_2026-10-03.csv', [_row('Alex', 'Developer', 5.0)])
+        result = report.compute(find_snapshots(str(snapshots)), SnapshotCache(cache_path))
+
+        assert report.scanned == ['2026-10-03']
+        assert result[-1] == {'date': '2026-10-03', 'team': 'API Team', 'performance': 5.0, 'delta': 0.75}
+
+    def test_changed_snapshot_is_rescanned(self, snapshots):
+        """Тест что измененный снимок разбирается заново."""
+        cache_path = str(snapshots / 'cache.pkl')
+        TrendReport().compute(find_snapshots(str(snapshots)), SnapshotCache(cache_path))
+        _write(snapshots / '2026-10-01' / 'employees.csv', [_row('Alex', 'Developer', 3.0)])
+
+        report = TrendReport()
+        result = report.compute(find_snapshots(str(snapshots)), SnapshotCache(cache_path))
+
+        assert report.scanned == ['2026-10-01']
+        assert result[0]['performance'] == 3.0
+
+    def test_where_is_part_of_cache_key(self, snapshots):
+        """Тест что агрегаты с разными условиями не смешиваются."""
+        cache_path = str(snapshots / 'cache.pkl')
+        TrendReport().compute(find_snapshots(str(snapshots)), SnapshotCache(cache_path))
+
+        report = TrendReport(where=parse_predicates(["position == 'QA'"]))
+        result = report.compute(find_snapshots(str(snapshots)), SnapshotCache(cache_path))
+
+        assert len(report.scanned) == 2
+        assert {row['position'] for row in result} == {'QA'}
+
+    def test_other_reports_keep_their_entries(self, snapshots):
+        """Тест что отчеты с разной группировкой не вытесняют агрегаты друг друга."""
+        cache_path = str(snapshots / 'cache.pkl')
+        TrendReport(group_by='position').compute(find_snapshots(str(snapshots)), SnapshotCache(cache_path))
+        TrendReport(group_by='team').compute(find_snapshots(str(snapshots)), SnapshotCache(cache_path))
+
+        for group_by in ('position', 'team'):
+            report = TrendReport(group_by=group_by)
+            report.compute(find_snapshots(str(snapshots)), SnapshotCache(cache_path))
+            assert report.scanned == []
+
+    def test_removed_snapshot_is_dropped_from_cache(self, snapshots):
+        """Тест что записи удаленного снимка удаляются из кэша."""
+        cache_path = str(snapshots / 'cache.pkl')
+        TrendReport().compute(find_snapshots(str(snapshots)), SnapshotCache(cache_path))
+        shutil.rmtree(snapshots / '2026-10-01')
+
+        TrendReport().compute(find_snapshots(str(snapshots)), SnapshotCache(cache_path))
+
+        assert {key[0] for key in SnapshotCache(cache_path).entries} == {'2026-10-02'}
+
+    def test_default_cache_in_snapshot_directory(self, snapshots):
+        """Тест что по умолчанию кэш хранится в каталоге снимков и не считается снимком."""
+        trend_report(str(snapshots))
+
+        assert os.path.exists(snapshots / '.trend_cache.pkl')
+        assert len(find_snapshots(str(snapshots))) == 2
+
+
+class TestTrendCommand:
+    """Тесты подкоманды trend."""
+
+    def test_jsonl(self, snapshots, capsys):
+        """Тест вывода в JSON Lines."""
+        with patch('sys.argv', ['main.py', 'trend', '--dir', str(snapshots), '--by', 'team', '--format', 'jsonl']):
+            assert main() == 0
+
+        rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert rows[1] == {'date': '2026-10-02', 'team': 'API Team', 'performance': 4.25, 'delta': 0.15}
+
+    def test_binary_and_tsv_keep_empty_delta(self, snapshots, tmp_path, capsys):
+        """Тест что пустое изменение не превращается в строку 'None'."""
+        output = str(tmp_path / 'trend.bin')
+        with patch('sys.argv', ['main.py', 'trend', '--dir', str(snapshots), '--by', 'team',
+                                '--format', 'binary', '--output', output]):
+            assert main() == 0
+        with patch('sys.argv', ['main.py', 'trend', '--dir', str(snapshots), '--by', 'team', '--format', 'tsv']):
+            assert main() == 0
+
+        with open(output, 'rb') as file:
+            rows = [row for _, batch in iter_binary_stream(file) for row in batch]
+        assert rows[0]['delta'] is None
+        assert rows[1]['delta'] == 0.15
+        assert 'None' not in capsys.readouterr().out
+
+    def test_missing_directory(self, tmp_path, capsys):
+        """Тест ошибки для несуществующего каталога."""
+        with patch('sys.argv', ['main.py', 'trend', '--dir', str(tmp_path / 'missing')]):
+            assert main() == 1
+
+        assert "Каталог не найден" in capsys.readouterr().out
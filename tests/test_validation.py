@@ -0,0 +1,144 @@
+import csv
+import os
+import tempfile
+
+import pytest
+from file_reader import iter_csv_files, iter_csv_range, read_csv_files, split_csv_file
+from filters import parse_predicates
+from parallel import aggregate_files
+from reports import PERFORMANCE_REPORT
+from validation import QUARANTINE_FIELDS, Quarantine
+
+
+HEADER = ['name', 'position', 'completed_tasks', 'performance', 'skills', 'team', 'experience_years']
+
+ROWS = [
+    ['Alex', 'Developer', '10', '4.5', 'Python', 'API Team', '2'],
+    ['Bad Tasks', 'Developer', 'ten', '4.9', 'Python', 'API Team', '2'],
+    ['Maria', 'QA', '5', '4.1', 'Python, "Go"\nSQL', 'API Team', '1'],
+    ['Short', 'QA'],
+    ['Bad Score', 'QA', '3', 'high', 'Python', 'Web Team', '1'],
+    ['John', 'QA', '7', '4.3', 'Go', 'Web Team', '3'],
+]
+
+
+@pytest.fixture
+def data_file():
+    """CSV-файл с некорректными строками."""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(ROWS)
+        path = f.name
+    yield path
+    os.unlink(path)
+
+
+class TestQuarantine:
+    """Тесты для карантина некорректных строк."""
+    
+    def test_counts_and_summary(self):
+        """Тест подсчета ошибок по колонкам."""
+        quarantine = Quarantine()
+        quarantine.add('a.csv', 2, 'performance', 'ошибка', ['x'])
+        quarantine.add('a.csv', 3, None, 'ошибка', ['y', 'z'])
+        
+        assert quarantine.count == 2
+        assert quarantine.by_column == {'performance': 1, 'запись': 1}
+        assert quarantine.summary() == 'Некорректных строк: 2 (performance: 1, запись: 1)'
+        assert quarantine.records[1] == ('a.csv', 3, '', 'ошибка', 'y,z')
+    
+    def test_write_to_file_and_merge(self):
+        """Тест записи в файл, в том числе записей из другого карантина."""
+        worker = Quarantine()
+        worker.add('a.csv', 5, 'completed_tasks', 'ошибка', ['a, b', 'c'])
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'bad.csv')
+            with Quarantine(path) as quarantine:
+                quarantine.merge(worker)
+            
+            with open(path, encoding='utf-8', newline='') as file:
+                rows = list(csv.reader(file))
+        
+        assert rows[0] == list(QUARANTINE_FIELDS)
+        assert rows[1] == ['a.csv', '5', 'completed_tasks', 'ошибка', '"a, b",c']
+    
+    def test_no_file_without_errors(self):
+        """Тест что файл карантина не создается, если ошибок нет."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'bad.csv')
+            Quarantine(path).close()
+            
+            assert not os.path.exists(path)
+
+
+class TestReadingWithQuarantine:
+    """Тесты чтения CSV с карантином."""
+    
+    def test_error_has_line_number(self, data_file):
+        """Тест что без карантина ошибка содержит номер строки и колонку."""
+        with pytest.raises(Exception) as exc_info:
+            read_csv_files([data_file])
+        
+        assert "строка 3, колонка 'completed_tasks'" in str(exc_info.value)
+    
+    def test_bad_rows_are_skipped(self, data_file):
+        """Тест что некорректные строки откладываются, а чтение продолжается."""
+        quarantine = Quarantine()
+        rows = read_csv_files([data_file], quarantine=quarantine)
+        
+        assert [row['name'] for row in rows] == ['Alex', 'Maria', 'John']
+        # Запись Maria занимает две строки файла
+        assert [(line, column) for _, line, column, _, _ in quarantine.records] == [
+            (3, 'completed_tasks'), (6, ''), (7, 'performance')
+        ]
+    
+    def test_unused_columns_are_validated(self, data_file):
+        """Тест что с карантином проверяются и колонки, не нужные отчету."""
+        quarantine = Quarantine()
+        rows = list(iter_csv_files([data_file], columns={'name', 'performance'}, quarantine=quarantine))
+        
+        assert rows == [
+            {'name': 'Alex', 'performance': 4.5},
+            {'name': 'Maria', 'performance': 4.1},
+            {'name': 'John', 'performance': 4.3},
+        ]
+        assert quarantine.count == 3
+    
+    def test_bad_value_in_filter_column(self, data_file):
+        """Тест некорректного значения в колонке условия фильтрации."""
+        quarantine = Quarantine()
+        rows = list(iter_csv_files([data_file], where=parse_predicates(['performance > 4.2']), quarantine=quarantine))
+        
+        assert [row['name'] for row in rows] == ['Alex', 'John']
+        assert quarantine.by_column == {'performance': 1, 'completed_tasks': 1, 'запись': 1}
+    
+    def test_small_batches(self, data_file, monkeypatch):
+        """Тест что пачка, целиком отброшенная условиями, не останавливает чтение."""
+        monkeypatch.setattr('file_reader.CONVERT_BATCH_ROWS', 2)
+        quarantine = Quarantine()
+        rows = list(iter_csv_files([data_file], where=parse_predicates(["team == 'Web Team'"]), quarantine=quarantine))
+        
+        assert [row['name'] for row in rows] == ['John']
+        assert [line for _, line, _, _, _ in quarantine.records] == [6, 7]
+    
+    def test_range_line_numbers(self, data_file):
+        """Тест номеров строк при чтении фрагментов файла."""
+        fieldnames, ranges = split_csv_file(data_file, chunk_bytes=1)
+        quarantine = Quarantine()
+        for start, end in ranges:
+            list(iter_csv_range(data_file, start, end, fieldnames, quarantine=quarantine))
+        
+        assert [line for _, line, _, _, _ in quarantine.records] == [3, 6, 7]
+    
+    def test_parallel_quarantine(self, data_file):
+        """Тест объединения карантинов рабочих процессов в порядке данных."""
+        quarantine = Quarantine()
+        state = aggregate_files(PERFORMANCE_REPORT, [data_file], jobs=2, chunk_bytes=1, quarantine=quarantine)
+        
+        assert PERFORMANCE_REPORT.finalize(state) == [
+            {'position': 'Developer', 'performance': 4.5},
+            {'position': 'QA', 'performance': 4.2},
+        ]
+        assert [line for _, line, _, _, _ in quarantine.records] == [3, 6, 7]
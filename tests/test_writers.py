@@ -0,0 +1,121 @@
+import io
+
+import pytest
+from writers import BinaryStreamWriter, iter_binary_stream, write_csv, write_jsonl, write_tsv
+
+
+ROWS = [
+    {'position': 'Backend Developer', 'performance': 4.83, 'count': 3},
+    {'position': 'QA, "Lead"', 'performance': 4.5, 'count': 1},
+]
+
+
+class TestTextWriters:
+    """Тесты для текстовых форматов вывода."""
+    
+    def test_write_tsv(self):
+        """Тест вывода через табуляцию."""
+        stream = io.StringIO()
+        
+        assert write_tsv(ROWS, stream) == 2
+        assert stream.getvalue().splitlines() == [
+            'position\tperformance\tcount',
+            'Backend Developer\t4.83\t3',
+            'QA, "Lead"\t4.5\t1',
+        ]
+    
+    def test_write_csv_quoting(self):
+        """Тест экранирования значений в CSV."""
+        stream = io.StringIO()
+        
+        assert write_csv(ROWS, stream) == 2
+        assert stream.getvalue().splitlines()[2] == '"QA, ""Lead""",4.5,1'
+    
+    def test_write_jsonl(self):
+        """Тест JSON Lines с названием отчета."""
+        stream = io.StringIO()
+        
+        write_jsonl(ROWS[:1], stream, 'performance')
+        
+        assert stream.getvalue() == (
+            '{"report": "performance", "position": "Backend Developer", "performance": 4.83, "count": 3}\n'
+        )
+    
+    def test_empty_rows(self):
+        """Тест что для пустого отчета ничего не выводится."""
+        for writer in (write_tsv, write_csv, write_jsonl):
+            stream = io.StringIO()
+            assert writer([], stream) == 0
+            assert stream.getvalue() == ''
+
+
+class TestBinaryStream:
+    """Тесты для потокового бинарного формата."""
+    
+    def test_round_trip_with_batches(self):
+        """Тест записи и чтения нескольких отчетов пакетами."""
+        stream = io.BytesIO()
+        writer = BinaryStreamWriter(stream, batch_rows=1)
+        writer.write_table(ROWS, 'performance')
+        writer.write_table([{'team': 'API Team', 'performance': 4.7}], 'team')
+        writer.close()
+        
+        stream.seek(0)
+        batches = list(iter_binary_stream(stream))
+        
+        assert [name for name, _ in batches] == ['performance', 'performance', 'team']
+        assert [row for _, rows in batches[:2] for row in rows] == ROWS
+        assert batches[2][1] == [{'team': 'API Team', 'performance': 4.7}]
+    
+    def test_nulls_and_widening(self):
+        """Тест пустых значений и расширения целой колонки до вещественной."""
+        rows = [
+            {'team': 'API Team', 'delta': None, 'value': 4},
+            {'team': 'Web Team', 'delta': -0.02, 'value': 4.5},
+            {'team': None, 'delta': 0.1, 'value': None},
+        ]
+        stream = io.BytesIO()
+        writer = BinaryStreamWriter(stream)
+        writer.write_table(rows)
+        writer.close()
+        
+        stream.seek(0)
+        (_, restored), = iter_binary_stream(stream)
+        
+        assert restored == rows
+        assert [type(row['value']) for row in restored[:2]] == [float, float]
+    
+    def test_type_from_first_non_null_batch(self):
+        """Тест колонки, пустой в первом пакете."""
+        rows = [{'delta': None}, {'delta': 1}, {'delta': 0.5}]
+        stream = io.BytesIO()
+        writer = BinaryStreamWriter(stream, batch_rows=1)
+        writer.write_table(rows)
+        writer.close()
+        
+        stream.seek(0)
+        restored = [row for _, batch in iter_binary_stream(stream) for row in batch]
+        
+        assert restored == rows
+        assert type(restored[2]['delta']) is float
+    
+    def test_buffers_are_aligned(self):
+        """Тест выравнивания сообщений по 8 байт."""
+        stream = io.BytesIO()
+        writer = BinaryStreamWriter(stream)
+        writer.write_table(ROWS)
+        
+        assert len(stream.getvalue()) % 8 == 0
+    
+    def test_invalid_stream(self):
+        """Тест ошибки для потока другого формата."""
+        with pytest.raises(ValueError):
+            list(iter_binary_stream(io.BytesIO(b'position,performance\n')))
+    
+    def test_truncated_stream(self):
+        """Тест ошибки для оборванного потока."""
+        stream = io.BytesIO()
+        BinaryStreamWriter(stream).write_table(ROWS)
+        
+        with pytest.raises(ValueError):
+            list(iter_binary_stream(io.BytesIO(stream.getvalue()[:-4])))
@@ -0,0 +1,231 @@
+import os
+import pickle
+import re
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from file_reader import iter_csv_files
+from filters import Predicate
+from reports import GroupReport
+
+
+# Версия формата файла кэша снимков
+TREND_CACHE_VERSION = 1
+
+# Имя файла кэша по умолчанию (в каталоге снимков)
+DEFAULT_TREND_CACHE = '.trend_cache.pkl'
+
+# Дата снимка в имени файла или каталога: 2026-10-18 или 20261018
+SNAPSHOT_DATE = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})')
+
+# Окончания имен файлов снимков: сжатые CSV читаются так же, как обычные
+SNAPSHOT_FILE_SUFFIXES = ('.csv', '.csv.gz', '.csv.bz2', '.csv.zst')
+
+# Снимок: дата и пути к его CSV-файлам
+Snapshot = Tuple[str, List[str]]
+
+
+def _is_data_file(name: str) -> bool:
+    return not name.startswith('.') and name.endswith(SNAPSHOT_FILE_SUFFIXES)
+
+
+def find_snapshots(directory: str) -> List[Snapshot]:
+    """
+    Находит датированные снимки в каталоге.
+
+    Снимок - подкаталог или CSV-файл, в имени которого есть дата
+    (например, 2026-10-18/ или employees_20261018.csv.gz). Файлы
+    и подкаталоги с одной датой относятся к одному снимку.
+
+    Args:
+        directory: Каталог со снимками
+
+    Returns:
+        List[Snapshot]: Снимки по возрастанию даты
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Каталог не найден: {directory}")
+
+    snapshots: Dict[str, List[str]] = {}
+    for name in sorted(os.listdir(directory)):
+        match = SNAPSHOT_DATE.search(name)
+        if match is None or name.startswith('.'):
+            continue
+        path = os.path.join(directory, name)
+        if os.path.isdir(path):
+            files = [os.path.join(path, file_name) for file_name in sorted(os.listdir(path))
+                     if _is_data_file(file_name)]
+        elif _is_data_file(name):
+            files = [path]
+        else:
+            continue
+        if files:
+            snapshots.setdefault('-'.join(match.groups()), []).extend(files)
+    return sorted(snapshots.items())
+
+
+def _signature(file_paths: Sequence[str]) -> Tuple:
+    """Размер и время изменения файлов снимка."""
+    signature = []
+    for file_path in file_paths:
+        stat = os.stat(file_path)
+        signature.append((os.path.basename(file_path), stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+class SnapshotCache:
+    """
+    Кэш агрегатов снимков в файле.
+
+    Для каждого снимка хранится состояние отчета (статистики по группам)
+    вместе с размерами и временем изменения его файлов, поэтому снимок
+    разбирается заново, только если его файлы изменились.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Путь к файлу кэша
+        """
+        self.path = path
+        self.entries: Dict[Tuple, Dict[str, Any]] = {}
+        try:
+            with open(path, 'rb') as file:
+                saved = pickle.load(file)
+        except FileNotFoundError:
+            return
+        if saved.get('version') == TREND_CACHE_VERSION:
+            self.entries = saved['entries']
+
+    def get(self, key: Tuple, signature: Tuple) -> Optional[Any]:
+        """Возвращает состояние снимка, если его файлы не менялись."""
+        entry = self.entries.get(key)
+        if entry is None or entry['signature'] != signature:
+            return None
+        return entry['state']
+
+    def put(self, key: Tuple, signature: Tuple, state: Any) -> None:
+        """Сохраняет состояние снимка."""
+        self.entries[key] = {'signature': signature, 'state': state}
+
+    def retain(self, dates: Sequence[str]) -> None:
+        """
+        Удаляет записи снимков, которых больше нет в каталоге.
+
+        Записи других отчетов по тем же снимкам (другая группировка,
+        поле или условия) остаются, чтобы отчеты можно было чередовать
+        без повторного разбора.
+        """
+        dates = set(dates)
+        self.entries = {key: entry for key, entry in self.entries.items() if key[0] in dates}
+
+    def save(self) -> None:
+        """Записывает кэш через временный файл."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump({'version': TREND_CACHE_VERSION, 'entries': self.entries}, file)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class TrendReport:
+    """
+    Динамика метрики по группам между датированными снимками.
+
+    Для каждого снимка строятся статистики по группам (один проход по
+    его файлам), результат кэшируется; затем для каждой группы строится
+    ряд значений по датам с изменением относительно предыдущего снимка,
+    в котором группа была.
+    """
+
+    def __init__(self, group_by: str = 'position', value: str = 'performance', metric: str = 'avg',
+                 precision: int = 2, where: Optional[Sequence[Predicate]] = None):
+        """
+        Args:
+            group_by: Поле для группировки
+            value: Числовое поле для агрегации
+            metric: Метрика RunningStats (avg, sum, count, ...)
+            precision: Количество знаков после запятой при округлении
+            where: Условия фильтрации строк
+        """
+        self.report = GroupReport(group_by, value, metric=metric, precision=precision)
+        self.where = list(where or [])
+        # Даты снимков, разобранных при последнем вызове compute
+        self.scanned: List[str] = []
+
+    def _cache_key(self, date: str) -> Tuple:
+        # Дата идет первой (см. SnapshotCache.retain). Метрика и округление применяются к готовым статистикам и в ключ не входят
+        return (date, self.report.group_by, self.report.value, tuple(repr(predicate) for predicate in self.where))
+
+    def snapshot_state(self, file_paths: List[str]) -> Any:
+        """Строит статистики по группам для файлов одного снимка."""
+        rows = iter_csv_files(file_paths, columns=self.report.columns, where=self.where)
+        return self.report.feed(self.report.create(), rows)
+
+    def compute(self, snapshots: List[Snapshot], cache: Optional[SnapshotCache] = None) -> List[Dict[str, Any]]:
+        """
+        Строит ряды по снимкам.
+
+        Args:
+            snapshots: Снимки по возрастанию даты (см. find_snapshots)
+            cache: Кэш агрегатов снимков
+
+        Returns:
+            List[Dict]: Строки date, группа, значение, delta по группам
+            и датам (delta - None для первого значения группы)
+        """
+        self.scanned = []
+        series: Dict[Any, List[Tuple[str, float]]] = {}
+        for date, file_paths in snapshots:
+            key = self._cache_key(date)
+            signature = _signature(file_paths)
+            state = cache.get(key, signature) if cache is not None else None
+            if state is None:
+                state = self.snapshot_state(file_paths)
+                self.scanned.append(date)
+                if cache is not None:
+                    cache.put(key, signature, state)
+            for group, stats in state.items():
+                series.setdefault(group, []).append((date, stats.value(self.report.metric)))
+
+        if cache is not None:
+            cache.retain([date for date, _ in snapshots])
+            cache.save()
+
+        group_by, value, precision = self.report.group_by, self.report.value, self.report.precision
+        report_data = []
+        for group in sorted(series):
+            previous = None
+            for date, current in series[group]:
+                report_data.append({
+                    'date': date,
+                    group_by: group,
+                    value: round(current, precision),
+                    'delta': None if previous is None else round(current - previous, precision),
+                })
+                previous = current
+        return report_data
+
+
+def trend_report(directory: str, group_by: str = 'position', value: str = 'performance',
+                 where: Optional[Sequence[Predicate]] = None, cache_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Строит отчет о динамике по каталогу снимков.
+
+    Args:
+        directory: Каталог со снимками
+        group_by: Поле для группировки
+        value: Числовое поле для агрегации
+        where: Условия фильтрации строк
+        cache_path: Файл кэша агрегатов (по умолчанию DEFAULT_TREND_CACHE в каталоге снимков)
+
+    Returns:
+        List[Dict]: Строки отчета (см. TrendReport.compute)
+    """
+    snapshots = find_snapshots(directory)
+    cache = SnapshotCache(cache_path or os.path.join(directory, DEFAULT_TREND_CACHE))
+    return TrendReport(group_by, value, where=where).compute(snapshots, cache)
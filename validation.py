@@ -0,0 +1,106 @@
+import csv
+import io
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Колонки файла карантина
+QUARANTINE_FIELDS = ('file', 'line', 'column', 'error', 'record')
+
+# Ключ счетчика ошибок для записей с неверным количеством полей
+RECORD_ERROR = 'запись'
+
+# Запись карантина: файл, номер строки, колонка, ошибка, исходная запись CSV
+QuarantineRecord = Tuple[str, int, str, str, str]
+
+
+def _format_record(raw: List[str]) -> str:
+    """Восстанавливает исходную запись CSV из списка полей."""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator='').writerow(raw)
+    return buffer.getvalue()
+
+
+def describe_error(line: int, column: Optional[str], error: str) -> str:
+    """Текст ошибки некорректной записи при чтении без карантина."""
+    place = f"колонка '{column}'" if column else 'запись'
+    return f"строка {line}, {place}: {error}"
+
+
+class Quarantine:
+    """
+    Карантин некорректных строк CSV.
+
+    Передается в iter_csv_files (и остальные функции чтения) вместо
+    остановки на первой ошибке: запись с неверным количеством полей или
+    значением, которое не конвертируется по схеме (NUMERIC_FIELDS),
+    откладывается сюда с номером строки и текстом ошибки, а чтение
+    продолжается. Если указан path, записи сразу пишутся в CSV-файл,
+    иначе накапливаются в памяти (так работают рабочие процессы, их
+    карантины объединяются в родительском процессе через merge).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Путь к файлу карантина (None - хранить записи в памяти)
+        """
+        self.path = path
+        self.count = 0
+        self.by_column: Dict[str, int] = {}
+        self.records: List[QuarantineRecord] = []
+        self._file = None
+        self._writer = None
+
+    def add(self, source: str, line: int, column: Optional[str], error: str, raw: List[str]) -> None:
+        """
+        Откладывает некорректную запись.
+
+        Args:
+            source: Путь к файлу с данными
+            line: Номер строки в файле
+            column: Колонка с некорректным значением (None - неверное количество полей)
+            error: Текст ошибки
+            raw: Поля записи
+        """
+        self._add((source, line, column or '', error, _format_record(raw)))
+
+    def _add(self, record: QuarantineRecord) -> None:
+        self.count += 1
+        key = record[2] or RECORD_ERROR
+        self.by_column[key] = self.by_column.get(key, 0) + 1
+
+        if self.path is None:
+            self.records.append(record)
+            return
+        if self._writer is None:
+            self._file = open(self.path, 'w', encoding='utf-8', newline='')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(QUARANTINE_FIELDS)
+        self._writer.writerow(record)
+
+    def extend(self, records: Iterable[QuarantineRecord]) -> 'Quarantine':
+        """Добавляет готовые записи карантина (например, сохраненные в кэше)."""
+        for record in records:
+            self._add(tuple(record))
+        return self
+
+    def merge(self, other: 'Quarantine') -> 'Quarantine':
+        """Добавляет записи карантина, накопленного в памяти (например, в рабочем процессе)."""
+        return self.extend(other.records)
+
+    def summary(self) -> str:
+        """Количество некорректных строк всего и по колонкам."""
+        details = ', '.join(f'{column}: {count}' for column, count in self.by_column.items())
+        return f"Некорректных строк: {self.count} ({details})" if self.count else "Некорректных строк: 0"
+
+    def close(self) -> None:
+        """Закрывает файл карантина."""
+        if self._file is not None:
+            self._file.close()
+            self._file = self._writer = None
+
+    def __enter__(self) -> 'Quarantine':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,290 @@
+import csv
+import json
+import struct
+from array import array
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+
+# Сигнатура и версия потокового бинарного формата вывода
+STREAM_MAGIC = b'EMPSTR01'
+
+# Количество строк в одном пакете бинарного потока
+BATCH_ROWS = 65536
+
+# Выравнивание сообщений и буферов бинарного потока
+STREAM_ALIGNMENT = 8
+
+# Типы колонок бинарного потока от узкого к широкому: колонка целых чисел
+# расширяется до вещественной, числовая - до строковой
+COLUMN_TYPE_RANK = {'q': 0, 'd': 1, 'str': 2}
+
+
+def write_tsv(rows: Iterable[Dict[str, Any]], stream: TextIO) -> int:
+    """
+    Записывает строки отчета через табуляцию без выравнивания колонок.
+
+    Пустые значения (None) записываются пустой строкой, как в write_csv.
+
+    Args:
+        rows: Строки отчета
+        stream: Текстовый поток вывода
+
+    Returns:
+        int: Количество записанных строк
+    """
+    count = 0
+    columns = None
+    for row in rows:
+        if columns is None:
+            columns = list(row)
+            stream.write('\t'.join(columns) + '\n')
+        stream.write('\t'.join('' if row[column] is None else str(row[column]) for column in columns) + '\n')
+        count += 1
+    return count
+
+
+def write_csv(rows: Iterable[Dict[str, Any]], stream: TextIO) -> int:
+    """
+    Записывает строки отчета в формате CSV с заголовком.
+
+    Args:
+        rows: Строки отчета
+        stream: Текстовый поток вывода
+
+    Returns:
+        int: Количество записанных строк
+    """
+    count = 0
+    writer = None
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(stream, fieldnames=list(row), lineterminator='\n')
+            writer.writeheader()
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_jsonl(rows: Iterable[Dict[str, Any]], stream: TextIO, report_name: Optional[str] = None) -> int:
+    """
+    Записывает строки отчета в формате JSON Lines (один объект на строку).
+
+    Args:
+        rows: Строки отчета
+        stream: Текстовый поток вывода
+        report_name: Название отчета; если указано, добавляется в каждую
+            строку полем report (для вывода нескольких отчетов в один поток)
+
+    Returns:
+        int: Количество записанных строк
+    """
+    count = 0
+    for row in rows:
+        if report_name is not None:
+            row = {'report': report_name, **row}
+        stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def _value_type(value: Any) -> str:
+    """Тип колонки бинарного потока для одного значения."""
+    if isinstance(value, bool):
+        return 'str'
+    if isinstance(value, int):
+        return 'q'
+    if isinstance(value, float):
+        return 'd'
+    return 'str'
+
+
+def _column_type(values: Iterable[Any], previous: Optional[str] = None) -> Optional[str]:
+    """
+    Тип колонки пакета: самый широкий из типов непустых значений и
+    типа колонки в предыдущих пакетах (None - значений еще не было).
+    """
+    column_type = previous
+    for value in values:
+        if value is not None:
+            value_type = _value_type(value)
+            if column_type is None or COLUMN_TYPE_RANK[value_type] > COLUMN_TYPE_RANK[column_type]:
+                column_type = value_type
+                if column_type == 'str':
+                    break
+    return column_type
+
+
+def _validity_bitmap(values: List[Any]) -> Optional[bytes]:
+    """Битовая карта непустых значений (бит i младшим битом вперед) или None, если пустых нет."""
+    if all(value is not None for value in values):
+        return None
+    bitmap = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value is not None:
+            bitmap[i >> 3] |= 1 << (i & 7)
+    return bytes(bitmap)
+
+
+class BinaryStreamWriter:
+    """
+    Потоковая запись отчетов в компактный бинарный колоночный формат.
+
+    Поток начинается с сигнатуры STREAM_MAGIC, за ней следуют сообщения:
+    длина JSON-метаданных (<I), метаданные и выровненные буферы. Для
+    каждого отчета пишется сообщение со схемой (названия и типы колонок),
+    затем пакеты по BATCH_ROWS строк: числовые колонки - массивами
+    фиксированной ширины, строковые - смещениями и строками в UTF-8.
+    Тип колонки определяется по непустым значениям и только расширяется
+    (целые -> вещественные -> строки), поэтому каждый пакет хранит типы
+    своих колонок. Если в колонке пакета есть пустые значения (None),
+    перед ее данными пишется битовая карта непустых значений.
+    Нулевая длина метаданных завершает поток. Запись идет пакетами,
+    поэтому поток можно передавать другим программам без перемотки
+    и без накопления всего отчета в памяти.
+    """
+
+    def __init__(self, stream: BinaryIO, batch_rows: int = BATCH_ROWS):
+        """
+        Args:
+            stream: Двоичный поток вывода (может не поддерживать seek)
+            batch_rows: Количество строк в пакете
+        """
+        self.stream = stream
+        self.batch_rows = batch_rows
+        self.stream.write(STREAM_MAGIC)
+
+    def _write_message(self, metadata: Dict[str, Any], buffers: List[bytes] = ()) -> None:
+        encoded = json.dumps(metadata, ensure_ascii=False).encode('utf-8')
+        # Метаданные дополняются пробелами, чтобы буферы начинались с выровненной позиции
+        encoded += b' ' * (-(4 + len(encoded)) % STREAM_ALIGNMENT)
+        self.stream.write(struct.pack('<I', len(encoded)) + encoded)
+        for buffer in buffers:
+            self.stream.write(buffer + b'\0' * (-len(buffer) % STREAM_ALIGNMENT))
+
+    def _write_batch(self, columns: Dict[str, Optional[str]], batch: List[Dict[str, Any]]) -> None:
+        buffers = []
+        nullable = []
+        for name, column_type in columns.items():
+            values = [row[name] for row in batch]
+            bitmap = _validity_bitmap(values)
+            nullable.append(bitmap is not None)
+            if bitmap is not None:
+                buffers.append(bitmap)
+            if column_type in (None, 'str'):
+                encoded = [b'' if value is None else str(value).encode('utf-8') for value in values]
+                offsets = array('q', [0])
+                for item in encoded:
+                    offsets.append(offsets[-1] + len(item))
+                buffers.append(offsets.tobytes())
+                buffers.append(b''.join(encoded))
+            else:
+                if bitmap is not None:
+                    values = [0 if value is None else value for value in values]
+                buffers.append(array(column_type, values).tobytes())
+        self._write_message({
+            'type': 'batch',
+            'rows': len(batch),
+            'types': [column_type or 'str' for column_type in columns.values()],
+            'nullable': nullable,
+            'lengths': [len(b) for b in buffers],
+        }, buffers)
+
+    def write_table(self, rows: Iterable[Dict[str, Any]], report_name: Optional[str] = None) -> int:
+        """
+        Записывает строки одного отчета.
+
+        Схема записывается перед первым пакетом, типы колонок в ней -
+        по непустым значениям первого пакета.
+
+        Args:
+            rows: Строки отчета
+            report_name: Название отчета (сохраняется в схеме)
+
+        Returns:
+            int: Количество записанных строк
+        """
+        # Тип каждой колонки (None - непустых значений еще не было)
+        columns: Optional[Dict[str, Optional[str]]] = None
+        batch = []
+        count = 0
+        for row in rows:
+            if columns is None:
+                columns = dict.fromkeys(row)
+            batch.append(row)
+            count += 1
+            if len(batch) >= self.batch_rows:
+                self._flush(columns, batch, report_name, first=count == len(batch))
+                batch = []
+        if batch:
+            self._flush(columns, batch, report_name, first=count == len(batch))
+        return count
+
+    def _flush(self, columns: Dict[str, Optional[str]], batch: List[Dict[str, Any]],
+               report_name: Optional[str], first: bool) -> None:
+        for name, column_type in columns.items():
+            columns[name] = _column_type((row[name] for row in batch), column_type)
+        if first:
+            self._write_message({
+                'type': 'schema',
+                'report': report_name,
+                'columns': [{'name': name, 'type': column_type or 'str'} for name, column_type in columns.items()],
+            })
+        self._write_batch(columns, batch)
+
+    def close(self) -> None:
+        """Записывает признак конца потока."""
+        self.stream.write(struct.pack('<I', 0))
+        self.stream.flush()
+
+
+def _read_exact(stream: BinaryIO, length: int) -> bytes:
+    data = stream.read(length)
+    if len(data) != length:
+        raise ValueError("Бинарный поток отчета оборван")
+    return data
+
+
+def iter_binary_stream(stream: BinaryIO) -> Iterator[Tuple[Optional[str], List[Dict[str, Any]]]]:
+    """
+    Читает поток, записанный BinaryStreamWriter, пакет за пакетом.
+
+    Args:
+        stream: Двоичный поток
+
+    Yields:
+        Tuple: Название отчета и строки очередного пакета
+    """
+    if stream.read(len(STREAM_MAGIC)) != STREAM_MAGIC:
+        raise ValueError("Неверный формат бинарного потока отчета")
+
+    report_name, columns = None, []
+    while True:
+        length, = struct.unpack('<I', _read_exact(stream, 4))
+        if length == 0:
+            return
+        metadata = json.loads(_read_exact(stream, length).decode('utf-8'))
+        if metadata['type'] == 'schema':
+            report_name = metadata['report']
+            columns = [(column['name'], column['type']) for column in metadata['columns']]
+            continue
+
+        buffers = iter([
+            _read_exact(stream, size + -size % STREAM_ALIGNMENT)[:size] for size in metadata['lengths']
+        ])
+        values = {}
+        for (name, _), column_type, has_nulls in zip(columns, metadata['types'], metadata['nullable']):
+            bitmap = next(buffers) if has_nulls else None
+            if column_type == 'str':
+                offsets = array('q')
+                offsets.frombytes(next(buffers))
+                blob = next(buffers)
+                column = [blob[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+            else:
+                column = array(column_type)
+                column.frombytes(next(buffers))
+            if bitmap is not None:
+                column = [value if bitmap[i >> 3] >> (i & 7) & 1 else None for i, value in enumerate(column)]
+            values[name] = column
+        yield report_name, [
+            {name: values[name][i] for name, _ in columns} for i in range(metadata['rows'])
+        ]